@@ -39,6 +39,9 @@ from lightrag.constants import (
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_RERANK_BINDING,
     DEFAULT_ENTITY_TYPES,
+    DEFAULT_EXTRACTION_MAX_WORKERS,
+    DEFAULT_EXTRACTION_TIMEOUT,
+    DEFAULT_EXTRACTION_MEMORY_LIMIT_MB,
 )
 
 # use the .env that is inside the current folder
@@ -349,6 +352,17 @@ def parse_args() -> argparse.Namespace:
     # Select Document loading tool (DOCLING, DEFAULT)
     args.document_loading_engine = get_env_value("DOCUMENT_LOADING_ENGINE", "DEFAULT")
 
+    # File extraction process pool
+    args.extraction_max_workers = get_env_value(
+        "EXTRACTION_MAX_WORKERS", DEFAULT_EXTRACTION_MAX_WORKERS, int
+    )
+    args.extraction_timeout = get_env_value(
+        "EXTRACTION_TIMEOUT", DEFAULT_EXTRACTION_TIMEOUT, int
+    )
+    args.extraction_memory_limit_mb = get_env_value(
+        "EXTRACTION_MEMORY_LIMIT_MB", DEFAULT_EXTRACTION_MEMORY_LIMIT_MB, int
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", DEFAULT_SUMMARY_LANGUAGE)
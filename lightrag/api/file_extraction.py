@@ -0,0 +1,234 @@
+"""
+Out-of-process text extraction for binary document formats.
+
+PDF/DOCX/PPTX/XLSX parsing is CPU bound and can take minutes for large files,
+so it runs in a bounded process pool instead of on the API event loop. Each
+extraction is limited by a timeout and, on POSIX systems, an optional address
+space limit for the worker processes.
+
+This module is imported by spawned worker processes and must stay free of API
+configuration imports.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Callable
+
+import pipmaster as pm
+
+from lightrag.utils import logger
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when a file extraction exceeds its time limit"""
+
+
+def _limit_worker_memory(memory_limit_mb: int) -> None:
+    """Process pool initializer applying an address space limit to the worker"""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        # resource is unavailable on Windows, keep extracting without a limit
+        logger.warning(f"[File Extraction]Cannot limit worker memory: {e}")
+
+
+def _extract_with_docling(file_path: str) -> str:
+    if not pm.is_installed("docling"):  # type: ignore
+        pm.install("docling")
+    from docling.document_converter import DocumentConverter  # type: ignore
+
+    converter = DocumentConverter()
+    result = converter.convert(file_path)
+    return result.document.export_to_markdown()
+
+
+def _extract_pdf(file: bytes) -> str:
+    if not pm.is_installed("pypdf2"):  # type: ignore
+        pm.install("pypdf2")
+    from PyPDF2 import PdfReader  # type: ignore
+
+    content = ""
+    reader = PdfReader(BytesIO(file))
+    for page in reader.pages:
+        content += page.extract_text() + "\n"
+    return content
+
+
+def _extract_docx(file: bytes) -> str:
+    if not pm.is_installed("python-docx"):  # type: ignore
+        try:
+            pm.install("python-docx")
+        except Exception:
+            pm.install("docx")
+    from docx import Document  # type: ignore
+
+    doc = Document(BytesIO(file))
+    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+
+def _extract_pptx(file: bytes) -> str:
+    if not pm.is_installed("python-pptx"):  # type: ignore
+        pm.install("pptx")
+    from pptx import Presentation  # type: ignore
+
+    content = ""
+    prs = Presentation(BytesIO(file))
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                content += shape.text + "\n"
+    return content
+
+
+def _extract_xlsx(file: bytes) -> str:
+    if not pm.is_installed("openpyxl"):  # type: ignore
+        pm.install("openpyxl")
+    from openpyxl import load_workbook  # type: ignore
+
+    content = ""
+    wb = load_workbook(BytesIO(file))
+    for sheet in wb:
+        content += f"Sheet: {sheet.title}\n"
+        for row in sheet.iter_rows(values_only=True):
+            content += (
+                "\t".join(str(cell) if cell is not None else "" for cell in row) + "\n"
+            )
+        content += "\n"
+    return content
+
+
+_EXTRACTORS: dict[str, Callable[[bytes], str]] = {
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".pptx": _extract_pptx,
+    ".xlsx": _extract_xlsx,
+}
+
+
+def extract_binary_file(
+    ext: str, file: bytes, file_path: str, document_loading_engine: str
+) -> str:
+    """Extract text from a PDF/DOCX/PPTX/XLSX file, runs inside a pool worker
+
+    Args:
+        ext: Lower-case file extension including the dot
+        file: Raw file content
+        file_path: Path of the file, used by docling which reads from disk
+        document_loading_engine: "DOCLING" or "DEFAULT"
+
+    Returns:
+        Extracted text content
+    """
+    try:
+        if document_loading_engine == "DOCLING":
+            return _extract_with_docling(file_path)
+        return _EXTRACTORS[ext](file)
+    except MemoryError:
+        raise MemoryError("Extraction exceeded the worker memory limit")
+
+
+class FileExtractionExecutor:
+    """Bounded process pool running file extractions off the event loop
+
+    Concurrency is capped at `max_workers`, so the per-file timeout measures
+    running time rather than time spent waiting for a free worker. On timeout
+    the worker processes are terminated, because a running task cannot be
+    cancelled, and the pool is recreated for the next extraction. Extractions
+    that were running in the terminated pool are retried once.
+    """
+
+    def __init__(self, max_workers: int, timeout: int, memory_limit_mb: int = 0):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn avoids forking a process that runs threads and an event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_limit_worker_memory,
+                initargs=(self.memory_limit_mb,),
+            )
+            logger.info(
+                f"[File Extraction]Process pool started with {self.max_workers} workers"
+            )
+        return self._executor
+
+    def _terminate_executor(self) -> None:
+        """Kill worker processes so a stuck extraction stops consuming resources"""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        # Queued extractions fail with BrokenProcessPool and are retried
+        executor.shutdown(wait=False)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) in a worker process, enforcing the per-file timeout"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphore:
+            for attempt in range(2):
+                executor = self._get_executor()
+                future = asyncio.wrap_future(executor.submit(func, *args))
+                try:
+                    if self.timeout > 0:
+                        return await asyncio.wait_for(future, timeout=self.timeout)
+                    return await future
+                except asyncio.TimeoutError:
+                    if self._executor is executor:
+                        self._terminate_executor()
+                    raise ExtractionTimeoutError(
+                        f"Extraction timed out after {self.timeout}s"
+                    )
+                except BrokenProcessPool:
+                    # Pool was terminated by another timeout or a crashed worker
+                    if self._executor is executor:
+                        self._executor = None
+                    if attempt == 1:
+                        raise
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_file_extraction_executor: FileExtractionExecutor | None = None
+
+
+def get_file_extraction_executor(
+    max_workers: int, timeout: int, memory_limit_mb: int = 0
+) -> FileExtractionExecutor:
+    """Return the process-wide extraction executor, creating it on first use"""
+    global _file_extraction_executor
+    if _file_extraction_executor is None:
+        _file_extraction_executor = FileExtractionExecutor(
+            max_workers=max_workers,
+            timeout=timeout,
+            memory_limit_mb=memory_limit_mb,
+        )
+    return _file_extraction_executor
+
+
+def shutdown_file_extraction_executor() -> None:
+    """Stop the process-wide extraction executor if it was started"""
+    global _file_extraction_executor
+    if _file_extraction_executor is not None:
+        _file_extraction_executor.shutdown()
+        _file_extraction_executor = None
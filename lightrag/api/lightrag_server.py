@@ -47,6 +47,7 @@ from lightrag.api.routers.document_routes import (
     create_document_routes,
     run_scanning_process,
 )
+from lightrag.api.file_extraction import shutdown_file_extraction_executor
 from lightrag.api.routers.query_routes import create_query_routes
 from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
@@ -238,6 +239,9 @@ def create_app(args):
             # Clean up database connections
             await rag.finalize_storages()
 
+            # Stop file extraction worker processes
+            shutdown_file_extraction_executor()
+
             # Clean up shared data
             finalize_share_data()
 
@@ -515,6 +519,7 @@ def create_app(args):
             dimensions=args.embedding_dim,
             args=args,  # Pass args object for fallback option generation
         ),
+        model_name=args.embedding_model,
     )
 
     # Configure rerank function based on args.rerank_bindingparameter
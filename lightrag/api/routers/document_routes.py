@@ -7,7 +7,6 @@ from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
 import shutil
 import traceback
-import pipmaster as pm
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Literal
@@ -25,6 +24,10 @@ from lightrag import LightRAG
 from lightrag.base import DeletionResult, DocProcessingStatus, DocStatus
 from lightrag.utils import generate_track_id
 from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.file_extraction import (
+    extract_binary_file,
+    get_file_extraction_executor,
+)
 from ..config import global_args
 
 
@@ -643,6 +646,8 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        llm_concurrency: Current LLM concurrency limit (adaptive when LLM_ADAPTIVE_CONCURRENCY is enabled)
+        stage_occupancy: Active, queued and worker counts per pipeline stage while documents are processed
     """
 
     autoscanned: bool = False
@@ -656,6 +661,8 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    llm_concurrency: Optional[int] = None
+    stage_occupancy: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
     @classmethod
@@ -832,6 +839,26 @@ def get_unique_filename_in_enqueued(target_dir: Path, original_name: str) -> str
     return f"{base_name}_{timestamp}{extension}"
 
 
+async def _extract_in_process_pool(ext: str, file: bytes, file_path: Path) -> str:
+    """Extract text from a binary document in the extraction process pool
+
+    Keeps CPU-bound parsing off the event loop. Raises ExtractionTimeoutError
+    when the file exceeds EXTRACTION_TIMEOUT.
+    """
+    executor = get_file_extraction_executor(
+        max_workers=global_args.extraction_max_workers,
+        timeout=global_args.extraction_timeout,
+        memory_limit_mb=global_args.extraction_memory_limit_mb,
+    )
+    return await executor.run(
+        extract_binary_file,
+        ext,
+        file,
+        str(file_path),
+        global_args.document_loading_engine,
+    )
+
+
 async def pipeline_enqueue_file(
     rag: LightRAG, file_path: Path, track_id: str = None
 ) -> tuple[bool, str]:
@@ -1002,24 +1029,9 @@ async def pipeline_enqueue_file(
 
                 case ".pdf":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("pypdf2"):  # type: ignore
-                                pm.install("pypdf2")
-                            from PyPDF2 import PdfReader  # type: ignore
-                            from io import BytesIO
-
-                            pdf_file = BytesIO(file)
-                            reader = PdfReader(pdf_file)
-                            for page in reader.pages:
-                                content += page.extract_text() + "\n"
+                        content = await _extract_in_process_pool(
+                            ".pdf", file, file_path
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1039,28 +1051,9 @@ async def pipeline_enqueue_file(
 
                 case ".docx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-docx"):  # type: ignore
-                                try:
-                                    pm.install("python-docx")
-                                except Exception:
-                                    pm.install("docx")
-                            from docx import Document  # type: ignore
-                            from io import BytesIO
-
-                            docx_file = BytesIO(file)
-                            doc = Document(docx_file)
-                            content = "\n".join(
-                                [paragraph.text for paragraph in doc.paragraphs]
-                            )
+                        content = await _extract_in_process_pool(
+                            ".docx", file, file_path
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1080,26 +1073,9 @@ async def pipeline_enqueue_file(
 
                 case ".pptx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-pptx"):  # type: ignore
-                                pm.install("pptx")
-                            from pptx import Presentation  # type: ignore
-                            from io import BytesIO
-
-                            pptx_file = BytesIO(file)
-                            prs = Presentation(pptx_file)
-                            for slide in prs.slides:
-                                for shape in slide.shapes:
-                                    if hasattr(shape, "text"):
-                                        content += shape.text + "\n"
+                        content = await _extract_in_process_pool(
+                            ".pptx", file, file_path
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1119,33 +1095,9 @@ async def pipeline_enqueue_file(
 
                 case ".xlsx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("openpyxl"):  # type: ignore
-                                pm.install("openpyxl")
-                            from openpyxl import load_workbook  # type: ignore
-                            from io import BytesIO
-
-                            xlsx_file = BytesIO(file)
-                            wb = load_workbook(xlsx_file)
-                            for sheet in wb:
-                                content += f"Sheet: {sheet.title}\n"
-                                for row in sheet.iter_rows(values_only=True):
-                                    content += (
-                                        "\t".join(
-                                            str(cell) if cell is not None else ""
-                                            for cell in row
-                                        )
-                                        + "\n"
-                                    )
-                                content += "\n"
+                        content = await _extract_in_process_pool(
+                            ".xlsx", file, file_path
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1451,18 +1403,20 @@ async def background_delete_documents(
         pipeline_status["history_messages"][:] = ["Starting document deletion process"]
 
     try:
-        # Loop through each document ID and delete them one by one
+        # Delete all documents in one pass so shared entities and relations are
+        # rebuilt once and storages are persisted once
+        results = {
+            result.doc_id: result for result in await rag.adelete_by_doc_ids(doc_ids)
+        }
+
+        # Report each document's outcome and delete its files if requested
         for i, doc_id in enumerate(doc_ids, 1):
             async with pipeline_status_lock:
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
                 pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
 
             file_path = "#"
             try:
-                result = await rag.adelete_by_doc_id(doc_id)
+                result = results[doc_id]
                 file_path = (
                     getattr(result, "file_path", "-") if "result" in locals() else "-"
                 )
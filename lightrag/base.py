@@ -590,6 +590,34 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update many nodes in one call
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support bulk writes.
+
+        Args:
+            nodes: A list of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update many edges in one call
+
+        Both endpoints of every edge must already exist. Default implementation
+        upserts edges one by one. Override this method for better performance
+        in storage backends that support bulk writes.
+
+        Args:
+            edges: A list of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -39,6 +39,9 @@ DEFAULT_ENTITY_TYPES = [
 # Separator for graph fields
 GRAPH_FIELD_SEP = "<SEP>"
 
+# Token counts remembered by Tokenizer.count_tokens
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 50000
+
 # Query and retrieval configuration defaults
 DEFAULT_TOP_K = 40
 DEFAULT_CHUNK_TOP_K = 20
@@ -64,10 +67,46 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+DEFAULT_PIPELINE_QUEUE_SIZE = 2  # Documents waiting between pipeline stages
+DEFAULT_REBUILD_BATCH_SIZE = (
+    1000  # Entities or relations rebuilt per batch after deletion
+)
+DEFAULT_LLM_ADAPTIVE_CONCURRENCY = False  # Adjust LLM concurrency from latency/429s
+DEFAULT_MAX_ASYNC_LIMIT = 16  # Upper bound of adaptive LLM concurrency
+DEFAULT_LLM_RPM_LIMIT = 0  # LLM requests per minute, 0 disables
+DEFAULT_LLM_TPM_LIMIT = 0  # LLM tokens per minute, 0 disables
+DEFAULT_LLM_QUERY_RATE_RESERVE = 0.1  # Share of RPM/TPM kept free for queries
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+DEFAULT_EMBEDDING_CACHE_MEMORY_ENTRIES = 10000  # Max vectors in embedding LRU
+DEFAULT_EMBEDDING_BATCH_WAIT_MS = 5.0  # Coalescing window, 0 disables
+
+# Semantic query cache defaults
+DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD = 0.95  # Min cosine similarity for a hit
+DEFAULT_SEMANTIC_CACHE_TTL = 86400  # Seconds an answer is reused, 0 = no expiry
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 10000  # Query embeddings kept in memory
+DEFAULT_SEMANTIC_CACHE_LOAD_PAGE_SIZE = 1000  # Cache entries read per warm-up page
+
+# Retrieval cache defaults
+DEFAULT_RETRIEVAL_CACHE_TTL = 60  # Seconds retrieval results are reused
+DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES = 1000  # Keyword sets kept in memory
+
+# JsonKVStorage persistence defaults
+DEFAULT_JSON_KV_APPEND_LOG = False  # Persist KV changes to an append-only log
+DEFAULT_JSON_KV_COMPACT_RATIO = 1.0  # Compact when log exceeds ratio * snapshot
+DEFAULT_JSON_KV_COMPACT_MIN_BYTES = 4194304  # Never compact logs below 4MB
+
+# File extraction process pool defaults (API server)
+DEFAULT_EXTRACTION_MAX_WORKERS = 2  # Worker processes parsing PDF/DOCX/PPTX/XLSX
+DEFAULT_EXTRACTION_TIMEOUT = 300  # Seconds allowed per file, 0 disables
+DEFAULT_EXTRACTION_MEMORY_LIMIT_MB = 0  # Worker address space limit, 0 disables
+
+# Shared HTTP client pool defaults for LLM, embedding and rerank bindings
+DEFAULT_HTTP_MAX_CONNECTIONS = 100  # Max open connections per client
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept for reuse
+DEFAULT_HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
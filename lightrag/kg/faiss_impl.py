@@ -18,6 +18,15 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Index types selectable with faiss_index_type in vector_db_storage_cls_kwargs
+FAISS_INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+# IVF indexes stay flat until this many vectors exist to train on
+FAISS_IVF_TRAIN_THRESHOLD = 10000
+# Faiss wants at least this many training vectors per IVF list
+FAISS_IVF_MIN_POINTS_PER_LIST = 39
+# HNSW cannot remove vectors, rebuild once deleted ones exceed this share
+FAISS_HNSW_REBUILD_RATIO = 0.2
+
 
 @final
 @dataclass
@@ -25,6 +34,29 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    Vectors live only in the Faiss index, addressed by stable int64 ids, so
+    the metadata file holds no vectors. The index type is chosen with
+    vector_db_storage_cls_kwargs:
+
+        faiss_index_type            flat (exact, default), hnsw, ivf_flat or ivf_pq
+        faiss_hnsw_m                HNSW graph degree (32)
+        faiss_hnsw_ef_construction  HNSW build-time search depth (200)
+        faiss_hnsw_ef_search        HNSW query-time search depth (128)
+        faiss_ivf_nlist             IVF list count, 0 picks ~4*sqrt(n) at training (0)
+        faiss_ivf_nprobe            IVF lists visited per query (16)
+        faiss_ivf_train_threshold   vectors needed before IVF is trained (10000)
+        faiss_pq_m                  PQ sub-quantizers, 0 picks a divisor of dim (0)
+        faiss_pq_nbits              bits per PQ code (8)
+
+    IVF indexes are served by an exact flat index until enough vectors exist,
+    then trained once on all stored vectors. An existing index is converted
+    when faiss_index_type changes, except an ivf_pq index: its compressed
+    codes cannot restore the original vectors, so it is kept until the storage
+    is dropped and rebuilt from the documents. HNSW cannot remove vectors, so
+    deleted ones are filtered out at search time until the index is rebuilt.
+    `hnsw_ef_search` and `ivf_nprobe` are read on every query and may be
+    changed at runtime to trade recall for latency.
     """
 
     def __post_init__(self):
@@ -37,6 +69,23 @@ class FaissVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
+        self._index_type = kwargs.get("faiss_index_type", "flat")
+        if self._index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(
+                f"faiss_index_type must be one of {FAISS_INDEX_TYPES}, got {self._index_type}"
+            )
+        self._hnsw_m = kwargs.get("faiss_hnsw_m", 32)
+        self._hnsw_ef_construction = kwargs.get("faiss_hnsw_ef_construction", 200)
+        self.hnsw_ef_search = kwargs.get("faiss_hnsw_ef_search", 128)
+        self._ivf_nlist = kwargs.get("faiss_ivf_nlist", 0)
+        self.ivf_nprobe = kwargs.get("faiss_ivf_nprobe", 16)
+        self._ivf_train_threshold = max(
+            kwargs.get("faiss_ivf_train_threshold", FAISS_IVF_TRAIN_THRESHOLD),
+            self._ivf_nlist * FAISS_IVF_MIN_POINTS_PER_LIST,
+        )
+        self._pq_m = kwargs.get("faiss_pq_m", 0)
+        self._pq_nbits = kwargs.get("faiss_pq_nbits", 8)
+
         # Where to save index file if you want persistent storage
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -60,16 +109,119 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
-
+        self._reset_index()
         self._load_faiss_index()
 
+    def _new_index(self):
+        """Empty inner product index (cosine similarity on normalized vectors)
+        addressed by our own faiss ids. IVF types start out flat until trained."""
+        if self._index_type == "hnsw":
+            hnsw = faiss.IndexHNSWFlat(
+                self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            hnsw.hnsw.efConstruction = self._hnsw_ef_construction
+            return faiss.IndexIDMap2(hnsw)
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _new_ivf_index(self, training_vectors: np.ndarray):
+        """Train an IVF index of the configured type on training_vectors"""
+        n = len(training_vectors)
+        nlist = self._ivf_nlist or int(4 * np.sqrt(n))
+        nlist = max(1, min(nlist, n // FAISS_IVF_MIN_POINTS_PER_LIST))
+        quantizer = faiss.IndexFlatIP(self._dim)
+        if self._index_type == "ivf_pq":
+            pq_m = self._pq_m or max(
+                m for m in range(1, min(64, self._dim // 4) + 1) if self._dim % m == 0
+            )
+            ivf = faiss.IndexIVFPQ(
+                quantizer,
+                self._dim,
+                nlist,
+                pq_m,
+                self._pq_nbits,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        else:
+            ivf = faiss.IndexIVFFlat(
+                quantizer, self._dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+        ivf.train(training_vectors)
+        # Hashtable direct map supports reconstruct() together with remove_ids()
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return ivf
+
+    def _loaded_index_type(self) -> str:
+        """Index type of self._index, IVF types report flat while untrained"""
+        if isinstance(self._index, faiss.IndexIDMap2):
+            inner = faiss.downcast_index(self._index.index)
+            return "hnsw" if isinstance(inner, faiss.IndexHNSW) else "flat"
+        if isinstance(faiss.downcast_index(self._index), faiss.IndexIVFPQ):
+            return "ivf_pq"
+        return "ivf_flat"
+
+    def _live_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Faiss ids and vectors of all stored (non-deleted) entries"""
+        fids = np.array(sorted(self._id_to_meta), dtype=np.int64)
+        if len(fids) == 0:
+            return fids, np.empty((0, self._dim), dtype=np.float32)
+        return fids, self._index.reconstruct_batch(fids)
+
+    def _rebuild_index(self):
+        """Rebuild the index of the configured type from the stored vectors"""
+        fids, vectors = self._live_vectors()
+        if (
+            self._index_type.startswith("ivf")
+            and len(fids) >= self._ivf_train_threshold
+        ):
+            index = self._new_ivf_index(vectors)
+        else:
+            index = self._new_index()
+        index.add_with_ids(vectors, fids)
+        self._index = index
+        self._deleted_fids = set()
+        logger.info(
+            f"[{self.workspace}] Rebuilt Faiss {self._loaded_index_type()} index for {self.namespace} with {len(fids)} vectors"
+        )
+
+    def _maybe_train_ivf(self):
+        """Switch an untrained IVF index from flat to IVF once enough vectors exist"""
+        if (
+            self._index_type.startswith("ivf")
+            and self._loaded_index_type() == "flat"
+            and len(self._id_to_meta) >= self._ivf_train_threshold
+        ):
+            self._rebuild_index()
+
+    def _search_params(self, top_k: int):
+        """Per-query search parameters, read from the current tunables"""
+        index_type = self._loaded_index_type()
+        if index_type == "hnsw":
+            params = faiss.SearchParametersHNSW(
+                efSearch=max(self.hnsw_ef_search, top_k)
+            )
+            if self._deleted_fids:
+                # Keep the selectors referenced for the duration of the search
+                params._batch = faiss.IDSelectorBatch(
+                    np.array(list(self._deleted_fids), dtype=np.int64)
+                )
+                params._not = faiss.IDSelectorNot(params._batch)
+                params.sel = params._not
+            return params
+        if index_type.startswith("ivf"):
+            return faiss.SearchParametersIVF(nprobe=self.ivf_nprobe)
+        return None
+
+    def _reset_index(self):
+        self._index = self._new_index()
+        # Maps <int faiss_id> → metadata (including your original ID).
+        self._id_to_meta: dict[int, dict[str, Any]] = {}
+        # Reverse map <custom id> → <int faiss_id>
+        self._custom_id_to_fid: dict[str, int] = {}
+        # Next faiss id to assign, ids are never reused
+        self._next_fid = 0
+        # Ids removed from metadata but still present in an HNSW index
+        self._deleted_fids: set[int] = set()
+
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
@@ -87,8 +239,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -154,7 +305,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 2. Remove them
         # 3. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -162,17 +313,20 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
+        # Step 2: Add new vectors under fresh faiss ids
         index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        fids = np.arange(
+            self._next_fid, self._next_fid + len(list_data), dtype=np.int64
+        )
+        index.add_with_ids(embeddings, fids)
+        self._next_fid += len(list_data)
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        # Step 3: Store metadata for each new ID
+        for fid, meta in zip(fids.tolist(), list_data):
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
+
+        self._maybe_train_ivf()
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -198,7 +352,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        distances, indices = index.search(
+            embedding, top_k, params=self._search_params(top_k)
+        )
 
         distances = distances[0]
         indices = indices[0]
@@ -213,12 +369,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if dist < self.cosine_better_than_threshold:
                 continue
 
-            meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
+            meta = self._id_to_meta.get(int(idx), {})
             results.append(
                 {
-                    **filtered_meta,
+                    **meta,
                     "id": meta.get("__id__"),
                     "distance": float(dist),
                     "created_at": meta.get("__created_at__"),
@@ -299,35 +453,24 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
-        Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Remove a list of internal Faiss IDs from the index and metadata.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            if self._loaded_index_type() == "hnsw":
+                # HNSW cannot remove vectors, hide them until the next rebuild
+                self._deleted_fids.update(fid_list)
+            else:
+                self._index.remove_ids(np.array(fid_list, dtype=np.int64))
+            for fid in fid_list:
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is not None:
+                    self._custom_id_to_fid.pop(meta.get("__id__"), None)
+            if len(self._deleted_fids) > FAISS_HNSW_REBUILD_RATIO * self._index.ntotal:
+                self._rebuild_index()
 
     def _save_faiss_index(self):
         """
@@ -336,7 +479,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
+        # _id_to_meta is { int: { '__id__': doc_id, ... } }, vectors stay in the index
         # We'll keep the int -> dict, but JSON requires string keys.
         serializable_dict = {}
         for fid, meta in self._id_to_meta.items():
@@ -367,8 +510,44 @@ class FaissVectorDBStorage(BaseVectorStorage):
             self._id_to_meta = {}
             for fid_str, meta in stored_dict.items():
                 fid = int(fid_str)
+                # Vectors are read from the index, drop copies kept by old versions
+                meta.pop("__vector__", None)
                 self._id_to_meta[fid] = meta
 
+            if isinstance(self._index, faiss.IndexFlat):
+                self._migrate_positional_index()
+
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+            }
+            self._next_fid = max(self._id_to_meta, default=-1) + 1
+
+            if self._loaded_index_type() == "hnsw":
+                # Vectors deleted before the last save are still in the graph
+                stored_fids = faiss.vector_to_array(self._index.id_map)
+                self._next_fid = max(
+                    self._next_fid, int(stored_fids.max(initial=-1)) + 1
+                )
+                self._deleted_fids = set(stored_fids.tolist()) - set(self._id_to_meta)
+
+            loaded_type = self._loaded_index_type()
+            if loaded_type == "ivf_pq" and self._index_type != "ivf_pq":
+                # PQ codes only approximate the vectors, a rebuild from them would
+                # silently degrade every stored vector
+                logger.warning(
+                    f"[{self.workspace}] Faiss index {self.namespace} is ivf_pq and cannot be converted to {self._index_type} "
+                    "without the original vectors, keeping ivf_pq. Drop the storage and re-insert the documents to switch."
+                )
+            elif loaded_type != self._index_type and not (
+                loaded_type == "flat" and self._index_type.startswith("ivf")
+            ):
+                logger.info(
+                    f"[{self.workspace}] Faiss index {self.namespace} is {loaded_type}, converting to {self._index_type}"
+                )
+                self._rebuild_index()
+            else:
+                self._maybe_train_ivf()
+
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
             )
@@ -377,8 +556,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
+
+    def _migrate_positional_index(self):
+        """
+        Convert an index written by older versions, a plain IndexFlatIP whose
+        faiss ids are row positions, into an IndexIDMap2 keeping the same ids.
+        """
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        self._index = self._new_index()
+        self._index.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+        logger.info(
+            f"[{self.workspace}] Migrated Faiss index {self.namespace} to IndexIDMap2"
+        )
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -388,8 +578,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -430,10 +619,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -456,13 +643,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid, {})
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     results.append(
                         {
-                            **filtered_metadata,
+                            **metadata,
                             "id": metadata.get("__id__"),
                             "created_at": metadata.get("__created_at__"),
                         }
@@ -487,11 +670,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                # Stored vectors are L2-normalized
+                vectors_dict[id] = self._index.reconstruct(fid).tolist()
 
         return vectors_dict
 
@@ -514,8 +695,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
                 if os.path.exists(self._faiss_index_file):
@@ -523,7 +703,6 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 if os.path.exists(self._meta_file):
                     os.remove(self._meta_file)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -1,3 +1,6 @@
+import asyncio
+import heapq
+import json
 import os
 from dataclasses import dataclass
 from typing import Any, final
@@ -6,11 +9,18 @@ from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
+    get_env_value,
     load_json,
     logger,
     write_json,
 )
+from lightrag.constants import (
+    DEFAULT_JSON_KV_APPEND_LOG,
+    DEFAULT_JSON_KV_COMPACT_RATIO,
+    DEFAULT_JSON_KV_COMPACT_MIN_BYTES,
+)
 from lightrag.exceptions import StorageNotInitializedError
+from lightrag.namespace import NameSpace, is_namespace
 from .shared_storage import (
     get_namespace_data,
     get_storage_lock,
@@ -39,10 +49,22 @@ class JsonKVStorage(BaseKVStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        # Append-only change log replayed on top of the snapshot file
+        self._log_file_name = f"{self._file_name}.log"
+
+        # Persist only changed keys to the log instead of rewriting the snapshot
+        self._append_log = get_env_value(
+            "JSON_KV_APPEND_LOG", DEFAULT_JSON_KV_APPEND_LOG, bool
+        )
+        self._compact_ratio = get_env_value(
+            "JSON_KV_COMPACT_RATIO", DEFAULT_JSON_KV_COMPACT_RATIO, float
+        )
 
         self._data = None
+        self._dirty_keys = None
         self._storage_lock = None
         self.storage_updated = None
+        self._compaction_task = None
 
     async def initialize(self):
         """Initialize storage data"""
@@ -52,11 +74,22 @@ class JsonKVStorage(BaseKVStorage):
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            # Keys changed since the last commit, shared by all processes
+            self._dirty_keys = await get_namespace_data(
+                f"{self.final_namespace}_dirty_keys"
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
+                replayed_count = self._replay_log(loaded_data)
+                if replayed_count:
+                    logger.info(
+                        f"[{self.workspace}] Process {os.getpid()} KV replayed {replayed_count} log records for {self.namespace}"
+                    )
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
-                    if self.namespace.endswith("_cache"):
+                    if is_namespace(
+                        self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE
+                    ):
                         loaded_data = await self._migrate_legacy_cache_structure(
                             loaded_data
                         )
@@ -68,22 +101,157 @@ class JsonKVStorage(BaseKVStorage):
                         f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records"
                     )
 
+    def _replay_log(self, data: dict[str, Any]) -> int:
+        """Apply change log records on top of the loaded snapshot
+
+        A trailing partial record left by an interrupted append is discarded
+        and truncated from the log so later appends start on a clean line.
+
+        Returns:
+            Number of log records applied
+        """
+        if not os.path.exists(self._log_file_name):
+            return 0
+
+        applied = 0
+        valid_size = 0
+        with open(self._log_file_name, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"[{self.workspace}] Discarding incomplete log record in {self._log_file_name}"
+                    )
+                    break
+                if record["op"] == "upsert":
+                    data[record["id"]] = record["data"]
+                else:
+                    data.pop(record["id"], None)
+                applied += 1
+                valid_size += len(line)
+
+        if valid_size < os.path.getsize(self._log_file_name):
+            with open(self._log_file_name, "r+b") as f:
+                f.truncate(valid_size)
+        return applied
+
+    def _write_snapshot(self, data_dict: dict[str, Any]) -> None:
+        """Write a full snapshot and drop the change log it supersedes"""
+        write_json(data_dict, self._file_name)
+        if os.path.exists(self._log_file_name):
+            os.remove(self._log_file_name)
+
+    def _append_dirty_keys(self) -> int:
+        """Append records for keys changed since the last commit to the log
+
+        Returns:
+            Number of records appended
+        """
+        lines = []
+        for key in list(self._dirty_keys.keys()):
+            value = self._data.get(key)
+            if value is None:
+                record = {"op": "delete", "id": key}
+            else:
+                record = {"op": "upsert", "id": key, "data": value}
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if lines:
+            with open(self._log_file_name, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        return len(lines)
+
+    def _needs_compaction(self) -> bool:
+        if not os.path.exists(self._log_file_name):
+            return False
+        log_size = os.path.getsize(self._log_file_name)
+        snapshot_size = (
+            os.path.getsize(self._file_name) if os.path.exists(self._file_name) else 0
+        )
+        return (
+            log_size >= DEFAULT_JSON_KV_COMPACT_MIN_BYTES
+            and log_size > snapshot_size * self._compact_ratio
+        )
+
+    async def _compact(self) -> None:
+        """Fold the change log into a new snapshot without blocking the event loop
+
+        The snapshot is serialized in a worker thread from a point-in-time copy.
+        Records appended meanwhile are carried over into the new log, and the
+        compaction is abandoned if another process replaced the log first.
+        """
+        tmp_file_name = f"{self._file_name}.{os.getpid()}.tmp"
+        try:
+            async with self._storage_lock:
+                data_dict = dict(self._data)
+                log_stat = os.stat(self._log_file_name)
+
+            await asyncio.to_thread(write_json, data_dict, tmp_file_name)
+
+            async with self._storage_lock:
+                current_stat = os.stat(self._log_file_name)
+                if (
+                    current_stat.st_ino != log_stat.st_ino
+                    or current_stat.st_size < log_stat.st_size
+                ):
+                    logger.info(
+                        f"[{self.workspace}] KV log of {self.namespace} changed during compaction, skipping"
+                    )
+                    return
+
+                # Keep records appended after the snapshot copy was taken
+                with open(self._log_file_name, "rb") as f:
+                    f.seek(log_stat.st_size)
+                    tail = f.read()
+                os.replace(tmp_file_name, self._file_name)
+                log_tmp_file_name = f"{self._log_file_name}.{os.getpid()}.tmp"
+                with open(log_tmp_file_name, "wb") as f:
+                    f.write(tail)
+                os.replace(log_tmp_file_name, self._log_file_name)
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} KV compacted {len(data_dict)} records of {self.namespace}"
+                )
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error compacting {self.namespace}: {e}")
+        finally:
+            if os.path.exists(tmp_file_name):
+                os.remove(tmp_file_name)
+
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
             if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
+                if self._append_log:
+                    record_count = self._append_dirty_keys()
+                    logger.debug(
+                        f"[{self.workspace}] Process {os.getpid()} KV appending {record_count} records to {self.namespace}"
+                    )
+                else:
+                    data_dict = (
+                        dict(self._data)
+                        if hasattr(self._data, "_getvalue")
+                        else self._data
+                    )
 
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
+                    # Calculate data count - all data is now flattened
+                    data_count = len(data_dict)
 
-                logger.debug(
-                    f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
+                    logger.debug(
+                        f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
+                    )
+                    self._write_snapshot(data_dict)
+                self._dirty_keys.clear()
                 await clear_all_update_flags(self.final_namespace)
 
+        # Compact in the background so commits stay proportional to changes
+        if (
+            self._append_log
+            and (self._compaction_task is None or self._compaction_task.done())
+            and self._needs_compaction()
+        ):
+            self._compaction_task = asyncio.create_task(self._compact())
+
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
 
@@ -104,6 +272,38 @@ class JsonKVStorage(BaseKVStorage):
                     result[key] = value
             return result
 
+    async def get_cache_page(
+        self, cache_type: str, cursor: str | None, limit: int
+    ) -> tuple[dict[str, Any], str | None]:
+        """Get one page of LLM cache entries of a cache type, ordered by key
+
+        Args:
+            cache_type: Cache type of the entries to return
+            cursor: Key after which the page starts, None for the first page
+            limit: Maximum number of entries in the page
+
+        Returns:
+            The entries of the page and the cursor of the next page, or None
+            when this was the last page
+        """
+        async with self._storage_lock:
+            # Fetch one key more than the page to know whether another page follows
+            keys = heapq.nsmallest(
+                limit + 1,
+                (
+                    key
+                    for key, value in self._data.items()
+                    if (cursor is None or key > cursor)
+                    and isinstance(value, dict)
+                    and value.get("cache_type") == cache_type
+                ),
+            )
+            page = {key: dict(self._data[key]) for key in keys[:limit]}
+        for data in page.values():
+            data.setdefault("create_time", 0)
+            data.setdefault("update_time", 0)
+        return page, keys[limit - 1] if len(keys) > limit else None
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         async with self._storage_lock:
             result = self._data.get(id)
@@ -175,6 +375,7 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            self._dirty_keys.update(dict.fromkeys(data, True))
             await set_all_update_flags(self.final_namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -196,6 +397,7 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    self._dirty_keys[doc_id] = True
 
             if any_deleted:
                 await set_all_update_flags(self.final_namespace)
@@ -215,11 +417,13 @@ class JsonKVStorage(BaseKVStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
+            await self._wait_for_compaction()
             async with self._storage_lock:
                 self._data.clear()
-                await set_all_update_flags(self.final_namespace)
+                self._dirty_keys.clear()
+                self._write_snapshot({})
+                await clear_all_update_flags(self.final_namespace)
 
-            await self.index_done_callback()
             logger.info(
                 f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
             )
@@ -273,7 +477,7 @@ class JsonKVStorage(BaseKVStorage):
                 f"[{self.workspace}] Migrated {migration_count} legacy cache entries to flattened structure"
             )
             # Persist migrated data immediately
-            write_json(migrated_data, self._file_name)
+            self._write_snapshot(migrated_data)
 
         return migrated_data
 
@@ -281,5 +485,18 @@ class JsonKVStorage(BaseKVStorage):
         """Finalize storage resources
         Persistence cache data to disk before exiting
         """
-        if self.namespace.endswith("_cache"):
+        if is_namespace(
+            self.namespace,
+            (
+                NameSpace.KV_STORE_LLM_RESPONSE_CACHE,
+                NameSpace.KV_STORE_EMBEDDING_CACHE,
+            ),
+        ):
             await self.index_done_callback()
+        await self._wait_for_compaction()
+
+    async def _wait_for_compaction(self):
+        """Wait for a running background compaction to finish"""
+        if self._compaction_task is not None:
+            await self._compaction_task
+            self._compaction_task = None
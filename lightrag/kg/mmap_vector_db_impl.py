@@ -0,0 +1,668 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# Storage format version written into the metadata sidecar
+MMAP_VDB_FORMAT_VERSION = 1
+# Compact files on save once dead rows exceed this share of all rows
+MMAP_VDB_COMPACT_RATIO = 0.5
+# Never compact below this number of dead rows
+MMAP_VDB_COMPACT_MIN_ROWS = 1000
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    A memory-mapped vector storage for LightRAG.
+
+    Vectors are kept L2-normalized in a raw float32 matrix file that is
+    memory-mapped on load, so cold start and cross-process reload cost
+    O(mmap) instead of parsing a JSON document. Row metadata lives in an
+    append-only JSON-lines log, and a small sidecar records the committed
+    row count and log length so half-written appends are ignored on load.
+
+    Files in the workspace directory:
+        mmap_vdb_<namespace>.vec        float32 matrix, one row per vector
+        mmap_vdb_<namespace>.log        JSON-lines metadata log (add/del ops)
+        mmap_vdb_<namespace>.meta.json  sidecar: dim, generation, committed rows
+                                        and log size
+
+    Saving appends only rows and log entries added since the last save.
+    Upserts and deletes leave dead rows behind, which are dropped by an
+    automatic compaction once they dominate the file. Compaction writes a
+    new generation of files (mmap_vdb_<namespace>.<generation>.vec/.log) and
+    switches to it with a single sidecar write, so a crash at any point leaves
+    either the old or the new generation fully readable.
+    """
+
+    def __post_init__(self):
+        # Use global config value if specified, otherwise use default
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            self.workspace = "_"
+            workspace_dir = working_dir
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._file_prefix = os.path.join(workspace_dir, f"mmap_vdb_{self.namespace}")
+        self._meta_file = f"{self._file_prefix}.meta.json"
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._storage_lock = None
+        self.storage_updated = None
+
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.final_namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(enable_logging=False)
+
+    # --------------------------------------------------------------------------------
+    # Internal state and file handling
+    # --------------------------------------------------------------------------------
+
+    def _generation_files(self, generation: int) -> tuple[str, str]:
+        """Return the vector and log file names of a file generation"""
+        if generation == 0:
+            return f"{self._file_prefix}.vec", f"{self._file_prefix}.log"
+        return (
+            f"{self._file_prefix}.{generation}.vec",
+            f"{self._file_prefix}.{generation}.log",
+        )
+
+    def _set_generation(self, generation: int):
+        """Point the vector and log file names at a file generation"""
+        self._generation = generation
+        self._vector_file, self._log_file = self._generation_files(generation)
+
+    def _reset_state(self):
+        """Reset in-memory state to an empty storage"""
+        # Committed rows, memory-mapped read-only from the vector file
+        self._vectors: np.ndarray | None = None
+        self._committed_rows = 0
+        self._log_size = 0
+        # Rows added since the last save, not yet written to disk
+        self._pending_vectors: list[np.ndarray] = []
+        self._pending_matrix: np.ndarray | None = None
+        self._pending_log: list[dict[str, Any]] = []
+        # Row metadata (None marks a dead row), id lookup and alive mask
+        self._row_meta: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+    def _open_vectors(self, rows: int):
+        """Memory-map the first `rows` rows of the vector file"""
+        if rows == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(
+            self._vector_file, dtype=np.float32, mode="r", shape=(rows, self._dim)
+        )
+
+    def _apply_log_entry(self, entry: dict[str, Any]):
+        """Apply one metadata log entry to the in-memory state"""
+        row = entry["row"]
+        if entry["op"] == "add":
+            data = entry["data"]
+            while len(self._row_meta) <= row:
+                self._row_meta.append(None)
+            self._row_meta[row] = data
+            self._id_to_row[data["__id__"]] = row
+        elif entry["op"] == "del":
+            data = self._row_meta[row] if row < len(self._row_meta) else None
+            if data is not None:
+                if self._id_to_row.get(data["__id__"]) == row:
+                    del self._id_to_row[data["__id__"]]
+                self._row_meta[row] = None
+
+    def _load(self):
+        """Load committed vectors and replay the metadata log from disk"""
+        self._reset_state()
+        self._set_generation(0)
+        if not os.path.exists(self._meta_file):
+            logger.info(
+                f"[{self.workspace}] No existing mmap vector storage found for {self.namespace}"
+            )
+            return
+
+        with open(self._meta_file, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+
+        if sidecar["dim"] != self._dim:
+            raise ValueError(
+                f"Embedding dim mismatch for {self._vector_file}: "
+                f"expected {self._dim}, found {sidecar['dim']}"
+            )
+
+        self._set_generation(sidecar.get("generation", 0))
+        rows = sidecar["rows"]
+        log_size = sidecar["log_size"]
+
+        # Only replay the committed part of the log, ignoring half-written appends
+        if log_size:
+            with open(self._log_file, "rb") as f:
+                log_bytes = f.read(log_size)
+            for line in log_bytes.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["row"] < rows:
+                    self._apply_log_entry(entry)
+
+        while len(self._row_meta) < rows:
+            self._row_meta.append(None)
+        self._alive = np.array([m is not None for m in self._row_meta], dtype=bool)
+        self._committed_rows = rows
+        self._log_size = log_size
+        self._open_vectors(rows)
+
+        logger.info(
+            f"[{self.workspace}] Loaded {len(self._id_to_row)} vectors ({rows} rows) from {self._vector_file}"
+        )
+
+    def _write_sidecar(self):
+        """Atomically write the metadata sidecar marking the commit point"""
+        tmp_file = f"{self._meta_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MMAP_VDB_FORMAT_VERSION,
+                    "dim": self._dim,
+                    "generation": self._generation,
+                    "rows": self._committed_rows,
+                    "log_size": self._log_size,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._meta_file)
+
+    def _append_pending(self):
+        """Append rows and log entries added since the last save"""
+        if self._pending_vectors:
+            with open(self._vector_file, "ab") as f:
+                # Drop any partial tail left behind by an interrupted save
+                f.truncate(self._committed_rows * self._dim * 4)
+                f.write(np.ascontiguousarray(self._get_pending_matrix()).tobytes())
+
+        if self._pending_log:
+            payload = "".join(
+                json.dumps(entry, ensure_ascii=False) + "\n"
+                for entry in self._pending_log
+            ).encode("utf-8")
+            with open(self._log_file, "ab") as f:
+                f.truncate(self._log_size)
+                f.write(payload)
+            self._log_size += len(payload)
+
+        self._committed_rows = len(self._row_meta)
+        self._write_sidecar()
+
+        self._pending_vectors = []
+        self._pending_matrix = None
+        self._pending_log = []
+        self._open_vectors(self._committed_rows)
+
+    def _compact(self):
+        """Rewrite vector and log files keeping only live rows
+
+        The compacted rows are written to the files of the next generation and
+        only become visible once the sidecar naming that generation is written,
+        so an interrupted compaction leaves the current generation untouched.
+        """
+        live_rows = np.flatnonzero(self._alive)
+        old_generation = self._generation
+        new_generation = old_generation + 1
+        vector_file, log_file = self._generation_files(new_generation)
+
+        with open(vector_file, "wb") as f:
+            for start in range(0, len(live_rows), self._max_batch_size * 64):
+                batch = live_rows[start : start + self._max_batch_size * 64]
+                f.write(np.ascontiguousarray(self._get_rows(batch)).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        new_row_meta = [self._row_meta[row] for row in live_rows]
+        payload = "".join(
+            json.dumps({"op": "add", "row": i, "data": m}, ensure_ascii=False) + "\n"
+            for i, m in enumerate(new_row_meta)
+        ).encode("utf-8")
+        with open(log_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Release the memory map of the old generation before removing it
+        self._reset_state()
+        self._set_generation(new_generation)
+        self._row_meta = new_row_meta
+        self._id_to_row = {m["__id__"]: i for i, m in enumerate(new_row_meta)}
+        self._alive = np.ones(len(new_row_meta), dtype=bool)
+        self._committed_rows = len(new_row_meta)
+        self._log_size = len(payload)
+        # Commit point: the sidecar switches readers to the new generation
+        self._write_sidecar()
+        self._open_vectors(self._committed_rows)
+        self._remove_stale_generations()
+
+        logger.info(
+            f"[{self.workspace}] Compacted {self.namespace} to {self._committed_rows} rows (generation {old_generation} -> {new_generation})"
+        )
+
+    def _remove_stale_generations(self):
+        """Remove vector and log files not belonging to the current generation"""
+        current_files = {self._vector_file, self._log_file}
+        prefix = glob.escape(self._file_prefix)
+        stale_files = [
+            file_name
+            for suffix in (".vec", ".log", ".*.vec", ".*.log")
+            for file_name in glob.glob(prefix + suffix)
+            if file_name not in current_files
+        ]
+        for file_name in stale_files:
+            try:
+                os.remove(file_name)
+            except OSError as e:
+                logger.warning(
+                    f"[{self.workspace}] Could not remove stale file {file_name}: {e}"
+                )
+
+    def _needs_compaction(self) -> bool:
+        dead_rows = len(self._row_meta) - len(self._id_to_row)
+        return (
+            dead_rows >= MMAP_VDB_COMPACT_MIN_ROWS
+            and dead_rows > len(self._row_meta) * MMAP_VDB_COMPACT_RATIO
+        )
+
+    def _get_pending_matrix(self) -> np.ndarray | None:
+        if self._pending_matrix is None and self._pending_vectors:
+            self._pending_matrix = np.vstack(self._pending_vectors)
+        return self._pending_matrix
+
+    def _get_rows(self, rows) -> np.ndarray:
+        """Gather vectors for the given row numbers from mmap and pending rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        result = np.empty((len(rows), self._dim), dtype=np.float32)
+        committed = rows < self._committed_rows
+        if committed.any():
+            result[committed] = self._vectors[rows[committed]]
+        if (~committed).any():
+            result[~committed] = self._get_pending_matrix()[
+                rows[~committed] - self._committed_rows
+            ]
+        return result
+
+    def _delete_rows(self, rows: list[int]):
+        """Mark rows as dead and record the deletion in the pending log"""
+        for row in rows:
+            data = self._row_meta[row]
+            if data is None:
+                continue
+            if self._id_to_row.get(data["__id__"]) == row:
+                del self._id_to_row[data["__id__"]]
+            self._row_meta[row] = None
+            self._alive[row] = False
+            self._pending_log.append({"op": "del", "row": row})
+
+    async def _check_reload(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            # Check if data needs to be reloaded
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+
+    @staticmethod
+    def _format_result(data: dict[str, Any]) -> dict[str, Any]:
+        return {
+            **data,
+            "id": data.get("__id__"),
+            "created_at": data.get("__created_at__"),
+        }
+
+    # --------------------------------------------------------------------------------
+    # BaseVectorStorage interface
+    # --------------------------------------------------------------------------------
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+
+        # Normalize so that a dot product equals cosine similarity
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1, norms)
+
+        await self._check_reload()
+
+        # Replace existing rows: mark old rows dead and append new ones
+        self._delete_rows(
+            [
+                self._id_to_row[d["__id__"]]
+                for d in list_data
+                if d["__id__"] in self._id_to_row
+            ]
+        )
+        start_row = len(self._row_meta)
+        for i, d in enumerate(list_data):
+            row = start_row + i
+            self._row_meta.append(d)
+            self._id_to_row[d["__id__"]] = row
+            self._pending_log.append({"op": "add", "row": row, "data": d})
+        self._alive = np.concatenate([self._alive, np.ones(len(list_data), dtype=bool)])
+        self._pending_vectors.append(embeddings)
+        self._pending_matrix = None
+
+        return [d["__id__"] for d in list_data]
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = np.asarray(query_embedding, dtype=np.float32)
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = np.asarray(embedding[0], dtype=np.float32)
+
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        await self._check_reload()
+        if not self._id_to_row:
+            return []
+
+        # Vectorized cosine similarity over committed (mmap) and pending rows
+        score_parts = []
+        if self._vectors is not None:
+            score_parts.append(self._vectors @ embedding)
+        pending_matrix = self._get_pending_matrix()
+        if pending_matrix is not None:
+            score_parts.append(pending_matrix @ embedding)
+        scores = np.concatenate(score_parts)
+        scores[~self._alive] = -np.inf
+
+        k = min(top_k, len(self._id_to_row))
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+
+        results = []
+        for row in candidates:
+            score = float(scores[row])
+            if score < self.cosine_better_than_threshold:
+                break
+            results.append(
+                {**self._format_result(self._row_meta[row]), "distance": score}
+            )
+        return results
+
+    @property
+    async def client_storage(self):
+        await self._check_reload()
+        return {"data": [m for m in self._row_meta if m is not None]}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        try:
+            await self._check_reload()
+            rows = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+            self._delete_rows(rows)
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {len(rows)} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            logger.debug(
+                f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+            )
+            await self.delete([entity_id])
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error deleting entity {entity_name}: {e}")
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            await self._check_reload()
+            rows = [
+                row
+                for row, m in enumerate(self._row_meta)
+                if m is not None
+                and (m.get("src_id") == entity_name or m.get("tgt_id") == entity_name)
+            ]
+            logger.debug(
+                f"[{self.workspace}] Found {len(rows)} relations for entity {entity_name}"
+            )
+            self._delete_rows(rows)
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    async def index_done_callback(self) -> bool:
+        """Append new rows and log entries to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                if self._needs_compaction():
+                    self._compact()
+                elif self._pending_log or not os.path.exists(self._meta_file):
+                    self._append_pending()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._check_reload()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        return self._format_result(self._row_meta[row])
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._check_reload()
+        return [
+            self._format_result(self._row_meta[self._id_to_row[id]])
+            for id in ids
+            if id in self._id_to_row
+        ]
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        await self._check_reload()
+        found_ids = [id for id in ids if id in self._id_to_row]
+        if not found_ids:
+            return {}
+        vectors = self._get_rows([self._id_to_row[id] for id in found_ids])
+        return {id: vector.tolist() for id, vector in zip(found_ids, vectors)}
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the vector, log and sidecar files if they exist
+        2. Reset the in-memory state
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                self._reset_state()
+                if os.path.exists(self._meta_file):
+                    os.remove(self._meta_file)
+                self._remove_stale_generations()
+                for file_name in (self._vector_file, self._log_file):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._set_generation(0)
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._vector_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
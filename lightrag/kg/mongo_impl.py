@@ -183,6 +183,33 @@ class MongoKVStorage(BaseKVStorage):
             result[doc_id] = doc
         return result
 
+    async def get_cache_page(
+        self, cache_type: str, cursor: str | None, limit: int
+    ) -> tuple[dict[str, Any], str | None]:
+        """Get one page of LLM cache entries of a cache type, ordered by id
+
+        Args:
+            cache_type: Cache type of the entries to return
+            cursor: Id after which the page starts, None for the first page
+            limit: Maximum number of entries in the page
+
+        Returns:
+            The entries of the page and the cursor of the next page, or None
+            when this was the last page
+        """
+        query: dict[str, Any] = {"cache_type": cache_type}
+        if cursor is not None:
+            query["_id"] = {"$gt": cursor}
+        cursor_docs = self._data.find(query).sort("_id", 1).limit(limit)
+        result = {}
+        last_id = None
+        async for doc in cursor_docs:
+            last_id = doc.pop("_id")
+            doc.setdefault("create_time", 0)
+            doc.setdefault("update_time", 0)
+            result[last_id] = doc
+        return result, last_id if len(result) == limit else None
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -1086,6 +1113,75 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Insert or update many node documents with one unordered bulk_write.
+        """
+        operations = []
+        for node_id, node_data in nodes:
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert many edges with one unordered bulk_write, matching either direction
+        like upsert_edge. Source nodes are created first when missing.
+        """
+        if not edges:
+            return
+
+        # Ensure source nodes exist without overwriting their properties
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": source}, {"$set": {}}, upsert=True)
+                for source in {source for source, _, _ in edges}
+            ],
+            ordered=False,
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            update_doc = {
+                "$set": {
+                    **edge_data,
+                    "source_node_id": source_node_id,
+                    "target_node_id": target_node_id,
+                }
+            }
+            if edge_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = edge_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    update_doc,
+                    upsert=True,
+                )
+            )
+
+        await self.edge_collection.bulk_write(operations, ordered=False)
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -1056,6 +1056,118 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"[{self.workspace}] Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert many nodes with one UNWIND query per entity type.
+
+        Labels cannot be parameterized in Cypher, so nodes are grouped by
+        entity_type and each group is written in a single statement.
+
+        Args:
+            nodes: A list of (node_id, node_data) tuples
+        """
+        if not nodes:
+            return
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(node_data["entity_type"], []).append(
+                {"entity_id": node_id, "properties": node_data}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                for entity_type, rows in rows_by_type.items():
+
+                    async def execute_upsert(
+                        tx: AsyncManagedTransaction, rows=rows, entity_type=entity_type
+                    ):
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        result = await tx.run(query, rows=rows)
+                        await result.consume()
+
+                    await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch node upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert many edges with a single UNWIND query.
+
+        Edges whose endpoints do not exist are skipped by the MATCH clauses.
+
+        Args:
+            edges: A list of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if not edges:
+            return
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {"source": src, "target": tgt, "properties": edge_data}
+            for src, tgt, edge_data in edges
+        ]
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    query = f"""
+                    UNWIND $rows AS row
+                    MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+                    MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+                    MERGE (source)-[r:DIRECTED]-(target)
+                    SET r += row.properties
+                    """
+                    result = await tx.run(query, rows=rows)
+                    await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
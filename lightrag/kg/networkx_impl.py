@@ -37,6 +37,67 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def _edge_key(source_node_id: str, target_node_id: str) -> tuple[str, str]:
+        """Direction-independent key of an edge in the undirected graph"""
+        if source_node_id <= target_node_id:
+            return (source_node_id, target_node_id)
+        return (target_node_id, source_node_id)
+
+    @staticmethod
+    def _update_chunk_index(
+        index: dict[str, set], key, old_source_id: str | None, new_source_id: str | None
+    ) -> None:
+        """Move key between chunk_id entries of index after its source_id changed"""
+        if old_source_id == new_source_id:
+            return
+        old_chunk_ids = (
+            set(old_source_id.split(GRAPH_FIELD_SEP)) if old_source_id else set()
+        )
+        new_chunk_ids = (
+            set(new_source_id.split(GRAPH_FIELD_SEP)) if new_source_id else set()
+        )
+        for chunk_id in old_chunk_ids - new_chunk_ids:
+            keys = index.get(chunk_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[chunk_id]
+        for chunk_id in new_chunk_ids - old_chunk_ids:
+            index.setdefault(chunk_id, set()).add(key)
+
+    def _rebuild_chunk_index(self) -> None:
+        """Build the chunk_id -> node ids / edge keys index from the loaded graph"""
+        self._chunk_node_index = {}
+        self._chunk_edge_index = {}
+        for node_id, node_data in self._graph.nodes(data=True):
+            self._update_chunk_index(
+                self._chunk_node_index, node_id, None, node_data.get("source_id")
+            )
+        for u, v, edge_data in self._graph.edges(data=True):
+            self._update_chunk_index(
+                self._chunk_edge_index,
+                self._edge_key(u, v),
+                None,
+                edge_data.get("source_id"),
+            )
+
+    def _unindex_node(self, graph: nx.Graph, node_id: str) -> None:
+        """Drop a node and its incident edges from the chunk index before removal"""
+        self._update_chunk_index(
+            self._chunk_node_index,
+            node_id,
+            graph.nodes[node_id].get("source_id"),
+            None,
+        )
+        for u, v, edge_data in graph.edges(node_id, data=True):
+            self._update_chunk_index(
+                self._chunk_edge_index,
+                self._edge_key(u, v),
+                edge_data.get("source_id"),
+                None,
+            )
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -56,6 +117,9 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # chunk_id -> ids of nodes / keys of edges whose source_id contains it
+        self._chunk_node_index: dict[str, set[str]] = {}
+        self._chunk_edge_index: dict[str, set[tuple[str, str]]] = {}
 
         # Load initial graph
         preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
@@ -68,6 +132,7 @@ class NetworkXStorage(BaseGraphStorage):
                 f"[{self.workspace}] Created new empty graph fiel: {self._graphml_xml_file}"
             )
         self._graph = preloaded_graph or nx.Graph()
+        self._rebuild_chunk_index()
 
     async def initialize(self):
         """Initialize storage data"""
@@ -89,6 +154,7 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._rebuild_chunk_index()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -136,7 +202,16 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        old_source_id = (
+            graph.nodes[node_id].get("source_id") if graph.has_node(node_id) else None
+        )
         graph.add_node(node_id, **node_data)
+        self._update_chunk_index(
+            self._chunk_node_index,
+            node_id,
+            old_source_id,
+            graph.nodes[node_id].get("source_id"),
+        )
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -148,7 +223,16 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        old_source_id = None
+        if graph.has_edge(source_node_id, target_node_id):
+            old_source_id = graph.edges[source_node_id, target_node_id].get("source_id")
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._update_chunk_index(
+            self._chunk_edge_index,
+            self._edge_key(source_node_id, target_node_id),
+            old_source_id,
+            graph.edges[source_node_id, target_node_id].get("source_id"),
+        )
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -159,6 +243,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            self._unindex_node(graph, node_id)
             graph.remove_node(node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
@@ -180,6 +265,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
+                self._unindex_node(graph, node)
                 graph.remove_node(node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
@@ -196,6 +282,12 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for source, target in edges:
             if graph.has_edge(source, target):
+                self._update_chunk_index(
+                    self._chunk_edge_index,
+                    self._edge_key(source, target),
+                    graph.edges[source, target].get("source_id"),
+                    None,
+                )
                 graph.remove_edge(source, target)
 
     async def get_all_labels(self) -> list[str]:
@@ -470,31 +562,59 @@ class NetworkXStorage(BaseGraphStorage):
         )
         return result
 
+    @staticmethod
+    def _node_ranks(graph: nx.Graph, node_ids: set[str]) -> dict[str, int]:
+        """Positions of node_ids in the graph's node order
+
+        Stops at the last requested node, so only the graph prefix holding
+        the requested nodes is walked and no node or edge data is read.
+        """
+        ranks = {}
+        if not node_ids:
+            return ranks
+        for rank, node_id in enumerate(graph.nodes):
+            if node_id in node_ids:
+                ranks[node_id] = rank
+                if len(ranks) == len(node_ids):
+                    break
+        return ranks
+
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        # Resolve through the chunk index instead of scanning every node
+        node_ids = set()
+        for chunk_id in set(chunk_ids):
+            node_ids.update(self._chunk_node_index.get(chunk_id, ()))
+        # Return nodes in graph order, as a scan over all nodes would
+        ranks = self._node_ranks(graph, node_ids)
         matching_nodes = []
-        for node_id, node_data in graph.nodes(data=True):
-            if "source_id" in node_data:
-                node_source_ids = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not node_source_ids.isdisjoint(chunk_ids_set):
-                    node_data_with_id = node_data.copy()
-                    node_data_with_id["id"] = node_id
-                    matching_nodes.append(node_data_with_id)
+        for node_id in sorted(node_ids, key=ranks.__getitem__):
+            node_data_with_id = graph.nodes[node_id].copy()
+            node_data_with_id["id"] = node_id
+            matching_nodes.append(node_data_with_id)
         return matching_nodes
 
     async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        # Resolve through the chunk index instead of scanning every edge
+        edge_keys = set()
+        for chunk_id in set(chunk_ids):
+            edge_keys.update(self._chunk_edge_index.get(chunk_id, ()))
+        # Orient edges as graph.edges() would, with the endpoint that comes first
+        # in the graph's node order as source, and sort them by that node order
+        ranks = self._node_ranks(
+            graph, {node_id for key in edge_keys for node_id in key}
+        )
+        oriented_edges = sorted(
+            ((u, v) if ranks[u] <= ranks[v] else (v, u) for u, v in edge_keys),
+            key=lambda edge: (ranks[edge[0]], ranks[edge[1]]),
+        )
         matching_edges = []
-        for u, v, edge_data in graph.edges(data=True):
-            if "source_id" in edge_data:
-                edge_source_ids = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not edge_source_ids.isdisjoint(chunk_ids_set):
-                    edge_data_with_nodes = edge_data.copy()
-                    edge_data_with_nodes["source"] = u
-                    edge_data_with_nodes["target"] = v
-                    matching_edges.append(edge_data_with_nodes)
+        for u, v in oriented_edges:
+            edge_data_with_nodes = graph.edges[u, v].copy()
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            matching_edges.append(edge_data_with_nodes)
         return matching_edges
 
     async def get_all_nodes(self) -> list[dict]:
@@ -538,6 +658,7 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._rebuild_chunk_index()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -580,6 +701,7 @@ class NetworkXStorage(BaseGraphStorage):
                 if os.path.exists(self._graphml_xml_file):
                     os.remove(self._graphml_xml_file)
                 self._graph = nx.Graph()
+                self._rebuild_chunk_index()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
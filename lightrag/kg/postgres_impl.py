@@ -9,6 +9,7 @@ from typing import Any, Union, final
 import numpy as np
 import configparser
 import ssl
+import struct
 import itertools
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
@@ -49,6 +50,18 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+def _encode_vector(value: Any) -> bytes:
+    """Encode a vector into pgvector's binary wire format"""
+    vector = np.asarray(value, dtype=">f4")
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> list[float]:
+    """Decode pgvector's binary wire format into a list of floats"""
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).tolist()
+
+
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
         self.host = config["host"]
@@ -173,11 +186,15 @@ class PostgreSQLDB:
                     connection_params["ssl"] = False
                 logger.info(f"PostgreSQL, SSL mode set to: {self.ssl_mode}")
 
-            self.pool = await asyncpg.create_pool(**connection_params)  # type: ignore
+            self.pool = await asyncpg.create_pool(
+                **connection_params, init=self.configure_vector_codec
+            )  # type: ignore
 
             # Ensure VECTOR extension is available
             async with self.pool.acquire() as connection:
                 await self.configure_vector_extension(connection)
+            # Recreate connections opened before the extension existed so they get the codec
+            await self.pool.expire_connections()
 
             ssl_status = "with SSL" if connection_params.get("ssl") else "without SSL"
             logger.info(
@@ -189,6 +206,23 @@ class PostgreSQLDB:
             )
             raise
 
+    @staticmethod
+    async def configure_vector_codec(connection: asyncpg.Connection) -> None:
+        """Exchange VECTOR values in binary format instead of text"""
+        schema = await connection.fetchval(
+            "SELECT typnamespace::regnamespace::text FROM pg_type WHERE typname = 'vector'"
+        )
+        if schema is None:
+            # VECTOR extension not created yet, codec is set once the pool reconnects
+            return
+        await connection.set_type_codec(
+            "vector",
+            schema=schema,
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            format="binary",
+        )
+
     @staticmethod
     async def configure_vector_extension(connection: asyncpg.Connection) -> None:
         """Create VECTOR extension if it doesn't exist for vector similarity operations."""
@@ -240,7 +274,10 @@ class PostgreSQLDB:
             SELECT column_name
             FROM information_schema.columns
             WHERE table_name = 'lightrag_llm_cache'
-            AND column_name IN ('chunk_id', 'cache_type', 'queryparam', 'mode')
+            AND column_name IN (
+                'chunk_id', 'cache_type', 'queryparam', 'query_embedding',
+                'param_hash', 'mode'
+            )
             """
 
             existing_columns = await self.query(check_columns_sql, multirows=True)
@@ -313,6 +350,25 @@ class PostgreSQLDB:
                     "queryparam column already exists in LIGHTRAG_LLM_CACHE table"
                 )
 
+            # Add missing semantic query cache columns
+            for column_name, column_type in (
+                ("query_embedding", "TEXT"),
+                ("param_hash", "VARCHAR(64)"),
+            ):
+                if column_name not in existing_column_names:
+                    logger.info(
+                        f"Adding {column_name} column to LIGHTRAG_LLM_CACHE table"
+                    )
+                    await self.execute(
+                        f"""
+                    ALTER TABLE LIGHTRAG_LLM_CACHE
+                    ADD COLUMN {column_name} {column_type} NULL
+                    """
+                    )
+                    logger.info(
+                        f"Successfully added {column_name} column to LIGHTRAG_LLM_CACHE table"
+                    )
+
             # Remove deprecated mode field if it exists
             if "mode" in existing_column_names:
                 logger.info(
@@ -1288,6 +1344,51 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(self, sql: str, data_list: list[dict[str, Any]]) -> None:
+        """Execute a statement once per parameter set in a single batched call
+
+        asyncpg pipelines the parameter sets over one connection and applies them
+        atomically, avoiding a network round trip per row.
+        """
+        if not data_list:
+            return
+        try:
+            async with self.pool.acquire() as connection:  # type: ignore
+                await connection.executemany(
+                    sql, [tuple(data.values()) for data in data_list]
+                )
+        except Exception as e:
+            logger.error(
+                f"PostgreSQL database,\nsql:{sql},\nrows:{len(data_list)},\nerror:{e}"
+            )
+            raise
+
+    async def execute_in_transaction(
+        self,
+        sqls: list[str],
+        with_age: bool = False,
+        graph_name: str | None = None,
+    ) -> None:
+        """Execute several statements on one connection inside a single transaction
+
+        The connection is acquired and AGE configured once for the whole list,
+        instead of once per statement as with execute().
+        """
+        if not sqls:
+            return
+        if with_age and not graph_name:
+            raise ValueError("Graph name is required when with_age is True")
+        try:
+            async with self.pool.acquire() as connection:  # type: ignore
+                if with_age:
+                    await self.configure_age(connection, graph_name)
+                async with connection.transaction():
+                    for sql in sqls:
+                        await connection.execute(sql)
+        except Exception as e:
+            logger.error(f"PostgreSQL database,\nstatements:{len(sqls)},\nerror:{e}")
+            raise
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1535,6 +1636,38 @@ class PGKVStorage(BaseKVStorage):
             )
             return {}
 
+    async def get_cache_page(
+        self, cache_type: str, cursor: str | None, limit: int
+    ) -> tuple[dict[str, Any], str | None]:
+        """Get one page of LLM cache entries of a cache type, ordered by id
+
+        Only the fields needed to restore the semantic query cache are read,
+        so pages stay small however large the cached responses are.
+
+        Args:
+            cache_type: Cache type of the entries to return
+            cursor: Id after which the page starts, None for the first page
+            limit: Maximum number of entries in the page
+
+        Returns:
+            The entries of the page and the cursor of the next page, or None
+            when this was the last page
+        """
+        if not is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            return {}, None
+        sql = SQL_TEMPLATES["get_cache_page_llm_response_cache"]
+        params = [self.workspace, cache_type, cursor or "", limit]
+        rows = await self.db.query(sql, params, multirows=True) or []
+        result = {
+            row["id"]: {
+                **row,
+                "create_time": row.get("create_time") or 0,
+                "update_time": row.get("update_time") or row.get("create_time") or 0,
+            }
+            for row in rows
+        }
+        return result, rows[-1]["id"] if len(rows) == limit else None
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         """Get data by id."""
         sql = SQL_TEMPLATES["get_by_id_" + self.namespace]
@@ -1729,9 +1862,9 @@ class PGKVStorage(BaseKVStorage):
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "tokens": v["tokens"],
@@ -1743,20 +1876,22 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
+            rows = [
+                {
                     "id": k,
                     "content": v["content"],
                     "workspace": self.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,  # Use flattened key as id
                     "original_prompt": v["original_prompt"],
@@ -1768,15 +1903,17 @@ class PGKVStorage(BaseKVStorage):
                     "queryparam": json.dumps(v.get("queryparam"))
                     if v.get("queryparam")
                     else None,
+                    "query_embedding": v.get("query_embedding"),
+                    "param_hash": v.get("param_hash"),
                 }
-
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_ENTITIES):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "entity_names": json.dumps(v["entity_names"]),
@@ -1784,13 +1921,14 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_RELATIONS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "relation_pairs": json.dumps(v["relation_pairs"]),
@@ -1798,7 +1936,25 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_EMBEDDING_CACHE):
+            upsert_sql = SQL_TEMPLATES["upsert_embedding_cache"]
+            rows = [
+                {
+                    "workspace": self.workspace,
+                    "id": k,
+                    "model_name": v.get("model_name"),
+                    "embedding_dim": v.get("embedding_dim"),
+                    "embedding": v["embedding"],
+                }
+                for k, v in data.items()
+            ]
+        else:
+            return
+
+        # Write all records of the batch in one executemany call
+        await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -1904,7 +2060,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"],
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -1932,7 +2088,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -1956,7 +2112,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -1987,20 +2143,26 @@ class PGVectorStorage(BaseVectorStorage):
         embedding_tasks = [self.embedding_func(batch) for batch in batches]
         embeddings_list = await asyncio.gather(*embedding_tasks)
 
-        embeddings = np.concatenate(embeddings_list)
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
+
+        if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
+            prepare_row = self._upsert_chunks
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
+            prepare_row = self._upsert_entities
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
+            prepare_row = self._upsert_relationships
+        else:
+            raise ValueError(f"{self.namespace} is not supported")
+
+        rows = []
         for item in list_data:
-            if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
-                upsert_sql, data = self._upsert_chunks(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
-                upsert_sql, data = self._upsert_entities(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
-                upsert_sql, data = self._upsert_relationships(item, current_time)
-            else:
-                raise ValueError(f"{self.namespace} is not supported")
+            upsert_sql, row = prepare_row(item, current_time)
+            rows.append(row)
 
-            await self.db.execute(upsert_sql, data)
+        # Write all records of the batch in one executemany call, vectors in binary
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -2192,8 +2354,10 @@ class PGVectorStorage(BaseVectorStorage):
             for result in results:
                 if result and "content_vector" in result and "id" in result:
                     try:
-                        # Parse JSON string to get vector as list of floats
-                        vector_data = json.loads(result["content_vector"])
+                        # Vectors arrive decoded by the binary codec, or as text
+                        vector_data = result["content_vector"]
+                        if isinstance(vector_data, str):
+                            vector_data = json.loads(vector_data)
                         if isinstance(vector_data, list):
                             vectors_dict[result["id"]] = vector_data
                     except (json.JSONDecodeError, TypeError) as e:
@@ -3301,6 +3465,94 @@ class PGGraphStorage(BaseGraphStorage):
             )
             raise
 
+    async def _execute_graph_batch(self, queries: list[str]) -> None:
+        try:
+            await self.db.execute_in_transaction(
+                queries, with_age=True, graph_name=self.graph_name
+            )
+        except Exception as e:
+            raise PGGraphQueryException(
+                {
+                    "message": f"Error executing {len(queries)} graph queries in batch",
+                    "wrapped": queries[0] if queries else "",
+                    "detail": str(e),
+                }
+            ) from e
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert many nodes in a single transaction on one connection.
+
+        AGE vertices need graph ids from the graph's own sequences and MERGE
+        semantics, so COPY does not apply; the MERGE statements used by
+        upsert_node are instead sent together to skip the per-node connection
+        checkout, AGE setup and commit.
+
+        Args:
+            nodes: A list of (node_id, node_data) tuples
+        """
+        queries = []
+        for node_id, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "PostgreSQL: node properties must contain an 'entity_id' field"
+                )
+            queries.append(
+                """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype)"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(node_id),
+                    self._format_properties(node_data),
+                )
+            )
+        await self._execute_graph_batch(queries)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert many edges in a single transaction on one connection.
+
+        Args:
+            edges: A list of (source_node_id, target_node_id, edge_data) tuples
+        """
+        queries = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_properties = self._format_properties(edge_data)
+            queries.append(
+                """SELECT * FROM cypher('%s', $$
+                     MATCH (source:base {entity_id: "%s"})
+                     WITH source
+                     MATCH (target:base {entity_id: "%s"})
+                     MERGE (source)-[r:DIRECTED]-(target)
+                     SET r += %s
+                     SET r += %s
+                     RETURN r
+                   $$) AS (r agtype)"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(source_node_id),
+                    self._normalize_node_id(target_node_id),
+                    edge_properties,
+                    edge_properties,
+                )
+            )
+        await self._execute_graph_batch(queries)
+
     async def delete_node(self, node_id: str) -> None:
         """
         Delete a node from the graph.
@@ -4393,6 +4645,7 @@ NAMESPACE_TABLE_MAP = {
     NameSpace.KV_STORE_FULL_ENTITIES: "LIGHTRAG_FULL_ENTITIES",
     NameSpace.KV_STORE_FULL_RELATIONS: "LIGHTRAG_FULL_RELATIONS",
     NameSpace.KV_STORE_LLM_RESPONSE_CACHE: "LIGHTRAG_LLM_CACHE",
+    NameSpace.KV_STORE_EMBEDDING_CACHE: "LIGHTRAG_EMBEDDING_CACHE",
     NameSpace.VECTOR_STORE_CHUNKS: "LIGHTRAG_VDB_CHUNKS",
     NameSpace.VECTOR_STORE_ENTITIES: "LIGHTRAG_VDB_ENTITY",
     NameSpace.VECTOR_STORE_RELATIONSHIPS: "LIGHTRAG_VDB_RELATION",
@@ -4487,11 +4740,25 @@ TABLES = {
                     chunk_id VARCHAR(255) NULL,
                     cache_type VARCHAR(32),
                     queryparam JSONB NULL,
+                    query_embedding TEXT NULL,
+                    param_hash VARCHAR(64) NULL,
                     create_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     update_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 	                CONSTRAINT LIGHTRAG_LLM_CACHE_PK PRIMARY KEY (workspace, id)
                     )"""
     },
+    "LIGHTRAG_EMBEDDING_CACHE": {
+        "ddl": """CREATE TABLE LIGHTRAG_EMBEDDING_CACHE (
+	                workspace varchar(255) NOT NULL,
+	                id varchar(255) NOT NULL,
+                    model_name VARCHAR(255) NULL,
+                    embedding_dim INTEGER NULL,
+                    embedding TEXT,
+                    create_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+	                CONSTRAINT LIGHTRAG_EMBEDDING_CACHE_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
     "LIGHTRAG_DOC_STATUS": {
         "ddl": """CREATE TABLE LIGHTRAG_DOC_STATUS (
 	               workspace varchar(255) NOT NULL,
@@ -4587,20 +4854,47 @@ SQL_TEMPLATES = {
                                  EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
                                  FROM LIGHTRAG_FULL_RELATIONS WHERE workspace=$1 AND id IN ({ids})
                                 """,
+    "get_by_id_embedding_cache": """SELECT id, model_name, embedding_dim, embedding,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_EMBEDDING_CACHE WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_embedding_cache": """SELECT id, model_name, embedding_dim, embedding,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_EMBEDDING_CACHE WHERE workspace=$1 AND id IN ({ids})
+                                """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
     "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, workspace)
                         VALUES ($1, $2, $3)
                         ON CONFLICT (workspace,id) DO UPDATE
                            SET content = $2, update_time = CURRENT_TIMESTAMP
                        """,
-    "upsert_llm_response_cache": """INSERT INTO LIGHTRAG_LLM_CACHE(workspace,id,original_prompt,return_value,chunk_id,cache_type,queryparam)
-                                      VALUES ($1, $2, $3, $4, $5, $6, $7)
+    "upsert_llm_response_cache": """INSERT INTO LIGHTRAG_LLM_CACHE(workspace,id,original_prompt,return_value,chunk_id,cache_type,queryparam,query_embedding,param_hash)
+                                      VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
                                       ON CONFLICT (workspace,id) DO UPDATE
                                       SET original_prompt = EXCLUDED.original_prompt,
                                       return_value=EXCLUDED.return_value,
                                       chunk_id=EXCLUDED.chunk_id,
                                       cache_type=EXCLUDED.cache_type,
                                       queryparam=EXCLUDED.queryparam,
+                                      query_embedding=EXCLUDED.query_embedding,
+                                      param_hash=EXCLUDED.param_hash,
+                                      update_time = CURRENT_TIMESTAMP
+                                     """,
+    "get_cache_page_llm_response_cache": """SELECT id, query_embedding, param_hash,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_LLM_CACHE
+                                 WHERE workspace=$1 AND cache_type=$2 AND id > $3
+                                 ORDER BY id LIMIT $4
+                                """,
+    "upsert_embedding_cache": """INSERT INTO LIGHTRAG_EMBEDDING_CACHE(workspace,id,model_name,embedding_dim,embedding)
+                                      VALUES ($1, $2, $3, $4, $5)
+                                      ON CONFLICT (workspace,id) DO UPDATE
+                                      SET model_name = EXCLUDED.model_name,
+                                      embedding_dim=EXCLUDED.embedding_dim,
+                                      embedding=EXCLUDED.embedding,
                                       update_time = CURRENT_TIMESTAMP
                                      """,
     "upsert_text_chunk": """INSERT INTO LIGHTRAG_DOC_CHUNKS (workspace, id, tokens,
@@ -22,6 +22,7 @@ from lightrag.base import (
     DocProcessingStatus,
 )
 from ..kg.shared_storage import get_data_init_lock, get_storage_lock
+from ..namespace import NameSpace, is_namespace
 import json
 
 # Import tenacity for retry logic
@@ -199,8 +200,8 @@ class RedisKVStorage(BaseKVStorage):
                 await self.close()
                 raise
 
-            # Migrate legacy cache structure if this is a cache namespace
-            if self.namespace.endswith("_cache"):
+            # Migrate legacy cache structure if this is the LLM cache namespace
+            if is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
                 try:
                     await self._migrate_legacy_cache_structure()
                 except Exception as e:
@@ -349,6 +350,50 @@ class RedisKVStorage(BaseKVStorage):
                 )
                 return {}
 
+    async def get_cache_page(
+        self, cache_type: str, cursor: int | None, limit: int
+    ) -> tuple[dict[str, Any], int | None]:
+        """Get one page of LLM cache entries of a cache type
+
+        Pages follow a Redis SCAN over the flattened `{mode}:{cache_type}:{hash}`
+        keys, so an entry may show up on more than one page.
+
+        Args:
+            cache_type: Cache type of the entries to return
+            cursor: SCAN cursor returned with the previous page, None for the first page
+            limit: Number of keys to scan for the page
+
+        Returns:
+            The entries of the page and the cursor of the next page, or None
+            when the scan is complete
+        """
+        async with self._get_redis_connection() as redis:
+            next_cursor, keys = await redis.scan(
+                cursor=cursor or 0,
+                match=f"{self.final_namespace}:*:{cache_type}:*",
+                count=limit,
+            )
+            result = {}
+            if keys:
+                pipe = redis.pipeline()
+                for key in keys:
+                    pipe.get(key)
+                values = await pipe.execute()
+                for key, value in zip(keys, values):
+                    if not value:
+                        continue
+                    try:
+                        data = json.loads(value)
+                    except json.JSONDecodeError as e:
+                        logger.error(
+                            f"[{self.workspace}] JSON decode error for key {key}: {e}"
+                        )
+                        continue
+                    data.setdefault("create_time", 0)
+                    data.setdefault("update_time", 0)
+                    result[key.split(":", 1)[1]] = data
+            return result, next_cursor or None
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         async with self._get_redis_connection() as redis:
             pipe = redis.pipeline()
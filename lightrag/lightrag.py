@@ -12,6 +12,7 @@ from functools import partial
 from typing import (
     Any,
     AsyncIterator,
+    Awaitable,
     Callable,
     Iterator,
     cast,
@@ -38,11 +39,25 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_PIPELINE_QUEUE_SIZE,
+    DEFAULT_REBUILD_BATCH_SIZE,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_EMBEDDING_CACHE_MEMORY_ENTRIES,
+    DEFAULT_EMBEDDING_BATCH_WAIT_MS,
+    DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_RETRIEVAL_CACHE_TTL,
+    DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES,
+    DEFAULT_LLM_ADAPTIVE_CONCURRENCY,
+    DEFAULT_MAX_ASYNC_LIMIT,
+    DEFAULT_LLM_RPM_LIMIT,
+    DEFAULT_LLM_TPM_LIMIT,
+    DEFAULT_LLM_QUERY_RATE_RESERVE,
 )
 from lightrag.utils import get_env_value
 
@@ -57,6 +72,7 @@ from lightrag.kg.shared_storage import (
     get_pipeline_status_lock,
     get_graph_db_lock,
     get_data_init_lock,
+    get_update_flag,
 )
 
 from .base import (
@@ -85,7 +101,15 @@ from .constants import GRAPH_FIELD_SEP
 from .utils import (
     Tokenizer,
     TiktokenTokenizer,
+    AdaptiveConcurrencyLimiter,
+    LLMRateLimiter,
     EmbeddingFunc,
+    EmbeddingCache,
+    SemanticQueryCache,
+    RetrievalCache,
+    cached_embedding_func_call,
+    batched_embedding_func_call,
+    get_embedding_model_name,
     always_get_an_event_loop,
     compute_mdhash_id,
     lazy_external_import,
@@ -97,6 +121,7 @@ from .utils import (
     logger,
 )
 from .types import KnowledgeGraph
+from .llm.client_registry import acquire_shared_clients, release_shared_clients
 from dotenv import load_dotenv
 
 # use the .env that is inside the current folder
@@ -249,7 +274,9 @@ class LightRAG:
         - `tokens`: The number of tokens in the chunk.
         - `content`: The text content of the chunk.
 
-    Defaults to `chunking_by_token_size` if not specified.
+    Defaults to `chunking_by_token_size` if not specified. For very large documents,
+    `lightrag.operate.chunking_by_token_size_streaming` yields the same chunks one at a
+    time, slicing them from the original text instead of decoding tokens.
     """
 
     # Embedding
@@ -261,6 +288,14 @@ class LightRAG:
     embedding_batch_num: int = field(default=int(os.getenv("EMBEDDING_BATCH_NUM", 10)))
     """Batch size for embedding computations."""
 
+    embedding_batch_wait_ms: float = field(
+        default=get_env_value(
+            "EMBEDDING_BATCH_WAIT_MS", DEFAULT_EMBEDDING_BATCH_WAIT_MS, float
+        )
+    )
+    """Milliseconds to gather concurrent small embedding calls (e.g. single query or
+    entity texts) into one request of up to `embedding_batch_num` texts. 0 disables."""
+
     embedding_func_max_async: int = field(
         default=int(os.getenv("EMBEDDING_FUNC_MAX_ASYNC", 8))
     )
@@ -268,13 +303,20 @@ class LightRAG:
 
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
-            "enabled": False,
+            "enabled": get_env_value("ENABLE_EMBEDDING_CACHE", False, bool),
+            "max_memory_entries": get_env_value(
+                "EMBEDDING_CACHE_MEMORY_ENTRIES",
+                DEFAULT_EMBEDDING_CACHE_MEMORY_ENTRIES,
+                int,
+            ),
             "similarity_threshold": 0.95,
             "use_llm_check": False,
         }
     )
     """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
+    - enabled: If True, embeddings are cached by hash of text, model name and dimension,
+      so unchanged text is never re-embedded. Vectors are persisted in the configured KV storage.
+    - max_memory_entries: Maximum number of vectors kept in the in-memory LRU tier.
     - similarity_threshold: Minimum similarity score to use cached embeddings.
     - use_llm_check: If True, validates cached embeddings using an LLM.
     """
@@ -312,7 +354,38 @@ class LightRAG:
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
-    """Maximum number of concurrent LLM calls."""
+    """Maximum number of concurrent LLM calls. Starting point when `llm_adaptive_concurrency` is enabled."""
+
+    llm_adaptive_concurrency: bool = field(
+        default=get_env_value(
+            "LLM_ADAPTIVE_CONCURRENCY", DEFAULT_LLM_ADAPTIVE_CONCURRENCY, bool
+        )
+    )
+    """Adjust LLM concurrency at runtime (AIMD): grow by one while calls succeed with
+    healthy latency, halve on rate limit (429) or timeout errors."""
+
+    llm_model_max_async_limit: int = field(
+        default=get_env_value("MAX_ASYNC_LIMIT", DEFAULT_MAX_ASYNC_LIMIT, int)
+    )
+    """Upper bound of LLM concurrency when `llm_adaptive_concurrency` is enabled."""
+
+    llm_requests_per_minute: int = field(
+        default=get_env_value("LLM_RPM_LIMIT", DEFAULT_LLM_RPM_LIMIT, int)
+    )
+    """Requests-per-minute limit of the LLM provider. 0 disables."""
+
+    llm_tokens_per_minute: int = field(
+        default=get_env_value("LLM_TPM_LIMIT", DEFAULT_LLM_TPM_LIMIT, int)
+    )
+    """Tokens-per-minute limit of the LLM provider. 0 disables. Call cost is estimated
+    with `tokenizer` and corrected with the usage reported to a `token_tracker`."""
+
+    llm_query_rate_reserve: float = field(
+        default=get_env_value(
+            "LLM_QUERY_RATE_RESERVE", DEFAULT_LLM_QUERY_RATE_RESERVE, float
+        )
+    )
+    """Share of the RPM/TPM budget that indexing calls leave free for query calls."""
 
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
@@ -344,13 +417,90 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    semantic_cache_config: dict[str, Any] = field(
+        default_factory=lambda: {
+            "enabled": get_env_value("ENABLE_SEMANTIC_QUERY_CACHE", False, bool),
+            "similarity_threshold": get_env_value(
+                "SEMANTIC_QUERY_CACHE_THRESHOLD",
+                DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+                float,
+            ),
+            "ttl": get_env_value(
+                "SEMANTIC_QUERY_CACHE_TTL", DEFAULT_SEMANTIC_CACHE_TTL, int
+            ),
+            "max_entries": get_env_value(
+                "SEMANTIC_QUERY_CACHE_MAX_ENTRIES",
+                DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+                int,
+            ),
+        }
+    )
+    """Configuration for the semantic query cache (requires `enable_llm_cache`).
+    - enabled: If True, kg_query answers are stored with their query embedding and
+      reused for later queries with the same mode and parameters whose embedding is similar.
+    - similarity_threshold: Minimum cosine similarity between query embeddings for a hit.
+    - ttl: Seconds a cached answer can be reused, 0 keeps it until evicted.
+    - max_entries: Maximum number of query embeddings kept in memory (LRU).
+    """
+
+    retrieval_cache_config: dict[str, Any] = field(
+        default_factory=lambda: {
+            "enabled": get_env_value("ENABLE_RETRIEVAL_CACHE", False, bool),
+            "ttl": get_env_value(
+                "RETRIEVAL_CACHE_TTL", DEFAULT_RETRIEVAL_CACHE_TTL, int
+            ),
+            "max_entries": get_env_value(
+                "RETRIEVAL_CACHE_MAX_ENTRIES",
+                DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES,
+                int,
+            ),
+        }
+    )
+    """Configuration for the in-memory knowledge graph retrieval cache.
+    - enabled: If True, entities and relations retrieved for the same keywords and top_k,
+      and the chunks selected for them, are reused, skipping keyword embedding, vector
+      search, graph traversal and chunk lookups.
+      The cache is dropped whenever the graph or entity/relation vector storages change.
+    - ttl: Seconds retrieval results can be reused.
+    - max_entries: Maximum number of keyword sets kept in memory (LRU).
+    """
+
     # Extensions
     # ---
 
     max_parallel_insert: int = field(
         default=int(os.getenv("MAX_PARALLEL_INSERT", DEFAULT_MAX_PARALLEL_INSERT))
     )
-    """Maximum number of parallel insert operations."""
+    """Maximum number of parallel insert operations.
+    Default number of workers of each document pipeline stage."""
+
+    max_parallel_chunking: int = field(
+        default=get_env_value("MAX_PARALLEL_CHUNKING", 0, int)
+    )
+    """Workers of the chunking stage (chunk, embed and store chunks), 0 uses max_parallel_insert."""
+
+    max_parallel_extract: int = field(
+        default=get_env_value("MAX_PARALLEL_EXTRACT", 0, int)
+    )
+    """Workers of the LLM entity extraction stage, 0 uses max_parallel_insert."""
+
+    max_parallel_merge: int = field(default=get_env_value("MAX_PARALLEL_MERGE", 0, int))
+    """Workers of the graph merge and summarization stage, 0 uses max_parallel_insert."""
+
+    pipeline_queue_size: int = field(
+        default=get_env_value("PIPELINE_QUEUE_SIZE", DEFAULT_PIPELINE_QUEUE_SIZE, int)
+    )
+    """Documents that may wait between two pipeline stages before the earlier stage blocks."""
+
+    merge_batch_size: int = field(default=get_env_value("MERGE_BATCH_SIZE", 1, int))
+    """Documents merged into the graph together. Above 1, each merge worker collects this many
+    extracted documents and merges and summarizes every shared entity or relation once per batch."""
+
+    rebuild_batch_size: int = field(
+        default=get_env_value("REBUILD_BATCH_SIZE", DEFAULT_REBUILD_BATCH_SIZE, int)
+    )
+    """Entities or relations rebuilt together after a document deletion, each batch read and
+    written with one batched graph and vector storage call."""
 
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
@@ -466,11 +616,16 @@ class LightRAG:
         logger.debug(f"LightRAG init with param:\n  {_print_config}\n")
 
         # Init Embedding
+        embedding_model_name = get_embedding_model_name(self.embedding_func)
         self.embedding_func = priority_limit_async_func_call(
             self.embedding_func_max_async,
             llm_timeout=self.default_embedding_timeout,
             queue_name="Embedding func",
         )(self.embedding_func)
+        self.embedding_func = batched_embedding_func_call(
+            self.embedding_batch_num,
+            max_wait_time=self.embedding_batch_wait_ms / 1000,
+        )(self.embedding_func)
 
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
@@ -495,6 +650,28 @@ class LightRAG:
         # Initialize document status storage
         self.doc_status_storage_cls = self._get_storage_class(self.doc_status_storage)
 
+        # Init embedding cache (checked before entering the embedding queue)
+        self.embedding_cache_storage: BaseKVStorage | None = None
+        self.embedding_cache: EmbeddingCache | None = None
+        if self.embedding_cache_config.get("enabled", False):
+            self.embedding_cache_storage = self.key_string_value_json_storage_cls(  # type: ignore
+                namespace=NameSpace.KV_STORE_EMBEDDING_CACHE,
+                workspace=self.workspace,
+                embedding_func=None,
+            )
+            self.embedding_cache = EmbeddingCache(
+                kv_storage=self.embedding_cache_storage,
+                max_memory_entries=self.embedding_cache_config.get(
+                    "max_memory_entries", DEFAULT_EMBEDDING_CACHE_MEMORY_ENTRIES
+                ),
+            )
+            self.embedding_func = cached_embedding_func_call(
+                self.embedding_cache,
+                model_name=embedding_model_name,
+                embedding_dim=self.embedding_func.embedding_dim,
+            )(self.embedding_func)
+            logger.info(f"Embedding cache enabled for model: {embedding_model_name}")
+
         self.llm_response_cache: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
             namespace=NameSpace.KV_STORE_LLM_RESPONSE_CACHE,
             workspace=self.workspace,
@@ -502,6 +679,28 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        self.semantic_query_cache: SemanticQueryCache | None = None
+        if self.semantic_cache_config.get("enabled", False):
+            self.semantic_query_cache = SemanticQueryCache(
+                self.llm_response_cache,
+                similarity_threshold=self.semantic_cache_config.get(
+                    "similarity_threshold", DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD
+                ),
+                ttl=self.semantic_cache_config.get("ttl", DEFAULT_SEMANTIC_CACHE_TTL),
+                max_entries=self.semantic_cache_config.get(
+                    "max_entries", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES
+                ),
+            )
+
+        self.retrieval_cache: RetrievalCache | None = None
+        if self.retrieval_cache_config.get("enabled", False):
+            self.retrieval_cache = RetrievalCache(
+                ttl=self.retrieval_cache_config.get("ttl", DEFAULT_RETRIEVAL_CACHE_TTL),
+                max_entries=self.retrieval_cache_config.get(
+                    "max_entries", DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES
+                ),
+            )
+
         self.text_chunks: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
             namespace=NameSpace.KV_STORE_TEXT_CHUNKS,
             workspace=self.workspace,
@@ -562,11 +761,31 @@ class LightRAG:
         # Directly use llm_response_cache, don't create a new object
         hashing_kv = self.llm_response_cache
 
+        self.llm_concurrency_limiter: AdaptiveConcurrencyLimiter | None = None
+        if self.llm_adaptive_concurrency:
+            self.llm_concurrency_limiter = AdaptiveConcurrencyLimiter(
+                self.llm_model_max_async,
+                max_limit=max(self.llm_model_max_async, self.llm_model_max_async_limit),
+                name="LLM func",
+            )
+
+        self.llm_rate_limiter: LLMRateLimiter | None = None
+        if self.llm_requests_per_minute > 0 or self.llm_tokens_per_minute > 0:
+            self.llm_rate_limiter = LLMRateLimiter(
+                requests_per_minute=self.llm_requests_per_minute,
+                tokens_per_minute=self.llm_tokens_per_minute,
+                tokenizer=self.tokenizer,
+                query_reserve=self.llm_query_rate_reserve,
+                name="LLM func",
+            )
+
         # Get timeout from LLM model kwargs for dynamic timeout calculation
         self.llm_model_func = priority_limit_async_func_call(
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            concurrency_limiter=self.llm_concurrency_limiter,
+            rate_limiter=self.llm_rate_limiter,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -590,12 +809,34 @@ class LightRAG:
                 self.chunks_vdb,
                 self.chunk_entity_relation_graph,
                 self.llm_response_cache,
+                self.embedding_cache_storage,
                 self.doc_status,
             ):
                 if storage:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            if self.semantic_query_cache is not None:
+                # Restore cached query embeddings in the background
+                self.semantic_query_cache.warm_up()
+
+            if self.retrieval_cache is not None:
+                # File based storages set these flags when another writer commits
+                self.retrieval_cache.watch(
+                    [
+                        await get_update_flag(storage.final_namespace)
+                        for storage in (
+                            self.entities_vdb,
+                            self.relationships_vdb,
+                            self.chunk_entity_relation_graph,
+                        )
+                        if getattr(storage, "final_namespace", None)
+                    ]
+                )
+
+            # Keep pooled binding connections open until this instance is finalized
+            acquire_shared_clients()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
@@ -612,6 +853,7 @@ class LightRAG:
                 ("chunks_vdb", self.chunks_vdb),
                 ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
                 ("llm_response_cache", self.llm_response_cache),
+                ("embedding_cache", self.embedding_cache_storage),
                 ("doc_status", self.doc_status),
             ]
 
@@ -643,6 +885,10 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            # Release pooled connections of the LLM/embedding/rerank bindings
+            # once no other instance on this event loop is using them
+            await release_shared_clients()
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -868,6 +1114,7 @@ class LightRAG:
         ids: str | list[str] | None = None,
         file_paths: str | list[str] | None = None,
         track_id: str | None = None,
+        update: bool = False,
     ) -> str:
         """Sync Insert documents with checkpoint support
 
@@ -880,6 +1127,7 @@ class LightRAG:
             ids: single string of the document ID or list of unique document IDs, if not provided, MD5 hash IDs will be generated
             file_paths: single string of the file path or list of file paths, used for citation
             track_id: tracking ID for monitoring processing status, if not provided, will be generated
+            update: if True, documents whose ID already exists are updated incrementally instead of ignored
 
         Returns:
             str: tracking ID for monitoring processing status
@@ -893,6 +1141,7 @@ class LightRAG:
                 ids,
                 file_paths,
                 track_id,
+                update,
             )
         )
 
@@ -904,6 +1153,7 @@ class LightRAG:
         ids: str | list[str] | None = None,
         file_paths: str | list[str] | None = None,
         track_id: str | None = None,
+        update: bool = False,
     ) -> str:
         """Async Insert documents with checkpoint support
 
@@ -916,6 +1166,7 @@ class LightRAG:
             ids: list of unique document IDs, if not provided, MD5 hash IDs will be generated
             file_paths: list of file paths corresponding to each document, used for citation
             track_id: tracking ID for monitoring processing status, if not provided, will be generated
+            update: if True, documents whose ID already exists are updated incrementally instead of ignored
 
         Returns:
             str: tracking ID for monitoring processing status
@@ -924,7 +1175,9 @@ class LightRAG:
         if track_id is None:
             track_id = generate_track_id("insert")
 
-        await self.apipeline_enqueue_documents(input, ids, file_paths, track_id)
+        await self.apipeline_enqueue_documents(
+            input, ids, file_paths, track_id, update=update
+        )
         await self.apipeline_process_enqueue_documents(
             split_by_character, split_by_character_only
         )
@@ -1009,20 +1262,30 @@ class LightRAG:
         ids: list[str] | None = None,
         file_paths: str | list[str] | None = None,
         track_id: str | None = None,
+        update: bool = False,
     ) -> str:
         """
         Pipeline for Processing Documents
 
         1. Validate ids if provided or generate MD5 hash IDs and remove duplicate contents
         2. Generate document initial status
-        3. Filter out already processed documents
+        3. Filter out already processed documents, or mark them for update in update mode
         4. Enqueue document in status
 
+        In update mode a processed document that is enqueued again with new content
+        keeps its chunks_list. The pipeline re-chunks the new version and diffs the
+        chunk hashes against that list: only new chunks are embedded, extracted and
+        merged, and the knowledge of removed chunks is deleted or rebuilt from the
+        remaining chunks, as on document deletion. Token-window chunking shifts all
+        windows after an edit, so the diff is only small when the document is split
+        by a paragraph separator (split_by_character) on insert and on update.
+
         Args:
             input: Single document string or list of document strings
             ids: list of unique document IDs, if not provided, MD5 hash IDs will be generated
             file_paths: list of file paths corresponding to each document, used for citation
             track_id: tracking ID for monitoring processing status, if not provided, will be generated with "enqueue" prefix
+            update: if True, documents whose ID already exists are updated incrementally instead of ignored
 
         Returns:
             str: tracking ID for monitoring processing status
@@ -1112,6 +1375,10 @@ class LightRAG:
 
         # Log ignored document IDs (documents that were filtered out because they already exist)
         ignored_ids = list(all_new_doc_ids - unique_new_doc_ids)
+        if update and ignored_ids:
+            ignored_ids = await self._enqueue_document_updates(
+                ignored_ids, new_docs, contents, unique_new_doc_ids
+            )
         if ignored_ids:
             for doc_id in ignored_ids:
                 file_path = new_docs.get(doc_id, {}).get("file_path", "unknown_source")
@@ -1150,6 +1417,68 @@ class LightRAG:
 
         return track_id
 
+    async def _enqueue_document_updates(
+        self,
+        existing_ids: list[str],
+        new_docs: dict[str, Any],
+        contents: dict[str, Any],
+        unique_new_doc_ids: set[str],
+    ) -> list[str]:
+        """Prepare the status of existing documents enqueued in update mode
+
+        A processed document (or an update not finished yet) keeps its chunks_list
+        and is marked with metadata {"update": True} so that the pipeline diffs the
+        new version against it. A pending document is simply replaced. Accepted IDs
+        are added to unique_new_doc_ids.
+
+        Returns:
+            list[str]: IDs that are still ignored, because their content did not
+                change or they are being processed or failed
+        """
+        existing_docs = await asyncio.gather(
+            *[self.doc_status.get_by_id(doc_id) for doc_id in existing_ids]
+        )
+        ignored_ids = []
+        for doc_id, existing_doc in zip(existing_ids, existing_docs):
+            if not existing_doc:
+                unique_new_doc_ids.add(doc_id)
+                continue
+
+            status = existing_doc.get("status")
+            metadata = existing_doc.get("metadata") or {}
+            if status == DocStatus.PROCESSED or metadata.get("update"):
+                if status == DocStatus.PROCESSED:
+                    content_data = await self.full_docs.get_by_id(doc_id)
+                    if (
+                        content_data
+                        and content_data.get("content") == contents[doc_id]["content"]
+                    ):
+                        ignored_ids.append(doc_id)
+                        continue
+                chunks_list = existing_doc.get("chunks_list") or []
+                new_docs[doc_id].update(
+                    {
+                        "chunks_count": len(chunks_list),
+                        "chunks_list": chunks_list,
+                        "created_at": existing_doc.get(
+                            "created_at", new_docs[doc_id]["created_at"]
+                        ),
+                        "metadata": {"update": True},
+                    }
+                )
+            elif status != DocStatus.PENDING:
+                logger.warning(
+                    f"Cannot update document {doc_id} in {status} status, delete it and insert it again"
+                )
+                ignored_ids.append(doc_id)
+                continue
+            unique_new_doc_ids.add(doc_id)
+            logger.info(
+                f"Updating document: {doc_id} ({new_docs[doc_id]['file_path']})"
+            )
+
+        return ignored_ids
+
     async def apipeline_enqueue_error_documents(
         self,
         error_files: list[dict[str, Any]],
@@ -1331,6 +1660,15 @@ class LightRAG:
                         "error_msg": "",
                         "metadata": {},
                     }
+                    if (status_doc.metadata or {}).get("update"):
+                        # Keep diffing an unfinished update against the processed version
+                        docs_to_reset[doc_id].update(
+                            {
+                                "chunks_count": status_doc.chunks_count,
+                                "chunks_list": status_doc.chunks_list,
+                                "metadata": {"update": True},
+                            }
+                        )
 
                     # Update the status in to_process_docs as well
                     status_doc.status = DocStatus.PENDING
@@ -1348,6 +1686,190 @@ class LightRAG:
 
         return to_process_docs
 
+    def _chunk_document_content(
+        self,
+        doc_id: str,
+        content: str,
+        file_path: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+    ) -> dict[str, Any]:
+        """Split document content into chunks keyed by their content hash"""
+        return {
+            compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                **dp,
+                "full_doc_id": doc_id,
+                "file_path": file_path,  # Add file path to each chunk
+                "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+            }
+            for dp in self.chunking_func(
+                self.tokenizer,
+                content,
+                split_by_character,
+                split_by_character_only,
+                self.chunk_overlap_token_size,
+                self.chunk_token_size,
+            )
+        }
+
+    async def _reposition_kept_chunks(
+        self, chunks: dict[str, Any], kept_chunk_ids: set[str]
+    ) -> dict[str, Any]:
+        """Return the stored kept chunks whose order index or file path changed
+
+        The stored records keep their llm_cache_list, which the rebuild on later
+        deletions or updates reads the cached extraction results from.
+        """
+        if not kept_chunk_ids:
+            return {}
+        stored_list = await self.text_chunks.get_by_ids(list(kept_chunk_ids))
+        repositioned = {}
+        # get_by_ids is not aligned with the requested ids on every backend
+        for stored in stored_list:
+            if not stored:
+                continue
+            chunk_id = stored.get("_id") or stored.get("id")
+            chunk = chunks.get(chunk_id)
+            if chunk is None or (
+                stored.get("chunk_order_index") == chunk["chunk_order_index"]
+                and stored.get("file_path") == chunk["file_path"]
+            ):
+                continue
+            record = {
+                key: value
+                for key, value in stored.items()
+                if key not in ("_id", "id", "create_time", "update_time")
+            }
+            record["chunk_order_index"] = chunk["chunk_order_index"]
+            record["file_path"] = chunk["file_path"]
+            repositioned[chunk_id] = record
+        return repositioned
+
+    async def _retract_document_updates(
+        self,
+        update_docs: dict[str, DocProcessingStatus],
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> dict[str, dict[str, Any]]:
+        """Diff updated documents against their processed version and retract removed chunks
+
+        The new version of each document is chunked and its chunk hashes compared with
+        the chunks_list of the processed version. The chunks that disappeared are deleted
+        together, and the entities and relationships they contributed are deleted or
+        rebuilt from their remaining chunks. This runs before any document of the batch
+        is merged, so the rebuild does not race with the merging stage.
+
+        Chunk hashes only survive an edit when chunk boundaries do: with the default
+        token-window chunking an edit that changes the length of the text shifts every
+        following window, so most chunks after the edit are extracted again. Splitting
+        by a paragraph separator (split_by_character) keeps the diff local to the edit.
+
+        Returns:
+            dict: Per document ID, the new "chunks", the "previous_chunk_ids" that are
+                kept without extraction, and the "base_index" of entity names and relation
+                pairs the document keeps from its processed version
+        """
+        doc_ids = list(update_docs)
+        content_list, entities_list, relations_list = await asyncio.gather(
+            asyncio.gather(*[self.full_docs.get_by_id(doc_id) for doc_id in doc_ids]),
+            asyncio.gather(
+                *[self.full_entities.get_by_id(doc_id) for doc_id in doc_ids]
+            ),
+            asyncio.gather(
+                *[self.full_relations.get_by_id(doc_id) for doc_id in doc_ids]
+            ),
+        )
+
+        updates: dict[str, dict[str, Any]] = {}
+        removed_chunk_ids: set[str] = set()
+        for doc_id, content_data, doc_entities, doc_relations in zip(
+            doc_ids, content_list, entities_list, relations_list
+        ):
+            if not content_data:
+                raise Exception(
+                    f"Document content not found in full_docs for doc_id: {doc_id}"
+                )
+            chunks = self._chunk_document_content(
+                doc_id,
+                content_data["content"],
+                update_docs[doc_id].file_path,
+                split_by_character,
+                split_by_character_only,
+            )
+            previous_chunk_ids = set(update_docs[doc_id].chunks_list or [])
+            removed_chunk_ids.update(previous_chunk_ids - chunks.keys())
+            updates[doc_id] = {
+                "chunks": chunks,
+                "previous_chunk_ids": previous_chunk_ids & chunks.keys(),
+                "base_index": {
+                    "entity_names": (doc_entities or {}).get("entity_names", []),
+                    "relation_pairs": (doc_relations or {}).get("relation_pairs", []),
+                },
+            }
+
+            async with pipeline_status_lock:
+                log_message = f"Updating {doc_id}: {len(chunks.keys() - previous_chunk_ids)} new, {len(previous_chunk_ids - chunks.keys())} removed, {len(updates[doc_id]['previous_chunk_ids'])} unchanged chunks"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        if not removed_chunk_ids:
+            return updates
+
+        entity_names = list(
+            dict.fromkeys(
+                entity_name
+                for update in updates.values()
+                for entity_name in update["base_index"]["entity_names"]
+            )
+        )
+        relation_pairs = list(
+            dict.fromkeys(
+                (pair[0], pair[1])
+                for update in updates.values()
+                for pair in update["base_index"]["relation_pairs"]
+            )
+        )
+        (
+            entities_to_delete,
+            entities_to_rebuild,
+            relationships_to_delete,
+            relationships_to_rebuild,
+        ) = await self._retract_chunks(
+            removed_chunk_ids,
+            entity_names,
+            relation_pairs,
+            pipeline_status,
+            pipeline_status_lock,
+        )
+
+        # A document keeps the entities and relations still sourced by its unchanged chunks
+        for update in updates.values():
+            kept_chunk_ids = update["previous_chunk_ids"]
+            base_index = update["base_index"]
+            base_index["entity_names"] = [
+                entity_name
+                for entity_name in base_index["entity_names"]
+                if entity_name not in entities_to_delete
+                and (
+                    entity_name not in entities_to_rebuild
+                    or entities_to_rebuild[entity_name] & kept_chunk_ids
+                )
+            ]
+            base_index["relation_pairs"] = [
+                pair
+                for pair in base_index["relation_pairs"]
+                if tuple(sorted(pair)) not in relationships_to_delete
+                and (
+                    tuple(sorted(pair)) not in relationships_to_rebuild
+                    or relationships_to_rebuild[tuple(sorted(pair))] & kept_chunk_ids
+                )
+            ]
+
+        return updates
+
     async def apipeline_process_enqueue_documents(
         self,
         split_by_character: str | None = None,
@@ -1398,6 +1920,10 @@ class LightRAG:
                         "cur_batch": 0,  # Number of files already processed
                         "request_pending": False,  # Clear any previous request
                         "latest_message": "",
+                        "llm_concurrency": self.llm_concurrency_limiter.limit
+                        if self.llm_concurrency_limiter is not None
+                        else self.llm_model_max_async,
+                        "stage_occupancy": None,
                     }
                 )
                 # Cleaning history_messages without breaking it as a shared list object
@@ -1410,6 +1936,13 @@ class LightRAG:
                 )
                 return
 
+        if self.llm_concurrency_limiter is not None:
+            # Report adaptive LLM concurrency changes while the pipeline runs
+            def report_llm_concurrency(limit: int) -> None:
+                pipeline_status["llm_concurrency"] = limit
+
+            self.llm_concurrency_limiter.on_change = report_llm_concurrency
+
         try:
             # Process documents until no more documents or requests
             while True:
@@ -1425,6 +1958,56 @@ class LightRAG:
                     to_process_docs, pipeline_status, pipeline_status_lock
                 )
 
+                # Retract the removed chunks of updated documents before any merge
+                update_docs = {
+                    doc_id: status_doc
+                    for doc_id, status_doc in to_process_docs.items()
+                    if (status_doc.metadata or {}).get("update")
+                }
+                document_updates: dict[str, dict[str, Any]] = {}
+                if update_docs:
+                    try:
+                        document_updates = await self._retract_document_updates(
+                            update_docs,
+                            split_by_character,
+                            split_by_character_only,
+                            pipeline_status,
+                            pipeline_status_lock,
+                        )
+                    except Exception as e:
+                        error_msg = (
+                            f"Failed to update {len(update_docs)} document(s): {e}"
+                        )
+                        logger.error(traceback.format_exc())
+                        logger.error(error_msg)
+                        async with pipeline_status_lock:
+                            pipeline_status["latest_message"] = error_msg
+                            pipeline_status["history_messages"].append(error_msg)
+
+                        # Keep the update marker so a retry diffs against the processed version
+                        await self.doc_status.upsert(
+                            {
+                                doc_id: {
+                                    "status": DocStatus.FAILED,
+                                    "error_msg": str(e),
+                                    "chunks_count": status_doc.chunks_count,
+                                    "chunks_list": status_doc.chunks_list,
+                                    "content_summary": status_doc.content_summary,
+                                    "content_length": status_doc.content_length,
+                                    "created_at": status_doc.created_at,
+                                    "updated_at": datetime.now(
+                                        timezone.utc
+                                    ).isoformat(),
+                                    "file_path": status_doc.file_path,
+                                    "track_id": status_doc.track_id,
+                                    "metadata": {"update": True},
+                                }
+                                for doc_id, status_doc in update_docs.items()
+                            }
+                        )
+                        for doc_id in update_docs:
+                            to_process_docs.pop(doc_id, None)
+
                 if not to_process_docs:
                     log_message = (
                         "No valid documents to process after consistency check"
@@ -1462,307 +2045,390 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
-
-                async def process_document(
-                    doc_id: str,
-                    status_doc: DocProcessingStatus,
-                    split_by_character: str | None,
-                    split_by_character_only: bool,
-                    pipeline_status: dict,
-                    pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
-                ) -> None:
-                    """Process single document"""
-                    file_extraction_stage_ok = False
-                    async with semaphore:
-                        nonlocal processed_count
-                        current_file_number = 0
-                        # Initialize to prevent UnboundLocalError in error handling
-                        first_stage_tasks = []
-                        entity_relation_task = None
-                        try:
-                            # Get file path from status document
-                            file_path = getattr(
-                                status_doc, "file_path", "unknown_source"
-                            )
 
-                            async with pipeline_status_lock:
-                                # Update processed file count and save current file number
-                                processed_count += 1
-                                current_file_number = (
-                                    processed_count  # Save the current file number
-                                )
-                                pipeline_status["cur_batch"] = processed_count
+                # Documents flow through three stages connected by bounded queues:
+                # chunking (chunk, embed and store chunks), extraction (LLM entity and
+                # relation extraction) and merging (graph merge and summarization).
+                # Each stage has its own workers, so the LLM extracts the next
+                # document while the previous one is merged into the graph, and a
+                # full queue holds back the stage feeding it.
+                stage_workers = {
+                    "chunking": self.max_parallel_chunking or self.max_parallel_insert,
+                    "extraction": self.max_parallel_extract or self.max_parallel_insert,
+                    "merging": self.max_parallel_merge or self.max_parallel_insert,
+                }
+                queue_size = max(1, self.pipeline_queue_size)
+                chunking_queue: asyncio.Queue = asyncio.Queue()
+                extraction_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+                merging_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+                stage_queues = {
+                    "chunking": chunking_queue,
+                    "extraction": extraction_queue,
+                    "merging": merging_queue,
+                }
+                stage_active = {stage: 0 for stage in stage_workers}
+
+                def report_stage_occupancy() -> None:
+                    # Assign a new dict so the update also reaches shared (Manager) dicts
+                    pipeline_status["stage_occupancy"] = {
+                        stage: {
+                            "active": stage_active[stage],
+                            "queued": stage_queues[stage].qsize(),
+                            "workers": workers,
+                        }
+                        for stage, workers in stage_workers.items()
+                    }
 
-                                log_message = f"Extracting stage {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["history_messages"].append(log_message)
-                                log_message = f"Processing d-id: {doc_id}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
+                async def mark_document_failed(
+                    job: dict[str, Any], error: Exception, error_msg: str
+                ) -> None:
+                    """Log a stage failure and set the document status to failed"""
+                    logger.error(traceback.format_exc())
+                    logger.error(error_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = error_msg
+                        pipeline_status["history_messages"].append(
+                            traceback.format_exc()
+                        )
+                        pipeline_status["history_messages"].append(error_msg)
+
+                    # Persistent llm cache
+                    if self.llm_response_cache:
+                        await self.llm_response_cache.index_done_callback()
+
+                    status_doc = job["status_doc"]
+                    await self.doc_status.upsert(
+                        {
+                            job["doc_id"]: {
+                                "status": DocStatus.FAILED,
+                                "error_msg": str(error),
+                                "content_summary": status_doc.content_summary,
+                                "content_length": status_doc.content_length,
+                                "created_at": status_doc.created_at,
+                                "updated_at": datetime.now(timezone.utc).isoformat(),
+                                "file_path": job["file_path"],
+                                "track_id": status_doc.track_id,  # Preserve existing track_id
+                                "metadata": {
+                                    "processing_start_time": job[
+                                        "processing_start_time"
+                                    ],
+                                    "processing_end_time": int(time.time()),
+                                },
+                            }
+                        }
+                    )
 
-                                # Prevent memory growth: keep only latest 5000 messages when exceeding 10000
-                                if len(pipeline_status["history_messages"]) > 10000:
-                                    logger.info(
-                                        f"Trimming pipeline history from {len(pipeline_status['history_messages'])} to 5000 messages"
-                                    )
-                                    pipeline_status["history_messages"] = (
-                                        pipeline_status["history_messages"][-5000:]
-                                    )
+                async def chunk_document(job: dict[str, Any]) -> dict[str, Any] | None:
+                    """Stage 1: split the document and store its chunks"""
+                    nonlocal processed_count
+                    doc_id, status_doc = job["doc_id"], job["status_doc"]
+                    job["file_path"] = getattr(
+                        status_doc, "file_path", "unknown_source"
+                    )
+                    job["processing_start_time"] = int(time.time())
+                    try:
+                        async with pipeline_status_lock:
+                            # Update processed file count and save current file number
+                            processed_count += 1
+                            job["current_file_number"] = processed_count
+                            pipeline_status["cur_batch"] = processed_count
 
+                            log_message = f"Extracting stage {processed_count}/{total_files}: {job['file_path']}"
+                            logger.info(log_message)
+                            pipeline_status["history_messages"].append(log_message)
+                            log_message = f"Processing d-id: {doc_id}"
+                            logger.info(log_message)
+                            pipeline_status["latest_message"] = log_message
+                            pipeline_status["history_messages"].append(log_message)
+
+                            # Prevent memory growth: keep only latest 5000 messages when exceeding 10000
+                            if len(pipeline_status["history_messages"]) > 10000:
+                                logger.info(
+                                    f"Trimming pipeline history from {len(pipeline_status['history_messages'])} to 5000 messages"
+                                )
+                                pipeline_status["history_messages"] = pipeline_status[
+                                    "history_messages"
+                                ][-5000:]
+
+                        document_update = document_updates.get(doc_id)
+                        if document_update is not None:
+                            # Updated document: unchanged chunks are already stored and extracted
+                            chunks = document_update["chunks"]
+                            new_chunks = {
+                                chunk_id: chunk
+                                for chunk_id, chunk in chunks.items()
+                                if chunk_id not in document_update["previous_chunk_ids"]
+                            }
+                            # Unchanged chunks may have moved within the new version
+                            stored_chunks = {
+                                **await self._reposition_kept_chunks(
+                                    chunks, document_update["previous_chunk_ids"]
+                                ),
+                                **new_chunks,
+                            }
+                        else:
                             # Get document content from full_docs
                             content_data = await self.full_docs.get_by_id(doc_id)
                             if not content_data:
                                 raise Exception(
                                     f"Document content not found in full_docs for doc_id: {doc_id}"
                                 )
-                            content = content_data["content"]
 
                             # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                }
-                                for dp in self.chunking_func(
-                                    self.tokenizer,
-                                    content,
-                                    split_by_character,
-                                    split_by_character_only,
-                                    self.chunk_overlap_token_size,
-                                    self.chunk_token_size,
-                                )
-                            }
-
-                            if not chunks:
-                                logger.warning("No document chunks to process")
-
-                            # Record processing start time
-                            processing_start_time = int(time.time())
-
-                            # Process document in two stages
-                            # Stage 1: Process text chunks and docs (parallel execution)
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time
-                                            },
-                                        }
-                                    }
-                                )
-                            )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
-
-                            # First stage tasks (parallel execution)
-                            first_stage_tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                text_chunks_task,
-                            ]
-                            entity_relation_task = None
-
-                            # Execute first stage tasks
-                            await asyncio.gather(*first_stage_tasks)
-
-                            # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
-                                )
+                            chunks = self._chunk_document_content(
+                                doc_id,
+                                content_data["content"],
+                                job["file_path"],
+                                split_by_character,
+                                split_by_character_only,
                             )
-                            await entity_relation_task
-                            file_extraction_stage_ok = True
+                            new_chunks = chunks
+                            stored_chunks = chunks
 
-                        except Exception as e:
-                            # Log error and update pipeline status
-                            logger.error(traceback.format_exc())
-                            error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
-                            logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
-                                )
-                                pipeline_status["history_messages"].append(error_msg)
+                        if not chunks:
+                            logger.warning("No document chunks to process")
+                        job["chunks"] = chunks
+                        job["new_chunks"] = new_chunks
 
-                            # Cancel tasks that are not yet completed
-                            all_tasks = first_stage_tasks + (
-                                [entity_relation_task] if entity_relation_task else []
-                            )
-                            for task in all_tasks:
-                                if task and not task.done():
-                                    task.cancel()
-
-                            # Persistent llm cache
-                            if self.llm_response_cache:
-                                await self.llm_response_cache.index_done_callback()
-
-                            # Record processing end time for failed case
-                            processing_end_time = int(time.time())
-
-                            # Update document status to failed
-                            await self.doc_status.upsert(
+                        # Store text chunks, chunk vectors and doc status in parallel
+                        await asyncio.gather(
+                            self.doc_status.upsert(
                                 {
                                     doc_id: {
-                                        "status": DocStatus.FAILED,
-                                        "error_msg": str(e),
+                                        "status": DocStatus.PROCESSING,
+                                        "chunks_count": len(chunks),
+                                        "chunks_list": list(
+                                            chunks.keys()
+                                        ),  # Save chunks list
                                         "content_summary": status_doc.content_summary,
                                         "content_length": status_doc.content_length,
                                         "created_at": status_doc.created_at,
                                         "updated_at": datetime.now(
                                             timezone.utc
                                         ).isoformat(),
-                                        "file_path": file_path,
+                                        "file_path": job["file_path"],
                                         "track_id": status_doc.track_id,  # Preserve existing track_id
                                         "metadata": {
-                                            "processing_start_time": processing_start_time,
-                                            "processing_end_time": processing_end_time,
+                                            "processing_start_time": job[
+                                                "processing_start_time"
+                                            ]
                                         },
                                     }
                                 }
-                            )
+                            ),
+                            self.chunks_vdb.upsert(new_chunks),
+                            self.text_chunks.upsert(stored_chunks),
+                        )
+                        return job
+                    except Exception as e:
+                        await mark_document_failed(
+                            job,
+                            e,
+                            f"Failed to extract document {job.get('current_file_number', 0)}/{total_files}: {job['file_path']}",
+                        )
+                        return None
 
+                async def extract_document(
+                    job: dict[str, Any],
+                ) -> dict[str, Any] | None:
+                    """Stage 2: extract entities and relations from the new chunks"""
+                    try:
+                        job["chunk_results"] = (
+                            await self._process_extract_entities(
+                                job["new_chunks"], pipeline_status, pipeline_status_lock
+                            )
+                            if job["new_chunks"]
+                            else []
+                        )
+                        return job
+                    except Exception as e:
+                        await mark_document_failed(
+                            job,
+                            e,
+                            f"Failed to extract document {job['current_file_number']}/{total_files}: {job['file_path']}",
+                        )
+                        return None
+
+                async def merge_documents(jobs: list[dict[str, Any]]) -> None:
+                    """Stage 3: merge the extraction results into the graph
+
+                    With merge_batch_size > 1 jobs holds several documents, whose
+                    shared entities and relations are merged and summarized once.
+                    """
+                    if len(jobs) == 1:
+                        current_file_number = jobs[0]["current_file_number"]
+                        file_path = jobs[0]["file_path"]
+                    else:
+                        current_file_number = max(
+                            job["current_file_number"] for job in jobs
+                        )
+                        file_path = f"batch of {len(jobs)} documents"
+                    try:
                         # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
-                            try:
-                                # Get chunk_results from entity_relation_task
-                                chunk_results = await entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
+                        await merge_nodes_and_edges(
+                            chunk_results=[],
+                            knowledge_graph_inst=self.chunk_entity_relation_graph,
+                            entity_vdb=self.entities_vdb,
+                            relationships_vdb=self.relationships_vdb,
+                            global_config=asdict(self),
+                            full_entities_storage=self.full_entities,
+                            full_relations_storage=self.full_relations,
+                            pipeline_status=pipeline_status,
+                            pipeline_status_lock=pipeline_status_lock,
+                            llm_response_cache=self.llm_response_cache,
+                            current_file_number=current_file_number,
+                            total_files=total_files,
+                            file_path=file_path,
+                            doc_chunk_results={
+                                job["doc_id"]: job["chunk_results"] for job in jobs
+                            },
+                            doc_base_index={
+                                job["doc_id"]: document_updates[job["doc_id"]][
+                                    "base_index"
+                                ]
+                                for job in jobs
+                                if job["doc_id"] in document_updates
+                            },
+                        )
 
-                                # Record processing end time
-                                processing_end_time = int(time.time())
-
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
+                        # Record processing end time
+                        processing_end_time = int(time.time())
+
+                        await self.doc_status.upsert(
+                            {
+                                job["doc_id"]: {
+                                    "status": DocStatus.PROCESSED,
+                                    "chunks_count": len(job["chunks"]),
+                                    "chunks_list": list(job["chunks"].keys()),
+                                    "content_summary": job[
+                                        "status_doc"
+                                    ].content_summary,
+                                    "content_length": job["status_doc"].content_length,
+                                    "created_at": job["status_doc"].created_at,
+                                    "updated_at": datetime.now(
+                                        timezone.utc
+                                    ).isoformat(),
+                                    "file_path": job["file_path"],
+                                    "track_id": job[
+                                        "status_doc"
+                                    ].track_id,  # Preserve existing track_id
+                                    "metadata": {
+                                        "processing_start_time": job[
+                                            "processing_start_time"
+                                        ],
+                                        "processing_end_time": processing_end_time,
+                                    },
+                                }
+                                for job in jobs
+                            }
+                        )
 
-                                # Call _insert_done after processing each file
-                                await self._insert_done()
-
-                                async with pipeline_status_lock:
-                                    log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                    logger.info(log_message)
-                                    pipeline_status["latest_message"] = log_message
-                                    pipeline_status["history_messages"].append(
-                                        log_message
-                                    )
-
-                            except Exception as e:
-                                # Log error and update pipeline status
-                                logger.error(traceback.format_exc())
-                                error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                                logger.error(error_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = error_msg
-                                    pipeline_status["history_messages"].append(
-                                        traceback.format_exc()
-                                    )
-                                    pipeline_status["history_messages"].append(
-                                        error_msg
-                                    )
-
-                                # Persistent llm cache
-                                if self.llm_response_cache:
-                                    await self.llm_response_cache.index_done_callback()
-
-                                # Record processing end time for failed case
-                                processing_end_time = int(time.time())
-
-                                # Update document status to failed
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.FAILED,
-                                            "error_msg": str(e),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now().isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
+                        # Call _insert_done after processing each file (or batch)
+                        await self._insert_done()
+
+                        async with pipeline_status_lock:
+                            for job in jobs:
+                                log_message = f"Completed processing file {job['current_file_number']}/{total_files}: {job['file_path']}"
+                                logger.info(log_message)
+                                pipeline_status["latest_message"] = log_message
+                                pipeline_status["history_messages"].append(log_message)
+
+                    except Exception as e:
+                        for job in jobs:
+                            await mark_document_failed(
+                                job,
+                                e,
+                                f"Merging stage failed in document {job['current_file_number']}/{total_files}: {job['file_path']}",
+                            )
+
+                async def run_stage(
+                    stage: str,
+                    handler: Callable[[Any], Awaitable[Any]],
+                    inbox: asyncio.Queue,
+                    outbox: asyncio.Queue | None,
+                    batch_size: int = 0,
+                ) -> None:
+                    """Take documents from inbox until the None sentinel arrives
+
+                    With batch_size 0 the handler gets one document at a time,
+                    otherwise a list of up to batch_size documents; a short batch
+                    is only handled once the inbox has been closed.
+                    """
+                    closed = False
+                    while not closed:
+                        job = await inbox.get()
+                        if job is None:
+                            return
+                        jobs = [job]
+                        while len(jobs) < batch_size:
+                            next_job = await inbox.get()
+                            if next_job is None:
+                                closed = True
+                                break
+                            jobs.append(next_job)
+                        stage_active[stage] += len(jobs)
+                        report_stage_occupancy()
+                        try:
+                            result = await handler(jobs if batch_size else job)
+                        except Exception as e:
+                            # Handlers mark their own failures, this only guards the worker
+                            logger.error(
+                                f"Pipeline {stage} worker error for {', '.join(job['doc_id'] for job in jobs)}: {e}"
+                            )
+                            result = None
+                        finally:
+                            stage_active[stage] -= len(jobs)
+                            report_stage_occupancy()
+                        if result is not None and outbox is not None:
+                            # Blocks while the next stage is full (backpressure)
+                            await outbox.put(result)
+                            report_stage_occupancy()
 
-                # Create processing tasks for all documents
-                doc_tasks = []
                 for doc_id, status_doc in to_process_docs.items():
-                    doc_tasks.append(
-                        process_document(
-                            doc_id,
-                            status_doc,
-                            split_by_character,
-                            split_by_character_only,
-                            pipeline_status,
-                            pipeline_status_lock,
-                            semaphore,
-                        )
+                    chunking_queue.put_nowait(
+                        {"doc_id": doc_id, "status_doc": status_doc}
                     )
 
-                # Wait for all document processing to complete
-                await asyncio.gather(*doc_tasks)
+                stages = [
+                    ("chunking", chunk_document, chunking_queue, extraction_queue, 0),
+                    (
+                        "extraction",
+                        extract_document,
+                        extraction_queue,
+                        merging_queue,
+                        0,
+                    ),
+                    (
+                        "merging",
+                        merge_documents,
+                        merging_queue,
+                        None,
+                        max(1, self.merge_batch_size),
+                    ),
+                ]
+                stage_tasks = {
+                    stage: [
+                        asyncio.create_task(
+                            run_stage(stage, handler, inbox, outbox, batch_size)
+                        )
+                        for _ in range(stage_workers[stage])
+                    ]
+                    for stage, handler, inbox, outbox, batch_size in stages
+                }
+                report_stage_occupancy()
+
+                try:
+                    # Stop each stage once the stage feeding it has drained
+                    for stage, _, inbox, _, _ in stages:
+                        for _ in stage_tasks[stage]:
+                            await inbox.put(None)
+                        await asyncio.gather(*stage_tasks[stage])
+                finally:
+                    for tasks in stage_tasks.values():
+                        for task in tasks:
+                            if not task.done():
+                                task.cancel()
+                    pipeline_status["stage_occupancy"] = None
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -1793,6 +2459,8 @@ class LightRAG:
                 to_process_docs.update(pending_docs)
 
         finally:
+            if self.llm_concurrency_limiter is not None:
+                self.llm_concurrency_limiter.on_change = None
             log_message = "Enqueued document processing pipeline stoped"
             logger.info(log_message)
             # Always reset busy status when done or if an exception occurs (with lock)
@@ -1822,6 +2490,13 @@ class LightRAG:
                 pipeline_status["history_messages"].append(error_msg)
             raise e
 
+    def _clear_query_caches(self) -> None:
+        """Drop in-memory query caches that may refer to changed data"""
+        if self.retrieval_cache is not None:
+            self.retrieval_cache.clear()
+        if self.semantic_query_cache is not None:
+            self.semantic_query_cache.clear()
+
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
@@ -1834,6 +2509,7 @@ class LightRAG:
                 self.full_entities,
                 self.full_relations,
                 self.llm_response_cache,
+                self.embedding_cache_storage,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
@@ -1843,6 +2519,8 @@ class LightRAG:
         ]
         await asyncio.gather(*tasks)
 
+        self._clear_query_caches()
+
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -2086,6 +2764,8 @@ class LightRAG:
                 hashing_kv=self.llm_response_cache,
                 system_prompt=system_prompt,
                 chunks_vdb=self.chunks_vdb,
+                semantic_cache=self.semantic_query_cache,
+                retrieval_cache=self.retrieval_cache,
             )
         elif param.mode == "naive":
             response = await naive_query(
@@ -2149,6 +2829,7 @@ class LightRAG:
                 system_prompt=None,
                 chunks_vdb=self.chunks_vdb,
                 return_raw_data=True,  # Get final processed data
+                retrieval_cache=self.retrieval_cache,
             )
         elif param.mode == "naive":
             logger.debug(f"[aquery_data] Using naive_query for mode: {param.mode}")
@@ -2189,6 +2870,8 @@ class LightRAG:
 
     async def _query_done(self):
         await self.llm_response_cache.index_done_callback()
+        if self.embedding_cache_storage is not None:
+            await self.embedding_cache_storage.index_done_callback()
 
     async def aclear_cache(self) -> None:
         """Clear all cache data from the LLM response cache storage.
@@ -2212,6 +2895,8 @@ class LightRAG:
                 logger.warning("Failed to clear all cache")
 
             await self.llm_response_cache.index_done_callback()
+            if self.semantic_query_cache is not None:
+                self.semantic_query_cache.clear()
 
         except Exception as e:
             logger.error(f"Error while clearing cache: {e}")
@@ -2312,334 +2997,223 @@ class LightRAG:
                 - `status_code` (int): HTTP status code (e.g., 200, 404, 500).
                 - `file_path` (str | None): The file path of the deleted document, if available.
         """
+        return (await self.adelete_by_doc_ids([doc_id]))[0]
+
+    async def adelete_by_doc_ids(self, doc_ids: list[str]) -> list[DeletionResult]:
+        """Delete several documents and all their related data in a single pass.
+
+        The chunks, entities and relations of all documents are collected together, so
+        graph state is read once, every affected entity or relation is deleted or rebuilt
+        once from the chunks that remain after the whole batch is removed, and storages
+        are persisted once for the batch instead of once per document.
+
+        Args:
+            doc_ids (list[str]): The IDs of the documents to delete. Duplicates are ignored.
+
+        Returns:
+            list[DeletionResult]: One result per unique document ID, in input order. Documents
+                that do not exist get a "not_found" result. If the shared deletion fails, every
+                existing document of the batch gets a "fail" result.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return []
+
         deletion_operations_started = False
         original_exception = None
+        results: dict[str, DeletionResult] = {}
+        file_paths: dict[str, str | None] = {}
+        batch_label = doc_ids[0] if len(doc_ids) == 1 else f"{len(doc_ids)} documents"
 
         # Get pipeline status shared data and lock for status updates
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
 
         async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
+            log_message = f"Starting deletion process for document {batch_label}"
             logger.info(log_message)
             pipeline_status["latest_message"] = log_message
             pipeline_status["history_messages"].append(log_message)
 
         try:
             # 1. Get the document status and related data
-            doc_status_data = await self.doc_status.get_by_id(doc_id)
-            file_path = doc_status_data.get("file_path") if doc_status_data else None
-            if not doc_status_data:
-                logger.warning(f"Document {doc_id} not found")
-                return DeletionResult(
-                    status="not_found",
-                    doc_id=doc_id,
-                    message=f"Document {doc_id} not found.",
-                    status_code=404,
-                    file_path="",
-                )
-
-            # Check document status and log warning for non-completed documents
-            doc_status = doc_status_data.get("status")
-            if doc_status != DocStatus.PROCESSED:
-                if doc_status == DocStatus.PENDING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PENDING)"
-                    )
-                elif doc_status == DocStatus.PROCESSING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
-                    )
-                elif doc_status == DocStatus.FAILED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: FAILED)"
+            # get_by_ids skips missing documents on some backends, so look up each id
+            doc_status_list = await asyncio.gather(
+                *[self.doc_status.get_by_id(doc_id) for doc_id in doc_ids]
+            )
+            found_docs: dict[str, dict] = {}
+            for doc_id, doc_status_data in zip(doc_ids, doc_status_list):
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
                     )
-                else:
-                    warning_msg = f"Deleting {doc_id} {file_path}(previous status: {doc_status.value})"
-                logger.info(warning_msg)
-                # Update pipeline status for monitoring
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = warning_msg
-                    pipeline_status["history_messages"].append(warning_msg)
+                    continue
+                found_docs[doc_id] = doc_status_data
+                file_path = doc_status_data.get("file_path")
+                file_paths[doc_id] = file_path
+
+                # Check document status and log warning for non-completed documents
+                doc_status = doc_status_data.get("status")
+                if doc_status != DocStatus.PROCESSED:
+                    if doc_status == DocStatus.PENDING:
+                        warning_msg = (
+                            f"Deleting {doc_id} {file_path}(previous status: PENDING)"
+                        )
+                    elif doc_status == DocStatus.PROCESSING:
+                        warning_msg = f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
+                    elif doc_status == DocStatus.FAILED:
+                        warning_msg = (
+                            f"Deleting {doc_id} {file_path}(previous status: FAILED)"
+                        )
+                    else:
+                        warning_msg = f"Deleting {doc_id} {file_path}(previous status: {doc_status.value})"
+                    logger.info(warning_msg)
+                    # Update pipeline status for monitoring
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = warning_msg
+                        pipeline_status["history_messages"].append(warning_msg)
+
+            if not found_docs:
+                return [results[doc_id] for doc_id in doc_ids]
 
             # 2. Get chunk IDs from document status
-            chunk_ids = set(doc_status_data.get("chunks_list", []))
+            chunk_ids = set()
+            empty_doc_ids = []
+            for doc_id, doc_status_data in found_docs.items():
+                doc_chunk_ids = doc_status_data.get("chunks_list", [])
+                if doc_chunk_ids:
+                    chunk_ids.update(doc_chunk_ids)
+                else:
+                    empty_doc_ids.append(doc_id)
+
+            # Mark that deletion operations have started
+            deletion_operations_started = True
 
-            if not chunk_ids:
-                logger.warning(f"No chunks found for document {doc_id}")
-                # Mark that deletion operations have started
-                deletion_operations_started = True
+            if empty_doc_ids:
+                for doc_id in empty_doc_ids:
+                    logger.warning(f"No chunks found for document {doc_id}")
                 try:
                     # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
-                    await self.doc_status.delete([doc_id])
+                    await self.full_docs.delete(empty_doc_ids)
+                    await self.doc_status.delete(empty_doc_ids)
                 except Exception as e:
                     logger.error(
-                        f"Failed to delete document {doc_id} with no chunks: {e}"
+                        f"Failed to delete {len(empty_doc_ids)} documents with no chunks: {e}"
                     )
                     raise Exception(f"Failed to delete document entry: {e}") from e
 
-                async with pipeline_status_lock:
-                    log_message = (
-                        f"Document deleted without associated chunks: {doc_id}"
-                    )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
-
-                return DeletionResult(
-                    status="success",
-                    doc_id=doc_id,
-                    message=log_message,
-                    status_code=200,
-                    file_path=file_path,
-                )
+                for doc_id in empty_doc_ids:
+                    async with pipeline_status_lock:
+                        log_message = (
+                            f"Document deleted without associated chunks: {doc_id}"
+                        )
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
 
-            # Mark that deletion operations have started
-            deletion_operations_started = True
+                    results[doc_id] = DeletionResult(
+                        status="success",
+                        doc_id=doc_id,
+                        message=log_message,
+                        status_code=200,
+                        file_path=file_paths[doc_id],
+                    )
+                    del found_docs[doc_id]
 
-            # 4. Analyze entities and relationships that will be affected
-            entities_to_delete = set()
-            entities_to_rebuild = {}  # entity_name -> remaining_chunk_ids
-            relationships_to_delete = set()
-            relationships_to_rebuild = {}  # (src, tgt) -> remaining_chunk_ids
+            if not found_docs:
+                return [results[doc_id] for doc_id in doc_ids]
+            chunked_doc_ids = list(found_docs)
 
+            # 4. Collect the entities and relationships the documents contributed
             try:
                 # Get affected entities and relations from full_entities and full_relations storage
-                doc_entities_data = await self.full_entities.get_by_id(doc_id)
-                doc_relations_data = await self.full_relations.get_by_id(doc_id)
-
-                affected_nodes = []
-                affected_edges = []
-
-                # Get entity data from graph storage using entity names from full_entities
-                if doc_entities_data and "entity_names" in doc_entities_data:
-                    entity_names = doc_entities_data["entity_names"]
-                    # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
-                    nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
-                        entity_names
+                doc_entities_list = await self.full_entities.get_by_ids(chunked_doc_ids)
+                doc_relations_list = await self.full_relations.get_by_ids(
+                    chunked_doc_ids
+                )
+
+                # Union of the entity names and relation pairs of all documents
+                entity_names = list(
+                    dict.fromkeys(
+                        entity_name
+                        for doc_entities_data in doc_entities_list
+                        if doc_entities_data
+                        for entity_name in doc_entities_data.get("entity_names", [])
                     )
-                    for entity_name in entity_names:
-                        node_data = nodes_dict.get(entity_name)
-                        if node_data:
-                            # Ensure compatibility with existing logic that expects "id" field
-                            if "id" not in node_data:
-                                node_data["id"] = entity_name
-                            affected_nodes.append(node_data)
-
-                # Get relation data from graph storage using relation pairs from full_relations
-                if doc_relations_data and "relation_pairs" in doc_relations_data:
-                    relation_pairs = doc_relations_data["relation_pairs"]
-                    edge_pairs_dicts = [
-                        {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
-                    ]
-                    # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
-                    edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
-                        edge_pairs_dicts
+                )
+                relation_pairs = list(
+                    dict.fromkeys(
+                        (pair[0], pair[1])
+                        for doc_relations_data in doc_relations_list
+                        if doc_relations_data
+                        for pair in doc_relations_data.get("relation_pairs", [])
                     )
-
-                    for pair in relation_pairs:
-                        src, tgt = pair[0], pair[1]
-                        edge_key = (src, tgt)
-                        edge_data = edges_dict.get(edge_key)
-                        if edge_data:
-                            # Ensure compatibility with existing logic that expects "source" and "target" fields
-                            if "source" not in edge_data:
-                                edge_data["source"] = src
-                            if "target" not in edge_data:
-                                edge_data["target"] = tgt
-                            affected_edges.append(edge_data)
-
+                )
             except Exception as e:
                 logger.error(f"Failed to analyze affected graph elements: {e}")
                 raise Exception(f"Failed to analyze graph dependencies: {e}") from e
 
-            try:
-                # Process entities
-                for node_data in affected_nodes:
-                    node_label = node_data.get("entity_id")
-                    if node_label and "source_id" in node_data:
-                        sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                        remaining_sources = sources - chunk_ids
-
-                        if not remaining_sources:
-                            entities_to_delete.add(node_label)
-                        elif remaining_sources != sources:
-                            entities_to_rebuild[node_label] = remaining_sources
-
-                async with pipeline_status_lock:
-                    log_message = f"Found {len(entities_to_rebuild)} affected entities"
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
-
-                # Process relationships
-                for edge_data in affected_edges:
-                    src = edge_data.get("source")
-                    tgt = edge_data.get("target")
-
-                    if src and tgt and "source_id" in edge_data:
-                        edge_tuple = tuple(sorted((src, tgt)))
-                        if (
-                            edge_tuple in relationships_to_delete
-                            or edge_tuple in relationships_to_rebuild
-                        ):
-                            continue
-
-                        sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                        remaining_sources = sources - chunk_ids
-
-                        if not remaining_sources:
-                            relationships_to_delete.add(edge_tuple)
-                        elif remaining_sources != sources:
-                            relationships_to_rebuild[edge_tuple] = remaining_sources
-
-                async with pipeline_status_lock:
-                    log_message = (
-                        f"Found {len(relationships_to_rebuild)} affected relations"
-                    )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
-
-            except Exception as e:
-                logger.error(f"Failed to process graph analysis results: {e}")
-                raise Exception(f"Failed to process graph dependencies: {e}") from e
-
-            # Use graph database lock to prevent dirty read
-            graph_db_lock = get_graph_db_lock(enable_logging=False)
-            async with graph_db_lock:
-                # 5. Delete chunks from storage
-                if chunk_ids:
-                    try:
-                        await self.chunks_vdb.delete(chunk_ids)
-                        await self.text_chunks.delete(chunk_ids)
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete chunks: {e}")
-                        raise Exception(f"Failed to delete document chunks: {e}") from e
-
-                # 6. Delete entities that have no remaining sources
-                if entities_to_delete:
-                    try:
-                        # Delete from vector database
-                        entity_vdb_ids = [
-                            compute_mdhash_id(entity, prefix="ent-")
-                            for entity in entities_to_delete
-                        ]
-                        await self.entities_vdb.delete(entity_vdb_ids)
-
-                        # Delete from graph
-                        await self.chunk_entity_relation_graph.remove_nodes(
-                            list(entities_to_delete)
-                        )
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(entities_to_delete)} entities"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete entities: {e}")
-                        raise Exception(f"Failed to delete entities: {e}") from e
-
-                # 7. Delete relationships that have no remaining sources
-                if relationships_to_delete:
-                    try:
-                        # Delete from vector database
-                        rel_ids_to_delete = []
-                        for src, tgt in relationships_to_delete:
-                            rel_ids_to_delete.extend(
-                                [
-                                    compute_mdhash_id(src + tgt, prefix="rel-"),
-                                    compute_mdhash_id(tgt + src, prefix="rel-"),
-                                ]
-                            )
-                        await self.relationships_vdb.delete(rel_ids_to_delete)
-
-                        # Delete from graph
-                        await self.chunk_entity_relation_graph.remove_edges(
-                            list(relationships_to_delete)
-                        )
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
-                    except Exception as e:
-                        logger.error(f"Failed to delete relationships: {e}")
-                        raise Exception(f"Failed to delete relationships: {e}") from e
-
-                # Persist changes to graph database before releasing graph database lock
-                await self._insert_done()
-
-            # 8. Rebuild entities and relationships from remaining chunks
-            if entities_to_rebuild or relationships_to_rebuild:
-                try:
-                    await _rebuild_knowledge_from_chunks(
-                        entities_to_rebuild=entities_to_rebuild,
-                        relationships_to_rebuild=relationships_to_rebuild,
-                        knowledge_graph_inst=self.chunk_entity_relation_graph,
-                        entities_vdb=self.entities_vdb,
-                        relationships_vdb=self.relationships_vdb,
-                        text_chunks_storage=self.text_chunks,
-                        llm_response_cache=self.llm_response_cache,
-                        global_config=asdict(self),
-                        pipeline_status=pipeline_status,
-                        pipeline_status_lock=pipeline_status_lock,
-                    )
-
-                except Exception as e:
-                    logger.error(f"Failed to rebuild knowledge from chunks: {e}")
-                    raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
+            # 5-8. Delete the chunks, then delete or rebuild what they contributed
+            await self._retract_chunks(
+                chunk_ids,
+                entity_names,
+                relation_pairs,
+                pipeline_status,
+                pipeline_status_lock,
+            )
 
             # 9. Delete from full_entities and full_relations storage
             try:
-                await self.full_entities.delete([doc_id])
-                await self.full_relations.delete([doc_id])
+                await self.full_entities.delete(chunked_doc_ids)
+                await self.full_relations.delete(chunked_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete from full_entities/full_relations: {e}")
                 raise Exception(
                     f"Failed to delete from full_entities/full_relations: {e}"
                 ) from e
 
-            # 10. Delete original document and status
+            # 10. Delete original documents and status
             try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
+                await self.full_docs.delete(chunked_doc_ids)
+                await self.doc_status.delete(chunked_doc_ids)
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
                 raise Exception(f"Failed to delete document and status: {e}") from e
 
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
+            for doc_id in chunked_doc_ids:
+                async with pipeline_status_lock:
+                    log_message = f"Successfully deleted document {doc_id}"
+                    logger.info(log_message)
+                    pipeline_status["latest_message"] = log_message
+                    pipeline_status["history_messages"].append(log_message)
+
+                results[doc_id] = DeletionResult(
+                    status="success",
+                    doc_id=doc_id,
+                    message=log_message,
+                    status_code=200,
+                    file_path=file_paths[doc_id],
+                )
 
         except Exception as e:
             original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
+            error_message = f"Error while deleting document {batch_label}: {e}"
             logger.error(error_message)
             logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+            for doc_id in doc_ids:
+                if doc_id not in results:
+                    results[doc_id] = DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message=error_message,
+                        status_code=500,
+                        file_path=file_paths.get(doc_id),
+                    )
 
         finally:
             # ALWAYS ensure persistence if any deletion operations were started
@@ -2647,26 +3221,259 @@ class LightRAG:
                 try:
                     await self._insert_done()
                 except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {batch_label}: {persistence_error}"
                     logger.error(persistence_error_msg)
                     logger.error(traceback.format_exc())
 
                     # If there was no original exception, this persistence error becomes the main error
                     if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
-                        )
+                        for doc_id in file_paths:
+                            results[doc_id] = DeletionResult(
+                                status="fail",
+                                doc_id=doc_id,
+                                message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                                status_code=500,
+                                file_path=file_paths[doc_id],
+                            )
+                        return [results[doc_id] for doc_id in doc_ids]
                     # If there was an original exception, log the persistence error but don't override the original error
-                    # The original error result was already returned in the except block
             else:
                 logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+                    f"No deletion operations were started for document {batch_label}, skipping persistence"
+                )
+
+        return [results[doc_id] for doc_id in doc_ids]
+
+    async def _retract_chunks(
+        self,
+        chunk_ids: set[str],
+        entity_names: list[str],
+        relation_pairs: list[tuple[str, str]],
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> tuple[set, dict, set, dict]:
+        """Delete chunks and retract the knowledge they contributed to the graph
+
+        Entities and relationships whose sources are all among chunk_ids are deleted,
+        the ones that keep other sources are rebuilt from their remaining chunks.
+
+        Args:
+            chunk_ids: IDs of the chunks to delete
+            entity_names: Entities the chunks may have contributed to
+            relation_pairs: (src, tgt) relationships the chunks may have contributed to
+            pipeline_status: Pipeline status dictionary
+            pipeline_status_lock: Lock for pipeline status
+
+        Returns:
+            tuple: (entities_to_delete, entities_to_rebuild, relationships_to_delete,
+                relationships_to_rebuild), the rebuild dicts map to the remaining chunk IDs
+        """
+        entities_to_delete = set()
+        entities_to_rebuild = {}  # entity_name -> remaining_chunk_ids
+        relationships_to_delete = set()
+        relationships_to_rebuild = {}  # (src, tgt) -> remaining_chunk_ids
+
+        try:
+            affected_nodes = []
+            affected_edges = []
+
+            # Get entity data from graph storage using entity names from full_entities
+            if entity_names:
+                # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
+                nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
+                    entity_names
+                )
+                for entity_name in entity_names:
+                    node_data = nodes_dict.get(entity_name)
+                    if node_data:
+                        # Ensure compatibility with existing logic that expects "id" field
+                        if "id" not in node_data:
+                            node_data["id"] = entity_name
+                        affected_nodes.append(node_data)
+
+            # Get relation data from graph storage using relation pairs from full_relations
+            if relation_pairs:
+                edge_pairs_dicts = [
+                    {"src": src, "tgt": tgt} for src, tgt in relation_pairs
+                ]
+                # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
+                edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
+                    edge_pairs_dicts
+                )
+
+                for src, tgt in relation_pairs:
+                    edge_data = edges_dict.get((src, tgt))
+                    if edge_data:
+                        # Ensure compatibility with existing logic that expects "source" and "target" fields
+                        if "source" not in edge_data:
+                            edge_data["source"] = src
+                        if "target" not in edge_data:
+                            edge_data["target"] = tgt
+                        affected_edges.append(edge_data)
+
+        except Exception as e:
+            logger.error(f"Failed to analyze affected graph elements: {e}")
+            raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+
+        try:
+            # Process entities
+            for node_data in affected_nodes:
+                node_label = node_data.get("entity_id")
+                if node_label and "source_id" in node_data:
+                    sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
+                    remaining_sources = sources - chunk_ids
+
+                    if not remaining_sources:
+                        entities_to_delete.add(node_label)
+                    elif remaining_sources != sources:
+                        entities_to_rebuild[node_label] = remaining_sources
+
+            async with pipeline_status_lock:
+                log_message = f"Found {len(entities_to_rebuild)} affected entities"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            # Process relationships
+            for edge_data in affected_edges:
+                src = edge_data.get("source")
+                tgt = edge_data.get("target")
+
+                if src and tgt and "source_id" in edge_data:
+                    edge_tuple = tuple(sorted((src, tgt)))
+                    if (
+                        edge_tuple in relationships_to_delete
+                        or edge_tuple in relationships_to_rebuild
+                    ):
+                        continue
+
+                    sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
+                    remaining_sources = sources - chunk_ids
+
+                    if not remaining_sources:
+                        relationships_to_delete.add(edge_tuple)
+                    elif remaining_sources != sources:
+                        relationships_to_rebuild[edge_tuple] = remaining_sources
+
+            async with pipeline_status_lock:
+                log_message = (
+                    f"Found {len(relationships_to_rebuild)} affected relations"
+                )
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        except Exception as e:
+            logger.error(f"Failed to process graph analysis results: {e}")
+            raise Exception(f"Failed to process graph dependencies: {e}") from e
+
+        # Use graph database lock to prevent dirty read
+        graph_db_lock = get_graph_db_lock(enable_logging=False)
+        async with graph_db_lock:
+            # 5. Delete chunks from storage
+            if chunk_ids:
+                try:
+                    await self.chunks_vdb.delete(chunk_ids)
+                    await self.text_chunks.delete(chunk_ids)
+
+                    async with pipeline_status_lock:
+                        log_message = (
+                            f"Successfully deleted {len(chunk_ids)} chunks from storage"
+                        )
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
+
+                except Exception as e:
+                    logger.error(f"Failed to delete chunks: {e}")
+                    raise Exception(f"Failed to delete document chunks: {e}") from e
+
+            # 6. Delete entities that have no remaining sources
+            if entities_to_delete:
+                try:
+                    # Delete from vector database
+                    entity_vdb_ids = [
+                        compute_mdhash_id(entity, prefix="ent-")
+                        for entity in entities_to_delete
+                    ]
+                    await self.entities_vdb.delete(entity_vdb_ids)
+
+                    # Delete from graph
+                    await self.chunk_entity_relation_graph.remove_nodes(
+                        list(entities_to_delete)
+                    )
+
+                    async with pipeline_status_lock:
+                        log_message = (
+                            f"Successfully deleted {len(entities_to_delete)} entities"
+                        )
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
+
+                except Exception as e:
+                    logger.error(f"Failed to delete entities: {e}")
+                    raise Exception(f"Failed to delete entities: {e}") from e
+
+            # 7. Delete relationships that have no remaining sources
+            if relationships_to_delete:
+                try:
+                    # Delete from vector database
+                    rel_ids_to_delete = []
+                    for src, tgt in relationships_to_delete:
+                        rel_ids_to_delete.extend(
+                            [
+                                compute_mdhash_id(src + tgt, prefix="rel-"),
+                                compute_mdhash_id(tgt + src, prefix="rel-"),
+                            ]
+                        )
+                    await self.relationships_vdb.delete(rel_ids_to_delete)
+
+                    # Delete from graph
+                    await self.chunk_entity_relation_graph.remove_edges(
+                        list(relationships_to_delete)
+                    )
+
+                    async with pipeline_status_lock:
+                        log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
+
+                except Exception as e:
+                    logger.error(f"Failed to delete relationships: {e}")
+                    raise Exception(f"Failed to delete relationships: {e}") from e
+
+            # Persist changes to graph database before releasing graph database lock
+            await self._insert_done()
+
+        # 8. Rebuild entities and relationships from remaining chunks
+        if entities_to_rebuild or relationships_to_rebuild:
+            try:
+                await _rebuild_knowledge_from_chunks(
+                    entities_to_rebuild=entities_to_rebuild,
+                    relationships_to_rebuild=relationships_to_rebuild,
+                    knowledge_graph_inst=self.chunk_entity_relation_graph,
+                    entities_vdb=self.entities_vdb,
+                    relationships_vdb=self.relationships_vdb,
+                    text_chunks_storage=self.text_chunks,
+                    llm_response_cache=self.llm_response_cache,
+                    global_config=asdict(self),
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
                 )
 
+            except Exception as e:
+                logger.error(f"Failed to rebuild knowledge from chunks: {e}")
+                raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
+
+        return (
+            entities_to_delete,
+            entities_to_rebuild,
+            relationships_to_delete,
+            relationships_to_rebuild,
+        )
+
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
 
@@ -2678,12 +3485,14 @@ class LightRAG:
         """
         from .utils_graph import adelete_by_entity
 
-        return await adelete_by_entity(
+        result = await adelete_by_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
         )
+        self._clear_query_caches()
+        return result
 
     def delete_by_entity(self, entity_name: str) -> DeletionResult:
         """Synchronously delete an entity and all its relationships.
@@ -2711,12 +3520,14 @@ class LightRAG:
         """
         from .utils_graph import adelete_by_relation
 
-        return await adelete_by_relation(
+        result = await adelete_by_relation(
             self.chunk_entity_relation_graph,
             self.relationships_vdb,
             source_entity,
             target_entity,
         )
+        self._clear_query_caches()
+        return result
 
     def delete_by_relation(
         self, source_entity: str, target_entity: str
@@ -2971,49 +3782,62 @@ class LightRAG:
     async def aexport_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "jsonl", "parquet"] = "csv",
         include_vector_data: bool = False,
-    ) -> None:
+        batch_size: int = 1000,
+    ) -> dict[str, int] | None:
         """
         Asynchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
                 - table: Print formatted tables to console
+                - jsonl: Streamed JSON lines, one entity or relation per line
+                - parquet: Streamed <output>_entities.parquet and <output>_relations.parquet
             include_vector_data: Whether to include data from the vector database.
+            batch_size: Records written per batch by the streamed formats (jsonl, parquet).
+        Returns:
+            Number of exported entities and relations for jsonl and parquet, else None.
         """
         from .utils import aexport_data as utils_aexport_data
 
-        await utils_aexport_data(
+        return await utils_aexport_data(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
             output_path,
             file_format,
             include_vector_data,
+            batch_size,
         )
 
     def export_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "jsonl", "parquet"] = "csv",
         include_vector_data: bool = False,
-    ) -> None:
+        batch_size: int = 1000,
+    ) -> dict[str, int] | None:
         """
         Synchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
                 - table: Print formatted tables to console
+                - jsonl: Streamed JSON lines, one entity or relation per line
+                - parquet: Streamed <output>_entities.parquet and <output>_relations.parquet
             include_vector_data: Whether to include data from the vector database.
+            batch_size: Records written per batch by the streamed formats (jsonl, parquet).
+        Returns:
+            Number of exported entities and relations for jsonl and parquet, else None.
         """
         try:
             loop = asyncio.get_event_loop()
@@ -3021,6 +3845,55 @@ class LightRAG:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
 
-        loop.run_until_complete(
-            self.aexport_data(output_path, file_format, include_vector_data)
+        return loop.run_until_complete(
+            self.aexport_data(output_path, file_format, include_vector_data, batch_size)
+        )
+
+    async def aimport_data(
+        self,
+        input_path: str,
+        file_format: Literal["jsonl", "parquet"] = "jsonl",
+        batch_size: int = 1000,
+    ) -> dict[str, int]:
+        """
+        Asynchronously bulk imports entities, relations and chunks from a streamed export.
+        Args:
+            input_path: The JSONL file, or the output path given to the parquet export
+                (reads <input>_entities.parquet, <input>_relations.parquet and the
+                optional <input>_chunks.parquet).
+            file_format: Input format - "jsonl" or "parquet".
+            batch_size: Records written per batch to graph and vector storages.
+        Returns:
+            Number of imported entities, relations and chunks.
+        """
+        from .utils import astream_import_data
+
+        try:
+            return await astream_import_data(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                self.chunks_vdb,
+                self.text_chunks,
+                input_path,
+                file_format,
+                batch_size,
+                tokenizer=self.tokenizer,
+            )
+        finally:
+            await self._insert_done()
+
+    def import_data(
+        self,
+        input_path: str,
+        file_format: Literal["jsonl", "parquet"] = "jsonl",
+        batch_size: int = 1000,
+    ) -> dict[str, int]:
+        """
+        Synchronously bulk imports entities, relations and chunks from a streamed export.
+        See `aimport_data` for the arguments.
+        """
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(
+            self.aimport_data(input_path, file_format, batch_size)
         )
@@ -26,6 +26,7 @@ from lightrag.utils import (
     safe_unicode_decode,
     logger,
 )
+from lightrag.llm.client_registry import get_openai_client
 
 import numpy as np
 
@@ -69,12 +70,15 @@ async def azure_openai_complete_if_cache(
     kwargs.pop("keyword_extraction", None)
     timeout = kwargs.pop("timeout", None)
 
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
-        timeout=timeout,
+    openai_async_client = get_openai_client(
+        AsyncAzureOpenAI,
+        {
+            "azure_endpoint": base_url,
+            "azure_deployment": deployment,
+            "api_key": api_key,
+            "api_version": api_version,
+            "timeout": timeout,
+        },
     )
     messages = []
     if system_prompt:
@@ -164,11 +168,14 @@ async def azure_openai_embed(
         or os.getenv("OPENAI_API_VERSION")
     )
 
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
+    openai_async_client = get_openai_client(
+        AsyncAzureOpenAI,
+        {
+            "azure_endpoint": base_url,
+            "azure_deployment": deployment,
+            "api_key": api_key,
+            "api_version": api_version,
+        },
     )
 
     response = await openai_async_client.embeddings.create(
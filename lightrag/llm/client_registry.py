@@ -0,0 +1,213 @@
+"""
+Process-wide registry of HTTP clients shared by the LLM, embedding and rerank
+bindings.
+
+Creating a client per request costs a TCP/TLS handshake on every call and
+discards keep-alive connections. Bindings instead fetch a client from this
+registry, keyed by everything that affects how the client is built (endpoint,
+credentials, timeouts, extra client options). Clients are bound to the event
+loop they were created on, so each running loop gets its own set.
+
+Every LightRAG instance registers as a user of the registry of its event loop
+in `initialize_storages` (`acquire_shared_clients()`) and unregisters in
+`finalize_storages` (`release_shared_clients()`); the clients are closed when
+the last user on the loop is finalized, so finalizing one instance does not
+close the clients other instances are still using. `close_shared_clients()`
+closes them unconditionally. A closed client is recreated on the next request.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from lightrag.constants import (
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+)
+from lightrag.utils import get_env_value, logger
+
+
+@dataclass
+class _SharedClient:
+    client: Any
+    close: Callable[[Any], Awaitable[None]]
+
+
+_registries: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _SharedClient]]" = weakref.WeakKeyDictionary()
+# Number of registered users of the shared clients on each event loop
+_user_counts: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_registry() -> dict[str, _SharedClient]:
+    loop = asyncio.get_running_loop()
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = {}
+        _registries[loop] = registry
+    return registry
+
+
+def client_key(kind: str, **parts: Any) -> str:
+    """Build a registry key, hashing so credentials are never kept in plain text"""
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def get_shared_client(
+    key: str,
+    factory: Callable[[], Any],
+    close: Callable[[Any], Awaitable[None]],
+) -> Any:
+    """Return the client registered under key, creating it with factory on first use
+
+    Args:
+        key: Registry key, see `client_key`
+        factory: Builds a new client
+        close: Coroutine function releasing a client built by factory
+
+    Returns:
+        Client shared by all callers with the same key on the running event loop
+    """
+    registry = _loop_registry()
+    entry = registry.get(key)
+    if entry is None:
+        entry = _SharedClient(client=factory(), close=close)
+        registry[key] = entry
+        logger.debug(f"Created shared HTTP client {key.split(':')[0]}")
+    return entry.client
+
+
+def acquire_shared_clients() -> None:
+    """Register a user of the shared clients on the running event loop"""
+    loop = asyncio.get_running_loop()
+    _user_counts[loop] = _user_counts.get(loop, 0) + 1
+
+
+async def release_shared_clients() -> None:
+    """Unregister a user, closing the shared clients once no user is left"""
+    loop = asyncio.get_running_loop()
+    remaining = _user_counts.get(loop, 0) - 1
+    if remaining > 0:
+        _user_counts[loop] = remaining
+        return
+    _user_counts.pop(loop, None)
+    await close_shared_clients()
+
+
+async def close_shared_clients() -> None:
+    """Close every shared client created on the running event loop"""
+    registry = _loop_registry()
+    entries = list(registry.values())
+    registry.clear()
+    for entry in entries:
+        try:
+            await entry.close(entry.client)
+        except Exception as e:
+            logger.warning(f"Failed to close shared HTTP client: {e}")
+    if entries:
+        logger.debug(f"Closed {len(entries)} shared HTTP clients")
+
+    # Clients of event loops that are gone cannot be closed, only released
+    for loop in [loop for loop in list(_registries) if loop.is_closed()]:
+        _registries.pop(loop, None)
+
+
+def http_pool_limits() -> dict[str, Any]:
+    """Connection pool limits applied to every shared client"""
+    return {
+        "max_connections": get_env_value(
+            "HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS, int
+        ),
+        "max_keepalive_connections": get_env_value(
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        ),
+        "keepalive_expiry": get_env_value(
+            "HTTP_KEEPALIVE_EXPIRY", DEFAULT_HTTP_KEEPALIVE_EXPIRY, float
+        ),
+    }
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def httpx_client_kwargs() -> dict[str, Any]:
+    """Keyword arguments for an httpx.AsyncClient using the shared pool limits"""
+    import httpx
+
+    return {
+        "limits": httpx.Limits(**http_pool_limits()),
+        "http2": http2_available(),
+    }
+
+
+async def _close(client: Any) -> None:
+    await client.close()
+
+
+def get_openai_client(client_cls: type, client_configs: dict[str, Any]) -> Any:
+    """Shared AsyncOpenAI/AsyncAzureOpenAI client for the given constructor arguments
+
+    A pooled httpx client is injected unless client_configs already provides
+    `http_client`.
+    """
+
+    def factory():
+        configs = dict(client_configs)
+        if "http_client" not in configs:
+            from openai import DefaultAsyncHttpxClient
+
+            configs["http_client"] = DefaultAsyncHttpxClient(**httpx_client_kwargs())
+        return client_cls(**configs)
+
+    key = client_key(client_cls.__name__, **client_configs)
+    return get_shared_client(key, factory, _close)
+
+
+def get_ollama_client(host: str | None, timeout: Any, headers: dict[str, str]) -> Any:
+    """Shared ollama.AsyncClient for the given host, timeout and headers"""
+
+    def factory():
+        import ollama
+
+        return ollama.AsyncClient(
+            host=host, timeout=timeout, headers=headers, **httpx_client_kwargs()
+        )
+
+    key = client_key("ollama", host=host, timeout=timeout, headers=headers)
+    return get_shared_client(key, factory, lambda client: client._client.aclose())
+
+
+def get_aiohttp_session(base_url: str, timeout: float | None = None) -> Any:
+    """Shared aiohttp.ClientSession for requests to base_url
+
+    aiohttp speaks HTTP/1.1 only, connections are reused through keep-alive.
+    """
+
+    def factory():
+        import aiohttp
+
+        limits = http_pool_limits()
+        connector = aiohttp.TCPConnector(
+            limit=limits["max_connections"],
+            keepalive_timeout=limits["keepalive_expiry"],
+        )
+        if timeout is None:
+            # Keep aiohttp's default request timeout
+            return aiohttp.ClientSession(connector=connector)
+        return aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+
+    key = client_key("aiohttp", base_url=base_url, timeout=timeout)
+    return get_shared_client(key, factory, _close)
@@ -11,7 +11,6 @@ import pipmaster as pm  # Pipmaster for dynamic library install
 if not pm.is_installed("ollama"):
     pm.install("ollama")
 
-import ollama
 
 from tenacity import (
     retry,
@@ -25,6 +24,7 @@ from lightrag.exceptions import (
     APITimeoutError,
 )
 from lightrag.api import __api_version__
+from lightrag.llm.client_registry import get_ollama_client
 
 import numpy as np
 from typing import Union
@@ -65,7 +65,7 @@ async def _ollama_model_if_cache(
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = get_ollama_client(host=host, timeout=timeout, headers=headers)
 
     try:
         messages = []
@@ -85,12 +85,6 @@ async def _ollama_model_if_cache(
                 except Exception as e:
                     logger.error(f"Error in stream response: {str(e)}")
                     raise
-                finally:
-                    try:
-                        await ollama_client._client.aclose()
-                        logger.debug("Successfully closed Ollama client for streaming")
-                    except Exception as close_error:
-                        logger.warning(f"Failed to close Ollama client: {close_error}")
 
             return inner()
         else:
@@ -104,25 +98,8 @@ async def _ollama_model_if_cache(
 
             return model_response
     except Exception as e:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception: {close_error}"
-            )
+        logger.error(f"Error in ollama chat: {str(e)}")
         raise e
-    finally:
-        if not stream:
-            try:
-                await ollama_client._client.aclose()
-                logger.debug(
-                    "Successfully closed Ollama client for non-streaming response"
-                )
-            except Exception as close_error:
-                logger.warning(
-                    f"Failed to close Ollama client in finally block: {close_error}"
-                )
 
 
 async def ollama_model_complete(
@@ -159,7 +136,7 @@ async def ollama_embed(texts: list[str], embed_model, **kwargs) -> np.ndarray:
     host = kwargs.pop("host", None)
     timeout = kwargs.pop("timeout", None)
 
-    ollama_client = ollama.AsyncClient(host=host, timeout=timeout, headers=headers)
+    ollama_client = get_ollama_client(host=host, timeout=timeout, headers=headers)
     try:
         options = kwargs.pop("options", {})
         data = await ollama_client.embed(
@@ -168,17 +145,4 @@ async def ollama_embed(texts: list[str], embed_model, **kwargs) -> np.ndarray:
         return np.array(data["embeddings"])
     except Exception as e:
         logger.error(f"Error in ollama_embed: {str(e)}")
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after exception in embed")
-        except Exception as close_error:
-            logger.warning(
-                f"Failed to close Ollama client after exception in embed: {close_error}"
-            )
         raise e
-    finally:
-        try:
-            await ollama_client._client.aclose()
-            logger.debug("Successfully closed Ollama client after embed")
-        except Exception as close_error:
-            logger.warning(f"Failed to close Ollama client after embed: {close_error}")
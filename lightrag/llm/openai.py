@@ -31,6 +31,7 @@ from lightrag.utils import (
     logger,
 )
 from lightrag.types import GPTKeywordExtractionFormat
+from lightrag.llm.client_registry import get_openai_client
 from lightrag.api import __api_version__
 
 import numpy as np
@@ -56,7 +57,10 @@ def create_openai_async_client(
     base_url: str | None = None,
     client_configs: dict[str, Any] = None,
 ) -> AsyncOpenAI:
-    """Create an AsyncOpenAI client with the given configuration.
+    """Get the shared AsyncOpenAI client for the given configuration.
+
+    Clients are pooled per configuration by `lightrag.llm.client_registry`, so
+    connections are kept alive across calls. Do not close the returned client.
 
     Args:
         api_key: OpenAI API key. If None, uses the OPENAI_API_KEY environment variable.
@@ -66,7 +70,7 @@ def create_openai_async_client(
             explicit parameters (api_key, base_url).
 
     Returns:
-        An AsyncOpenAI client instance.
+        A shared AsyncOpenAI client instance.
     """
     if not api_key:
         api_key = os.environ["OPENAI_API_KEY"]
@@ -93,7 +97,7 @@ def create_openai_async_client(
             "OPENAI_API_BASE", "https://api.openai.com/v1"
         )
 
-    return AsyncOpenAI(**merged_configs)
+    return get_openai_client(AsyncOpenAI, merged_configs)
 
 
 @retry(
@@ -202,7 +206,6 @@ async def openai_complete_if_cache(
     messages = kwargs.pop("messages", messages)
 
     try:
-        # Don't use async with context manager, use client directly
         if "response_format" in kwargs:
             response = await openai_async_client.beta.chat.completions.parse(
                 model=model, messages=messages, **kwargs
@@ -213,21 +216,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -361,8 +360,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -389,93 +386,72 @@ async def openai_complete_if_cache(
                             f"Failed to close stream response in finally block: {close_error}"
                         )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-            content = getattr(message, "content", None)
-            reasoning_content = getattr(message, "reasoning_content", None)
-
-            # Handle COT logic for non-streaming responses (only if enabled)
-            final_content = ""
-
-            if enable_cot:
-                # Check if we should include reasoning content
-                should_include_reasoning = False
-                if reasoning_content and reasoning_content.strip():
-                    if not content or content.strip() == "":
-                        # Case 1: Only reasoning content, should include COT
-                        should_include_reasoning = True
-                        final_content = (
-                            content or ""
-                        )  # Use empty string if content is None
-                    else:
-                        # Case 3: Both content and reasoning_content present, ignore reasoning
-                        should_include_reasoning = False
-                        final_content = content
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+        content = getattr(message, "content", None)
+        reasoning_content = getattr(message, "reasoning_content", None)
+
+        # Handle COT logic for non-streaming responses (only if enabled)
+        final_content = ""
+
+        if enable_cot:
+            # Check if we should include reasoning content
+            should_include_reasoning = False
+            if reasoning_content and reasoning_content.strip():
+                if not content or content.strip() == "":
+                    # Case 1: Only reasoning content, should include COT
+                    should_include_reasoning = True
+                    final_content = content or ""  # Use empty string if content is None
                 else:
-                    # No reasoning content, use regular content
-                    final_content = content or ""
-
-                # Apply COT wrapping if needed
-                if should_include_reasoning:
-                    if r"\u" in reasoning_content:
-                        reasoning_content = safe_unicode_decode(
-                            reasoning_content.encode("utf-8")
-                        )
-                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+                    # Case 3: Both content and reasoning_content present, ignore reasoning
+                    should_include_reasoning = False
+                    final_content = content
             else:
-                # COT disabled, only use regular content
+                # No reasoning content, use regular content
                 final_content = content or ""
 
-            # Validate final content
-            if not final_content or final_content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
+            # Apply COT wrapping if needed
+            if should_include_reasoning:
+                if r"\u" in reasoning_content:
+                    reasoning_content = safe_unicode_decode(
+                        reasoning_content.encode("utf-8")
+                    )
+                final_content = f"<think>{reasoning_content}</think>{final_content}"
+        else:
+            # COT disabled, only use regular content
+            final_content = content or ""
+
+        # Validate final content
+        if not final_content or final_content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -605,20 +581,19 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
+    # Get the shared OpenAI client
     openai_async_client = create_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
-        response = await openai_async_client.embeddings.create(
-            model=model, input=texts, encoding_format="base64"
-        )
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    response = await openai_async_client.embeddings.create(
+        model=model, input=texts, encoding_format="base64"
+    )
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
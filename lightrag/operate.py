@@ -3,8 +3,9 @@ from functools import partial
 
 import asyncio
 import json
+import logging
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+from typing import Any, AsyncIterator, Iterator, overload, Literal
 from collections import Counter, defaultdict
 
 from .utils import (
@@ -20,6 +21,9 @@ from .utils import (
     handle_cache,
     save_to_cache,
     CacheData,
+    SemanticQueryCache,
+    RetrievalCache,
+    generate_cache_key,
     use_llm_func_with_cache,
     update_chunk_cache_list,
     remove_think_tags,
@@ -49,6 +53,7 @@ from .constants import (
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_REBUILD_BATCH_SIZE,
 )
 from .kg.shared_storage import get_storage_keyed_lock
 import time
@@ -115,6 +120,135 @@ def chunking_by_token_size(
     return results
 
 
+# UTF-8 continuation bytes (0b10xxxxxx); deleting them leaves one byte per character
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+def _encode_compact(tokenizer: Tokenizer, content: str):
+    """Encode content, as a uint32 array when the tokenizer supports it"""
+    encode_to_numpy = getattr(tokenizer.tokenizer, "encode_to_numpy", None)
+    if encode_to_numpy is not None and type(tokenizer).encode is Tokenizer.encode:
+        return encode_to_numpy(content)
+    return tokenizer.encode(content)
+
+
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    tokens,
+    overlap_token_size: int,
+    max_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, text) for each sliding token window over content
+
+    When the tokenizer exposes raw token bytes (tiktoken's `decode_bytes`), window
+    text is sliced from `content` using a running character offset instead of
+    being decoded. Windows whose edges split a multi-byte character are decoded
+    as before, so the text always equals `tokenizer.decode` of the window.
+    """
+    encoding = tokenizer.tokenizer
+    use_offsets = (
+        hasattr(encoding, "decode_bytes")
+        and hasattr(encoding, "decode_single_token_bytes")
+        and type(tokenizer).decode is Tokenizer.decode
+    )
+    step = max_token_size - overlap_token_size
+    n_tokens = len(tokens)
+    char_offset = 0  # Characters started by tokens before the window start
+
+    for start in range(0, n_tokens, step):
+        end = min(start + max_token_size, n_tokens)
+        window = tokens[start:end]
+        window = window.tolist() if hasattr(window, "tolist") else list(window)
+        if not use_offsets:
+            yield end - start, tokenizer.decode(window)
+            continue
+
+        # Bytes of the tokens the next window skips, and of the overlap it keeps
+        head_bytes = encoding.decode_bytes(window[:step])
+        tail_bytes = encoding.decode_bytes(window[step:])
+        head_chars = len(head_bytes.translate(None, _UTF8_CONTINUATION_BYTES))
+
+        starts_on_char = (head_bytes[0] & 0xC0) != 0x80
+        ends_on_char = (
+            end == n_tokens
+            or (encoding.decode_single_token_bytes(int(tokens[end]))[0] & 0xC0) != 0x80
+        )
+        if starts_on_char and ends_on_char:
+            char_count = head_chars + len(
+                tail_bytes.translate(None, _UTF8_CONTINUATION_BYTES)
+            )
+            chunk_content = content[char_offset : char_offset + char_count]
+        else:
+            chunk_content = tokenizer.decode(window)
+
+        char_offset += head_chars
+        yield end - start, chunk_content
+
+
+def chunking_by_token_size_streaming(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> Iterator[dict[str, Any]]:
+    """Generator variant of `chunking_by_token_size` with identical output
+
+    Chunks are yielded one at a time instead of being collected in a list, and
+    chunk text is sliced from the original content through token offsets rather
+    than decoded. Token ids are held as a compact array when the tokenizer
+    supports it, and the whole document is not encoded in split-by-character
+    mode. Select it with `LightRAG(chunking_func=chunking_by_token_size_streaming)`.
+    """
+    if split_by_character:
+        index = 0
+        for piece in content.split(split_by_character):
+            piece_tokens = _encode_compact(tokenizer, piece)
+            if split_by_character_only or len(piece_tokens) <= max_token_size:
+                windows = [(len(piece_tokens), piece)]
+            else:
+                windows = _iter_token_windows(
+                    tokenizer,
+                    piece,
+                    piece_tokens,
+                    overlap_token_size,
+                    max_token_size,
+                )
+            for token_count, chunk_content in windows:
+                yield {
+                    "tokens": token_count,
+                    "content": chunk_content.strip(),
+                    "chunk_order_index": index,
+                }
+                index += 1
+    else:
+        tokens = _encode_compact(tokenizer, content)
+        for index, (token_count, chunk_content) in enumerate(
+            _iter_token_windows(
+                tokenizer, content, tokens, overlap_token_size, max_token_size
+            )
+        ):
+            yield {
+                "tokens": token_count,
+                "content": chunk_content.strip(),
+                "chunk_order_index": index,
+            }
+
+
+def _llm_max_async(global_config: dict) -> int:
+    """Upper bound of concurrent LLM calls, the adaptive ceiling when enabled
+
+    The LLM priority queue enforces the actual limit; callers size their
+    semaphores from this so they never hold adaptive concurrency below it.
+    """
+    max_async = global_config.get("llm_model_max_async", 4)
+    if global_config.get("llm_adaptive_concurrency", False):
+        return max(max_async, global_config.get("llm_model_max_async_limit", max_async))
+    return max_async
+
+
 async def _handle_entity_relation_summary(
     description_type: str,
     entity_or_relation_name: str,
@@ -161,7 +295,8 @@ async def _handle_entity_relation_summary(
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        desc_token_counts = tokenizer.count_tokens_batch(current_list)
+        total_tokens = sum(desc_token_counts)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -195,7 +330,7 @@ async def _handle_entity_relation_summary(
 
         # Currently least 3 descriptions in current_list
         for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
+            desc_tokens = desc_token_counts[i]
 
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
@@ -481,11 +616,15 @@ async def _rebuild_knowledge_from_chunks(
     pipeline_status: dict | None = None,
     pipeline_status_lock=None,
 ) -> None:
-    """Rebuild entity and relationship descriptions from cached extraction results with parallel processing
+    """Rebuild entity and relationship descriptions from cached extraction results as a bulk job
 
     This method uses cached LLM extraction results instead of calling LLM again,
-    following the same approach as the insert process. Now with parallel processing
-    controlled by llm_model_max_async and using get_storage_keyed_lock for data consistency.
+    following the same approach as the insert process. Every cached extraction is
+    parsed once into per-chunk entity and relationship tables. Entities and then
+    relationships are rebuilt in batches of rebuild_batch_size: each batch holds
+    the keyed locks of its entities, reads graph state with batch queries,
+    summarizes descriptions in parallel (bounded by llm_model_max_async) and
+    writes graph and vector storage with one batched call each.
 
     Args:
         entities_to_rebuild: Dict mapping entity_name -> set of remaining chunk_ids
@@ -517,7 +656,7 @@ async def _rebuild_knowledge_from_chunks(
             pipeline_status["history_messages"].append(status_message)
 
     # Get cached extraction results for these chunks using storage
-    # cached_results： chunk_id -> [list of (extraction_result, create_time) from LLM cache sorted by create_time of the first extraction_result]
+    # cached_results： chunk_id -> [list of (extraction_result, create_time, file_path) from LLM cache sorted by create_time of the first extraction_result]
     cached_results = await _get_cached_extraction_results(
         llm_response_cache,
         all_referenced_chunk_ids,
@@ -544,12 +683,14 @@ async def _rebuild_knowledge_from_chunks(
             chunk_relationships[chunk_id] = defaultdict(list)
 
             # process multiple LLM extraction results for a single chunk_id
-            for result in results:
-                entities, relationships = await _rebuild_from_extraction_result(
-                    text_chunks_storage=text_chunks_storage,
-                    chunk_id=chunk_id,
-                    extraction_result=result[0],
-                    timestamp=result[1],
+            for extraction_result, timestamp, file_path in results:
+                entities, relationships = await _process_extraction_result(
+                    extraction_result,
+                    chunk_id,
+                    timestamp,
+                    file_path,
+                    tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
+                    completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
                 )
 
                 # Merge entities and relationships from this extraction result
@@ -611,162 +752,107 @@ async def _rebuild_knowledge_from_chunks(
             continue
 
     # Get max async tasks limit from global_config for semaphore control
-    graph_max_async = global_config.get("llm_model_max_async", 4) * 2
+    graph_max_async = _llm_max_async(global_config) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
+    batch_size = max(
+        1, global_config.get("rebuild_batch_size", DEFAULT_REBUILD_BATCH_SIZE)
+    )
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+
+    async def _report(status_message: str) -> None:
+        logger.info(status_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
 
     # Counters for tracking progress
     rebuilt_entities_count = 0
     rebuilt_relationships_count = 0
+    skipped_entities_count = 0
+    skipped_relationships_count = 0
     failed_entities_count = 0
     failed_relationships_count = 0
 
-    async def _locked_rebuild_entity(entity_name, chunk_ids):
-        nonlocal rebuilt_entities_count, failed_entities_count
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    await _report(
+        f"Starting batched rebuild of {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relationships (batch: {batch_size}, async: {graph_max_async})"
+    )
+
+    entity_items = list(entities_to_rebuild.items())
+    for start in range(0, len(entity_items), batch_size):
+        batch = dict(entity_items[start : start + batch_size])
+        try:
             async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
+                list(batch), namespace=namespace, enable_logging=False
             ):
-                try:
-                    await _rebuild_single_entity(
-                        knowledge_graph_inst=knowledge_graph_inst,
-                        entities_vdb=entities_vdb,
-                        entity_name=entity_name,
-                        chunk_ids=chunk_ids,
-                        chunk_entities=chunk_entities,
-                        llm_response_cache=llm_response_cache,
-                        global_config=global_config,
-                    )
-                    rebuilt_entities_count += 1
-                    status_message = (
-                        f"Rebuilt `{entity_name}` from {len(chunk_ids)} chunks"
-                    )
-                    logger.info(status_message)
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-                except Exception as e:
-                    failed_entities_count += 1
-                    status_message = f"Failed to rebuild `{entity_name}`: {e}"
-                    logger.info(status_message)  # Per requirement, change to info
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-
-    async def _locked_rebuild_relationship(src, tgt, chunk_ids):
-        nonlocal rebuilt_relationships_count, failed_relationships_count
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            # Sort src and tgt to ensure order-independent lock key generation
-            sorted_key_parts = sorted([src, tgt])
-            async with get_storage_keyed_lock(
-                sorted_key_parts,
-                namespace=namespace,
-                enable_logging=False,
-            ):
-                try:
-                    await _rebuild_single_relationship(
-                        knowledge_graph_inst=knowledge_graph_inst,
-                        relationships_vdb=relationships_vdb,
-                        src=src,
-                        tgt=tgt,
-                        chunk_ids=chunk_ids,
-                        chunk_relationships=chunk_relationships,
-                        llm_response_cache=llm_response_cache,
-                        global_config=global_config,
-                    )
-                    rebuilt_relationships_count += 1
-                    status_message = (
-                        f"Rebuilt `{src} - {tgt}` from {len(chunk_ids)} chunks"
-                    )
-                    logger.info(status_message)
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-                except Exception as e:
-                    failed_relationships_count += 1
-                    status_message = f"Failed to rebuild `{src} - {tgt}`: {e}"
-                    logger.info(status_message)  # Per requirement, change to info
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-
-    # Create tasks for parallel processing
-    tasks = []
-
-    # Add entity rebuilding tasks
-    for entity_name, chunk_ids in entities_to_rebuild.items():
-        task = asyncio.create_task(_locked_rebuild_entity(entity_name, chunk_ids))
-        tasks.append(task)
-
-    # Add relationship rebuilding tasks
-    for (src, tgt), chunk_ids in relationships_to_rebuild.items():
-        task = asyncio.create_task(_locked_rebuild_relationship(src, tgt, chunk_ids))
-        tasks.append(task)
-
-    # Log parallel processing start
-    status_message = f"Starting parallel rebuild of {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relationships (async: {graph_max_async})"
-    logger.info(status_message)
-    if pipeline_status is not None and pipeline_status_lock is not None:
-        async with pipeline_status_lock:
-            pipeline_status["latest_message"] = status_message
-            pipeline_status["history_messages"].append(status_message)
-
-    # Execute all tasks in parallel with semaphore control and early failure detection
-    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-
-    # Check if any task raised an exception and ensure all exceptions are retrieved
-    first_exception = None
+                rebuilt, skipped, failed = await _rebuild_entities_batch(
+                    entities=batch,
+                    knowledge_graph_inst=knowledge_graph_inst,
+                    entities_vdb=entities_vdb,
+                    chunk_entities=chunk_entities,
+                    llm_response_cache=llm_response_cache,
+                    global_config=global_config,
+                    semaphore=semaphore,
+                )
+        except Exception as e:
+            logger.error(f"Failed to rebuild batch of {len(batch)} entities: {e}")
+            rebuilt, skipped, failed = 0, 0, len(batch)
+        rebuilt_entities_count += rebuilt
+        skipped_entities_count += skipped
+        failed_entities_count += failed
+        await _report(
+            f"Rebuilt {rebuilt_entities_count + skipped_entities_count + failed_entities_count}/{len(entity_items)} entities"
+            + (f" ({failed_entities_count} failed)" if failed_entities_count else "")
+        )
 
-    for task in done:
+    relationship_items = list(relationships_to_rebuild.items())
+    for start in range(0, len(relationship_items), batch_size):
+        batch = dict(relationship_items[start : start + batch_size])
+        # Deduplicate endpoints shared by several relationships of the batch
+        lock_keys = list({name for pair in batch for name in pair})
         try:
-            exception = task.exception()
-            if exception is not None:
-                if first_exception is None:
-                    first_exception = exception
-            else:
-                # Task completed successfully, retrieve result to mark as processed
-                task.result()
+            async with get_storage_keyed_lock(
+                lock_keys, namespace=namespace, enable_logging=False
+            ):
+                rebuilt, skipped, failed = await _rebuild_relationships_batch(
+                    relationships=batch,
+                    knowledge_graph_inst=knowledge_graph_inst,
+                    relationships_vdb=relationships_vdb,
+                    chunk_relationships=chunk_relationships,
+                    llm_response_cache=llm_response_cache,
+                    global_config=global_config,
+                    semaphore=semaphore,
+                )
         except Exception as e:
-            if first_exception is None:
-                first_exception = e
-
-    # If any task failed, cancel all pending tasks and raise the first exception
-    if first_exception is not None:
-        # Cancel all pending tasks
-        for pending_task in pending:
-            pending_task.cancel()
-
-        # Wait for cancellation to complete
-        if pending:
-            await asyncio.wait(pending)
-
-        # Re-raise the first exception to notify the caller
-        raise first_exception
+            logger.error(f"Failed to rebuild batch of {len(batch)} relationships: {e}")
+            rebuilt, skipped, failed = 0, 0, len(batch)
+        rebuilt_relationships_count += rebuilt
+        skipped_relationships_count += skipped
+        failed_relationships_count += failed
+        await _report(
+            f"Rebuilt {rebuilt_relationships_count + skipped_relationships_count + failed_relationships_count}/{len(relationship_items)} relationships"
+            + (
+                f" ({failed_relationships_count} failed)"
+                if failed_relationships_count
+                else ""
+            )
+        )
 
     # Final status report
     status_message = f"KG rebuild completed: {rebuilt_entities_count} entities and {rebuilt_relationships_count} relationships rebuilt successfully."
+    if skipped_entities_count > 0 or skipped_relationships_count > 0:
+        status_message += f" Skipped: {skipped_entities_count} entities, {skipped_relationships_count} relationships."
     if failed_entities_count > 0 or failed_relationships_count > 0:
         status_message += f" Failed: {failed_entities_count} entities, {failed_relationships_count} relationships."
-
-    logger.info(status_message)
-    if pipeline_status is not None and pipeline_status_lock is not None:
-        async with pipeline_status_lock:
-            pipeline_status["latest_message"] = status_message
-            pipeline_status["history_messages"].append(status_message)
+    await _report(status_message)
 
 
 async def _get_cached_extraction_results(
     llm_response_cache: BaseKVStorage,
     chunk_ids: set[str],
     text_chunks_storage: BaseKVStorage,
-) -> dict[str, list[str]]:
+) -> dict[str, list[tuple[str, int, str]]]:
     """Get cached extraction results for specific chunk IDs
 
     This function retrieves cached LLM extraction results for the given chunk IDs and returns
@@ -780,19 +866,27 @@ async def _get_cached_extraction_results(
         text_chunks_storage: Text chunks storage for retrieving chunk data and LLM cache references
 
     Returns:
-        Dict mapping chunk_id -> list of extraction_result_text, where:
+        Dict mapping chunk_id -> list of (extraction_result, create_time, file_path), where:
         - Keys (chunk_ids) are ordered by the create_time of their first extraction result
         - Values (extraction results) are ordered by create_time within each chunk
+        - file_path is read from the chunk data fetched with the same get_by_ids call
     """
     cached_results = {}
 
-    # Collect all LLM cache IDs from chunks
+    # Collect all LLM cache IDs and file paths from chunks
     all_cache_ids = set()
+    chunk_file_paths = {}
 
     # Read from storage
     chunk_data_list = await text_chunks_storage.get_by_ids(list(chunk_ids))
     for chunk_data in chunk_data_list:
         if chunk_data and isinstance(chunk_data, dict):
+            # Not every backend keeps get_by_ids results aligned with the ids
+            chunk_id = chunk_data.get("_id") or chunk_data.get("id")
+            if chunk_id:
+                chunk_file_paths[chunk_id] = chunk_data.get(
+                    "file_path", "unknown_source"
+                )
             llm_cache_list = chunk_data.get("llm_cache_list", [])
             if llm_cache_list:
                 all_cache_ids.update(llm_cache_list)
@@ -826,7 +920,13 @@ async def _get_cached_extraction_results(
             if chunk_id not in cached_results:
                 cached_results[chunk_id] = []
             # Store tuple with extraction result and creation time for sorting
-            cached_results[chunk_id].append((extraction_result, create_time))
+            cached_results[chunk_id].append(
+                (
+                    extraction_result,
+                    create_time,
+                    chunk_file_paths.get(chunk_id, "unknown_source"),
+                )
+            )
 
     # Sort extraction results by create_time for each chunk and collect earliest times
     chunk_earliest_times = {}
@@ -849,7 +949,7 @@ async def _get_cached_extraction_results(
     logger.info(
         f"Found {valid_entries} valid cache entries, {len(sorted_cached_results)} chunks with results"
     )
-    return sorted_cached_results  # each item: list(extraction_result, create_time)
+    return sorted_cached_results  # each item: list(extraction_result, create_time, file_path)
 
 
 async def _process_extraction_result(
@@ -958,330 +1058,347 @@ async def _process_extraction_result(
     return dict(maybe_nodes), dict(maybe_edges)
 
 
-async def _rebuild_from_extraction_result(
-    text_chunks_storage: BaseKVStorage,
-    extraction_result: str,
-    chunk_id: str,
-    timestamp: int,
-) -> tuple[dict, dict]:
-    """Parse cached extraction result using the same logic as extract_entities
+async def _rebuild_entities_batch(
+    entities: dict[str, set[str]],
+    knowledge_graph_inst: BaseGraphStorage,
+    entities_vdb: BaseVectorStorage,
+    chunk_entities: dict,
+    llm_response_cache: BaseKVStorage,
+    global_config: dict[str, str],
+    semaphore: asyncio.Semaphore,
+) -> tuple[int, int, int]:
+    """Rebuild a batch of entities from cached extraction results
 
-    Args:
-        text_chunks_storage: Text chunks storage to get chunk data
-        extraction_result: The cached LLM extraction result
-        chunk_id: The chunk ID for source tracking
+    Current nodes are read with one get_nodes_batch call and merged descriptions
+    are summarized concurrently under the semaphore. Entities without cached data
+    fall back to the descriptions of their relations, fetched with
+    get_nodes_edges_batch and get_edges_batch. The results are written with one
+    upsert_nodes_batch call and one entities_vdb upsert.
+
+    Note: The caller must hold the keyed locks of all entities in the batch.
+
+    A failed graph or vector write counts the whole batch as failed instead of
+    raising, so the remaining batches are still rebuilt.
 
     Returns:
-        Tuple of (entities_dict, relationships_dict)
+        Tuple of (rebuilt_count, skipped_count, failed_count), skipped items are
+        missing from the graph or have no data left to rebuild from
     """
+    current_nodes = await knowledge_graph_inst.get_nodes_batch(list(entities))
+
+    # entity_name -> cached entity data from its remaining chunks
+    entity_table: dict[str, list[dict]] = {}
+    for entity_name, chunk_ids in entities.items():
+        if entity_name in current_nodes:
+            entity_table[entity_name] = [
+                entity_data
+                for chunk_id in chunk_ids
+                for entity_data in chunk_entities.get(chunk_id, {}).get(entity_name, [])
+            ]
+
+    # Relations of entities that have to be rebuilt from relationships
+    fallback_edges: dict[str, list[dict]] = {}
+    fallback_names = [name for name, data in entity_table.items() if not data]
+    if fallback_names:
+        for entity_name in fallback_names:
+            logger.warning(
+                f"No entity data found for `{entity_name}`, trying to rebuild from relationships"
+            )
+        nodes_edges = await knowledge_graph_inst.get_nodes_edges_batch(fallback_names)
+        pairs = {pair for edges in nodes_edges.values() for pair in edges}
+        edges_data = await knowledge_graph_inst.get_edges_batch(
+            [{"src": src, "tgt": tgt} for src, tgt in pairs]
+        )
+        for entity_name in fallback_names:
+            fallback_edges[entity_name] = [
+                edges_data[pair]
+                for pair in nodes_edges.get(entity_name, [])
+                if pair in edges_data
+            ]
+
+    async def _merge_entity(entity_name: str) -> dict | None:
+        current_entity = current_nodes[entity_name]
+        all_entity_data = entity_table[entity_name]
+        file_paths = set()
 
-    # Get chunk data for file_path from storage
-    chunk_data = await text_chunks_storage.get_by_id(chunk_id)
-    file_path = (
-        chunk_data.get("file_path", "unknown_source")
-        if chunk_data
-        else "unknown_source"
-    )
+        if all_entity_data:
+            descriptions = []
+            entity_types = []
+            for entity_data in all_entity_data:
+                if entity_data.get("description"):
+                    descriptions.append(entity_data["description"])
+                if entity_data.get("entity_type"):
+                    entity_types.append(entity_data["entity_type"])
+                if entity_data.get("file_path"):
+                    file_paths.add(entity_data["file_path"])
+
+            # Remove duplicates while preserving order
+            description_list = list(dict.fromkeys(descriptions))
+            entity_types = list(dict.fromkeys(entity_types))
+
+            # Get most common entity type
+            entity_type = (
+                max(set(entity_types), key=entity_types.count)
+                if entity_types
+                else current_entity.get("entity_type", "UNKNOWN")
+            )
+        else:
+            edges = fallback_edges.get(entity_name)
+            if not edges:
+                logger.warning(f"No relations attached to entity `{entity_name}`")
+                return None
 
-    # Call the shared processing function
-    return await _process_extraction_result(
-        extraction_result,
-        chunk_id,
-        timestamp,
-        file_path,
-        tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-        completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
-    )
+            relationship_descriptions = []
+            for edge_data in edges:
+                if edge_data.get("description"):
+                    relationship_descriptions.append(edge_data["description"])
+                if edge_data.get("file_path"):
+                    file_paths.update(edge_data["file_path"].split(GRAPH_FIELD_SEP))
 
+            # deduplicate descriptions
+            description_list = list(dict.fromkeys(relationship_descriptions))
+            entity_type = current_entity.get("entity_type", "UNKNOWN")
 
-async def _rebuild_single_entity(
-    knowledge_graph_inst: BaseGraphStorage,
-    entities_vdb: BaseVectorStorage,
-    entity_name: str,
-    chunk_ids: set[str],
-    chunk_entities: dict,
-    llm_response_cache: BaseKVStorage,
-    global_config: dict[str, str],
-) -> None:
-    """Rebuild a single entity from cached extraction results"""
+        # Generate final description or fallback to current
+        if description_list:
+            async with semaphore:
+                final_description, _ = await _handle_entity_relation_summary(
+                    "Entity",
+                    entity_name,
+                    description_list,
+                    GRAPH_FIELD_SEP,
+                    global_config,
+                    llm_response_cache=llm_response_cache,
+                )
+        else:
+            final_description = current_entity.get("description", "")
 
-    # Get current entity data
-    current_entity = await knowledge_graph_inst.get_node(entity_name)
-    if not current_entity:
-        return
+        return {
+            **current_entity,
+            "description": final_description,
+            "entity_type": entity_type,
+            "source_id": GRAPH_FIELD_SEP.join(entities[entity_name]),
+            "file_path": GRAPH_FIELD_SEP.join(file_paths)
+            if file_paths
+            else current_entity.get("file_path", "unknown_source"),
+        }
 
-    # Helper function to update entity in both graph and vector storage
-    async def _update_entity_storage(
-        final_description: str, entity_type: str, file_paths: set[str]
-    ):
-        try:
-            # Update entity in graph storage (critical path)
-            updated_entity_data = {
-                **current_entity,
-                "description": final_description,
-                "entity_type": entity_type,
-                "source_id": GRAPH_FIELD_SEP.join(chunk_ids),
-                "file_path": GRAPH_FIELD_SEP.join(file_paths)
-                if file_paths
-                else current_entity.get("file_path", "unknown_source"),
-            }
-            await knowledge_graph_inst.upsert_node(entity_name, updated_entity_data)
+    entity_names = list(entity_table)
+    results = await asyncio.gather(
+        *[_merge_entity(entity_name) for entity_name in entity_names],
+        return_exceptions=True,
+    )
 
-            # Update entity in vector database (equally critical)
-            entity_vdb_id = compute_mdhash_id(entity_name, prefix="ent-")
-            entity_content = f"{entity_name}\n{final_description}"
+    failed_count = 0
+    nodes = []
+    for entity_name, result in zip(entity_names, results):
+        if isinstance(result, Exception):
+            failed_count += 1
+            logger.info(f"Failed to rebuild `{entity_name}`: {result}")
+        elif result is not None:
+            nodes.append((entity_name, result))
+
+    if nodes:
+        try:
+            await knowledge_graph_inst.upsert_nodes_batch(nodes)
 
             vdb_data = {
-                entity_vdb_id: {
-                    "content": entity_content,
+                compute_mdhash_id(entity_name, prefix="ent-"): {
+                    "content": f"{entity_name}\n{entity_data['description']}",
                     "entity_name": entity_name,
-                    "source_id": updated_entity_data["source_id"],
-                    "description": final_description,
-                    "entity_type": entity_type,
-                    "file_path": updated_entity_data["file_path"],
+                    "source_id": entity_data["source_id"],
+                    "description": entity_data["description"],
+                    "entity_type": entity_data["entity_type"],
+                    "file_path": entity_data["file_path"],
                 }
+                for entity_name, entity_data in nodes
             }
 
             # Use safe operation wrapper - VDB failure must throw exception
             await safe_vdb_operation_with_exception(
                 operation=lambda: entities_vdb.upsert(vdb_data),
                 operation_name="rebuild_entity_upsert",
-                entity_name=entity_name,
+                entity_name=f"{len(nodes)} entities",
                 max_retries=3,
                 retry_delay=0.1,
             )
-
         except Exception as e:
-            error_msg = f"Failed to update entity storage for `{entity_name}`: {e}"
-            logger.error(error_msg)
-            raise  # Re-raise exception
-
-    # Collect all entity data from relevant chunks
-    all_entity_data = []
-    for chunk_id in chunk_ids:
-        if chunk_id in chunk_entities and entity_name in chunk_entities[chunk_id]:
-            all_entity_data.extend(chunk_entities[chunk_id][entity_name])
+            # Count the batch as failed and let the caller continue with the next one
+            logger.error(f"Failed to update storage for {len(nodes)} entities: {e}")
+            failed_count += len(nodes)
+            nodes = []
 
-    if not all_entity_data:
-        logger.warning(
-            f"No entity data found for `{entity_name}`, trying to rebuild from relationships"
-        )
+    skipped_count = len(entities) - len(nodes) - failed_count
+    return len(nodes), skipped_count, failed_count
 
-        # Get all edges connected to this entity
-        edges = await knowledge_graph_inst.get_node_edges(entity_name)
-        if not edges:
-            logger.warning(f"No relations attached to entity `{entity_name}`")
-            return
 
-        # Collect relationship data to extract entity information
-        relationship_descriptions = []
-        file_paths = set()
-
-        # Get edge data for all connected relationships
-        for src_id, tgt_id in edges:
-            edge_data = await knowledge_graph_inst.get_edge(src_id, tgt_id)
-            if edge_data:
-                if edge_data.get("description"):
-                    relationship_descriptions.append(edge_data["description"])
-
-                if edge_data.get("file_path"):
-                    edge_file_paths = edge_data["file_path"].split(GRAPH_FIELD_SEP)
-                    file_paths.update(edge_file_paths)
+async def _rebuild_relationships_batch(
+    relationships: dict[tuple[str, str], set[str]],
+    knowledge_graph_inst: BaseGraphStorage,
+    relationships_vdb: BaseVectorStorage,
+    chunk_relationships: dict,
+    llm_response_cache: BaseKVStorage,
+    global_config: dict[str, str],
+    semaphore: asyncio.Semaphore,
+) -> tuple[int, int, int]:
+    """Rebuild a batch of relationships from cached extraction results
 
-        # deduplicate descriptions
-        description_list = list(dict.fromkeys(relationship_descriptions))
+    Current edges are read with one get_edges_batch call and merged descriptions
+    are summarized concurrently under the semaphore. The results are written with
+    one upsert_edges_batch call, one relationships_vdb delete and one upsert.
 
-        # Generate final description from relationships or fallback to current
-        if description_list:
-            final_description, _ = await _handle_entity_relation_summary(
-                "Entity",
-                entity_name,
-                description_list,
-                GRAPH_FIELD_SEP,
-                global_config,
-                llm_response_cache=llm_response_cache,
-            )
-        else:
-            final_description = current_entity.get("description", "")
+    Note: The caller must hold the keyed locks of all endpoints in the batch.
 
-        entity_type = current_entity.get("entity_type", "UNKNOWN")
-        await _update_entity_storage(final_description, entity_type, file_paths)
-        return
+    A failed graph or vector write counts the whole batch as failed instead of
+    raising, so the remaining batches are still rebuilt.
 
-    # Process cached entity data
-    descriptions = []
-    entity_types = []
-    file_paths = set()
-
-    for entity_data in all_entity_data:
-        if entity_data.get("description"):
-            descriptions.append(entity_data["description"])
-        if entity_data.get("entity_type"):
-            entity_types.append(entity_data["entity_type"])
-        if entity_data.get("file_path"):
-            file_paths.add(entity_data["file_path"])
-
-    # Remove duplicates while preserving order
-    description_list = list(dict.fromkeys(descriptions))
-    entity_types = list(dict.fromkeys(entity_types))
-
-    # Get most common entity type
-    entity_type = (
-        max(set(entity_types), key=entity_types.count)
-        if entity_types
-        else current_entity.get("entity_type", "UNKNOWN")
+    Returns:
+        Tuple of (rebuilt_count, skipped_count, failed_count), skipped items are
+        missing from the graph or have no data left to rebuild from
+    """
+    current_edges = await knowledge_graph_inst.get_edges_batch(
+        [{"src": src, "tgt": tgt} for src, tgt in relationships]
     )
 
-    # Generate final description from entities or fallback to current
-    if description_list:
-        final_description, _ = await _handle_entity_relation_summary(
-            "Entity",
-            entity_name,
-            description_list,
-            GRAPH_FIELD_SEP,
-            global_config,
-            llm_response_cache=llm_response_cache,
-        )
-    else:
-        final_description = current_entity.get("description", "")
+    async def _merge_relationship(src: str, tgt: str) -> dict | None:
+        current_relationship = current_edges.get((src, tgt))
+        if not current_relationship:
+            return None
 
-    await _update_entity_storage(final_description, entity_type, file_paths)
+        # Collect all relationship data from relevant chunks
+        all_relationship_data = []
+        for chunk_id in relationships[(src, tgt)]:
+            if chunk_id in chunk_relationships:
+                # Check both (src, tgt) and (tgt, src) since relationships can be bidirectional
+                for edge_key in [(src, tgt), (tgt, src)]:
+                    if edge_key in chunk_relationships[chunk_id]:
+                        all_relationship_data.extend(
+                            chunk_relationships[chunk_id][edge_key]
+                        )
 
+        if not all_relationship_data:
+            logger.warning(f"No relation data found for `{src}-{tgt}`")
+            return None
 
-async def _rebuild_single_relationship(
-    knowledge_graph_inst: BaseGraphStorage,
-    relationships_vdb: BaseVectorStorage,
-    src: str,
-    tgt: str,
-    chunk_ids: set[str],
-    chunk_relationships: dict,
-    llm_response_cache: BaseKVStorage,
-    global_config: dict[str, str],
-) -> None:
-    """Rebuild a single relationship from cached extraction results
+        # Merge descriptions and keywords
+        descriptions = []
+        keywords = []
+        weights = []
+        file_paths = set()
 
-    Note: This function assumes the caller has already acquired the appropriate
-    keyed lock for the relationship pair to ensure thread safety.
-    """
+        for rel_data in all_relationship_data:
+            if rel_data.get("description"):
+                descriptions.append(rel_data["description"])
+            if rel_data.get("keywords"):
+                keywords.append(rel_data["keywords"])
+            if rel_data.get("weight"):
+                weights.append(rel_data["weight"])
+            if rel_data.get("file_path"):
+                file_paths.add(rel_data["file_path"])
+
+        # Remove duplicates while preserving order
+        description_list = list(dict.fromkeys(descriptions))
+        keywords = list(dict.fromkeys(keywords))
+
+        combined_keywords = (
+            ", ".join(set(keywords))
+            if keywords
+            else current_relationship.get("keywords", "")
+        )
 
-    # Get current relationship data
-    current_relationship = await knowledge_graph_inst.get_edge(src, tgt)
-    if not current_relationship:
-        return
+        weight = sum(weights) if weights else current_relationship.get("weight", 1.0)
 
-    # Collect all relationship data from relevant chunks
-    all_relationship_data = []
-    for chunk_id in chunk_ids:
-        if chunk_id in chunk_relationships:
-            # Check both (src, tgt) and (tgt, src) since relationships can be bidirectional
-            for edge_key in [(src, tgt), (tgt, src)]:
-                if edge_key in chunk_relationships[chunk_id]:
-                    all_relationship_data.extend(
-                        chunk_relationships[chunk_id][edge_key]
-                    )
+        # Generate final description from relations or fallback to current
+        if description_list:
+            async with semaphore:
+                final_description, _ = await _handle_entity_relation_summary(
+                    "Relation",
+                    f"{src}-{tgt}",
+                    description_list,
+                    GRAPH_FIELD_SEP,
+                    global_config,
+                    llm_response_cache=llm_response_cache,
+                )
+        else:
+            # fallback to keep current(unchanged)
+            final_description = current_relationship.get("description", "")
 
-    if not all_relationship_data:
-        logger.warning(f"No relation data found for `{src}-{tgt}`")
-        return
+        return {
+            **current_relationship,
+            "description": final_description
+            if final_description
+            else current_relationship.get("description", ""),
+            "keywords": combined_keywords,
+            "weight": weight,
+            "source_id": GRAPH_FIELD_SEP.join(relationships[(src, tgt)]),
+            "file_path": GRAPH_FIELD_SEP.join([fp for fp in file_paths if fp])
+            if file_paths
+            else current_relationship.get("file_path", "unknown_source"),
+        }
 
-    # Merge descriptions and keywords
-    descriptions = []
-    keywords = []
-    weights = []
-    file_paths = set()
-
-    for rel_data in all_relationship_data:
-        if rel_data.get("description"):
-            descriptions.append(rel_data["description"])
-        if rel_data.get("keywords"):
-            keywords.append(rel_data["keywords"])
-        if rel_data.get("weight"):
-            weights.append(rel_data["weight"])
-        if rel_data.get("file_path"):
-            file_paths.add(rel_data["file_path"])
-
-    # Remove duplicates while preserving order
-    description_list = list(dict.fromkeys(descriptions))
-    keywords = list(dict.fromkeys(keywords))
-
-    combined_keywords = (
-        ", ".join(set(keywords))
-        if keywords
-        else current_relationship.get("keywords", "")
+    pairs = list(relationships)
+    results = await asyncio.gather(
+        *[_merge_relationship(src, tgt) for src, tgt in pairs],
+        return_exceptions=True,
     )
 
-    weight = sum(weights) if weights else current_relationship.get("weight", 1.0)
-
-    # Generate final description from relations or fallback to current
-    if description_list:
-        final_description, _ = await _handle_entity_relation_summary(
-            "Relation",
-            f"{src}-{tgt}",
-            description_list,
-            GRAPH_FIELD_SEP,
-            global_config,
-            llm_response_cache=llm_response_cache,
-        )
-    else:
-        # fallback to keep current(unchanged)
-        final_description = current_relationship.get("description", "")
-
-    # Update relationship in graph storage
-    updated_relationship_data = {
-        **current_relationship,
-        "description": final_description
-        if final_description
-        else current_relationship.get("description", ""),
-        "keywords": combined_keywords,
-        "weight": weight,
-        "source_id": GRAPH_FIELD_SEP.join(chunk_ids),
-        "file_path": GRAPH_FIELD_SEP.join([fp for fp in file_paths if fp])
-        if file_paths
-        else current_relationship.get("file_path", "unknown_source"),
-    }
-    await knowledge_graph_inst.upsert_edge(src, tgt, updated_relationship_data)
-
-    # Update relationship in vector database
-    try:
-        rel_vdb_id = compute_mdhash_id(src + tgt, prefix="rel-")
-        rel_vdb_id_reverse = compute_mdhash_id(tgt + src, prefix="rel-")
+    failed_count = 0
+    edges = []
+    for (src, tgt), result in zip(pairs, results):
+        if isinstance(result, Exception):
+            failed_count += 1
+            logger.info(f"Failed to rebuild `{src} - {tgt}`: {result}")
+        elif result is not None:
+            edges.append((src, tgt, result))
 
-        # Delete old vector records first (both directions to be safe)
+    if edges:
         try:
-            await relationships_vdb.delete([rel_vdb_id, rel_vdb_id_reverse])
-        except Exception as e:
-            logger.debug(
-                f"Could not delete old relationship vector records {rel_vdb_id}, {rel_vdb_id_reverse}: {e}"
-            )
+            await knowledge_graph_inst.upsert_edges_batch(edges)
+
+            # Delete old vector records first (both directions to be safe)
+            old_vdb_ids = []
+            for src, tgt, _ in edges:
+                old_vdb_ids.append(compute_mdhash_id(src + tgt, prefix="rel-"))
+                old_vdb_ids.append(compute_mdhash_id(tgt + src, prefix="rel-"))
+            try:
+                await relationships_vdb.delete(old_vdb_ids)
+            except Exception as e:
+                logger.debug(
+                    f"Could not delete {len(old_vdb_ids)} old relationship vector records: {e}"
+                )
 
-        # Insert new vector record
-        rel_content = f"{combined_keywords}\t{src}\n{tgt}\n{final_description}"
-        vdb_data = {
-            rel_vdb_id: {
-                "src_id": src,
-                "tgt_id": tgt,
-                "source_id": updated_relationship_data["source_id"],
-                "content": rel_content,
-                "keywords": combined_keywords,
-                "description": final_description,
-                "weight": weight,
-                "file_path": updated_relationship_data["file_path"],
+            vdb_data = {
+                compute_mdhash_id(src + tgt, prefix="rel-"): {
+                    "src_id": src,
+                    "tgt_id": tgt,
+                    "source_id": edge_data["source_id"],
+                    "content": f"{edge_data['keywords']}\t{src}\n{tgt}\n{edge_data['description']}",
+                    "keywords": edge_data["keywords"],
+                    "description": edge_data["description"],
+                    "weight": edge_data["weight"],
+                    "file_path": edge_data["file_path"],
+                }
+                for src, tgt, edge_data in edges
             }
-        }
 
-        # Use safe operation wrapper - VDB failure must throw exception
-        await safe_vdb_operation_with_exception(
-            operation=lambda: relationships_vdb.upsert(vdb_data),
-            operation_name="rebuild_relationship_upsert",
-            entity_name=f"{src}-{tgt}",
-            max_retries=3,
-            retry_delay=0.2,
-        )
+            # Use safe operation wrapper - VDB failure must throw exception
+            await safe_vdb_operation_with_exception(
+                operation=lambda: relationships_vdb.upsert(vdb_data),
+                operation_name="rebuild_relationship_upsert",
+                entity_name=f"{len(edges)} relationships",
+                max_retries=3,
+                retry_delay=0.2,
+            )
+        except Exception as e:
+            # Count the batch as failed and let the caller continue with the next one
+            logger.error(
+                f"Failed to rebuild relationship storage for {len(edges)} relationships: {e}"
+            )
+            failed_count += len(edges)
+            edges = []
 
-    except Exception as e:
-        error_msg = f"Failed to rebuild relationship storage for `{src}-{tgt}`: {e}"
-        logger.error(error_msg)
-        raise  # Re-raise exception
+    skipped_count = len(relationships) - len(edges) - failed_count
+    return len(edges), skipped_count, failed_count
 
 
 async def _merge_nodes_then_upsert(
@@ -1573,6 +1690,212 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+async def _flush_buffered_vdb_upserts(
+    entity_vdb_records: dict[str, dict],
+    relation_vdb_records: dict[str, dict],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage | None,
+    relationships_vdb: BaseVectorStorage | None,
+    global_config: dict[str, str],
+) -> None:
+    """Upsert the entity/relation VDB records buffered during a merge phase in batches
+
+    Records are upserted in `embedding_batch_num` sized groups, one embedding request
+    each, so a document with thousands of entities costs a handful of embedding requests
+    instead of one request per entity. Groups are flushed concurrently, bounded by the
+    same limit as graph merging. Each group is refreshed from the graph while holding
+    the keyed locks of its own entities only, so a concurrent merge of the same entity
+    by another document can never leave an older description in the vector DB, and
+    other merges only wait for the group that shares their entities.
+    """
+    if entity_vdb is None:
+        entity_vdb_records = {}
+    if relationships_vdb is None:
+        relation_vdb_records = {}
+    if not entity_vdb_records and not relation_vdb_records:
+        return
+
+    group_size = max(1, global_config.get("embedding_batch_num", 10))
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    semaphore = asyncio.Semaphore(_llm_max_async(global_config) * 2)
+
+    async def _flush_entity_group(records: dict[str, dict]):
+        entity_names = [record["entity_name"] for record in records.values()]
+        async with semaphore:
+            async with get_storage_keyed_lock(
+                list(set(entity_names)), namespace=namespace, enable_logging=False
+            ):
+                nodes = await knowledge_graph_inst.get_nodes_batch(entity_names)
+                for record in records.values():
+                    node = nodes.get(record["entity_name"])
+                    if node:
+                        record["entity_type"] = node.get(
+                            "entity_type", record["entity_type"]
+                        )
+                        record["content"] = (
+                            f"{record['entity_name']}\n{node.get('description', '')}"
+                        )
+                        record["source_id"] = node.get("source_id", record["source_id"])
+                        record["file_path"] = node.get("file_path", record["file_path"])
+
+                # Use safe operation wrapper - VDB failure must throw exception
+                await safe_vdb_operation_with_exception(
+                    operation=lambda: entity_vdb.upsert(records),
+                    operation_name="entity_upsert",
+                    entity_name=f"{len(records)} entities",
+                    max_retries=3,
+                    retry_delay=0.1,
+                )
+
+    async def _flush_relation_group(records: dict[str, dict]):
+        lock_keys = set()
+        for record in records.values():
+            lock_keys.update((record["src_id"], record["tgt_id"]))
+        async with semaphore:
+            async with get_storage_keyed_lock(
+                list(lock_keys), namespace=namespace, enable_logging=False
+            ):
+                edges = await knowledge_graph_inst.get_edges_batch(
+                    [
+                        {"src": record["src_id"], "tgt": record["tgt_id"]}
+                        for record in records.values()
+                    ]
+                )
+                for record in records.values():
+                    edge = edges.get((record["src_id"], record["tgt_id"]))
+                    if edge:
+                        record["keywords"] = edge.get("keywords", record["keywords"])
+                        record["content"] = (
+                            f"{record['src_id']}\t{record['tgt_id']}\n{record['keywords']}\n{edge.get('description', '')}"
+                        )
+                        record["source_id"] = edge.get("source_id", record["source_id"])
+                        record["file_path"] = edge.get("file_path", record["file_path"])
+                        record["weight"] = edge.get("weight", record["weight"])
+
+                # Use safe operation wrapper - VDB failure must throw exception
+                await safe_vdb_operation_with_exception(
+                    operation=lambda: relationships_vdb.upsert(records),
+                    operation_name="relationship_upsert",
+                    entity_name=f"{len(records)} relations",
+                    max_retries=3,
+                    retry_delay=0.1,
+                )
+
+    entity_items = list(entity_vdb_records.items())
+    relation_items = list(relation_vdb_records.items())
+    await asyncio.gather(
+        *(
+            _flush_entity_group(dict(entity_items[start : start + group_size]))
+            for start in range(0, len(entity_items), group_size)
+        ),
+        *(
+            _flush_relation_group(dict(relation_items[start : start + group_size]))
+            for start in range(0, len(relation_items), group_size)
+        ),
+    )
+
+
+async def _update_doc_entity_relation_index(
+    doc_id: str,
+    entity_results: list,
+    edge_results: list,
+    full_entities_storage: BaseKVStorage,
+    full_relations_storage: BaseKVStorage,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    base_index: dict[str, list] | None = None,
+) -> None:
+    """Store the entity names and relation pairs a document contributed
+
+    Args:
+        doc_id: Document ID for storage indexing
+        entity_results: Merged entity data of the document's entities
+        edge_results: (edge_data, added_entities) of the document's relations
+        full_entities_storage: Storage for document entity lists
+        full_relations_storage: Storage for document relation lists
+        pipeline_status: Pipeline status dictionary
+        pipeline_status_lock: Lock for pipeline status
+        base_index: entity_names and relation_pairs the document keeps from a previous
+            version, merged into the new index of an updated document
+    """
+    try:
+        # Merge all entities: original entities + entities added during edge processing
+        final_entity_names = set()
+        if base_index:
+            final_entity_names.update(base_index.get("entity_names", []))
+
+        # Add original processed entities
+        for entity_data in entity_results:
+            if entity_data and entity_data.get("entity_name"):
+                final_entity_names.add(entity_data["entity_name"])
+
+        # Add entities that were added during relationship processing
+        added_count = 0
+        for _, added_entities in edge_results:
+            added_count += len(added_entities)
+            for added_entity in added_entities:
+                if added_entity and added_entity.get("entity_name"):
+                    final_entity_names.add(added_entity["entity_name"])
+
+        # Collect all relation pairs
+        final_relation_pairs = set()
+        if base_index:
+            final_relation_pairs.update(
+                tuple(sorted(pair)) for pair in base_index.get("relation_pairs", [])
+            )
+        for edge_data, _ in edge_results:
+            if edge_data:
+                src_id = edge_data.get("src_id")
+                tgt_id = edge_data.get("tgt_id")
+                if src_id and tgt_id:
+                    relation_pair = tuple(sorted([src_id, tgt_id]))
+                    final_relation_pairs.add(relation_pair)
+
+        log_message = f"Phase 3: Updating final {len(final_entity_names)}({len(entity_results)}+{added_count}) entities and  {len(final_relation_pairs)} relations from {doc_id}"
+        logger.info(log_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        # Update storage
+        if final_entity_names:
+            await full_entities_storage.upsert(
+                {
+                    doc_id: {
+                        "entity_names": list(final_entity_names),
+                        "count": len(final_entity_names),
+                    }
+                }
+            )
+        elif base_index is not None:
+            # An updated document no longer contributes any entity
+            await full_entities_storage.delete([doc_id])
+
+        if final_relation_pairs:
+            await full_relations_storage.upsert(
+                {
+                    doc_id: {
+                        "relation_pairs": [list(pair) for pair in final_relation_pairs],
+                        "count": len(final_relation_pairs),
+                    }
+                }
+            )
+        elif base_index is not None:
+            await full_relations_storage.delete([doc_id])
+
+        logger.debug(
+            f"Updated entity-relation index for document {doc_id}: {len(final_entity_names)} entities (original: {len(entity_results)}, added: {added_count}), {len(final_relation_pairs)} relations"
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Failed to update entity-relation index for document {doc_id}: {e}"
+        )
+        # Don't raise exception to avoid affecting main flow
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -1588,6 +1911,8 @@ async def merge_nodes_and_edges(
     current_file_number: int = 0,
     total_files: int = 0,
     file_path: str = "unknown_source",
+    doc_chunk_results: dict[str, list] | None = None,
+    doc_base_index: dict[str, dict] | None = None,
 ) -> None:
     """Two-phase merge: process all entities first, then all relationships
 
@@ -1596,6 +1921,13 @@ async def merge_nodes_and_edges(
     2. Phase 2: Process all relationships concurrently (may add missing entities)
     3. Phase 3: Update full_entities and full_relations storage with final results
 
+    Vector DB records are buffered during phase 1 and 2 and upserted in one batch at
+    the end of each phase, instead of one embedding request per entity or relation.
+
+    doc_chunk_results merges the extraction results of several documents in one
+    pass: an entity or relation shared by them is read, merged and summarized
+    once, and full_entities/full_relations are updated per document.
+
     Args:
         chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
         knowledge_graph_inst: Knowledge graph storage
@@ -1611,21 +1943,33 @@ async def merge_nodes_and_edges(
         current_file_number: Current file number for logging
         total_files: Total files for logging
         file_path: File path for logging
+        doc_chunk_results: Chunk results per document ID, replaces chunk_results and doc_id
+        doc_base_index: Entity names and relation pairs kept by updated documents, per
+            document ID, which only pass the results of their new chunks
     """
+    if doc_chunk_results is None:
+        doc_chunk_results = {doc_id: chunk_results}
+    else:
+        doc_id = ", ".join(doc_chunk_results)
 
-    # Collect all nodes and edges from all chunks
+    # Collect all nodes and edges from all chunks, and the keys of each document
     all_nodes = defaultdict(list)
     all_edges = defaultdict(list)
-
-    for maybe_nodes, maybe_edges in chunk_results:
-        # Collect nodes
-        for entity_name, entities in maybe_nodes.items():
-            all_nodes[entity_name].extend(entities)
-
-        # Collect edges with sorted keys for undirected graph
-        for edge_key, edges in maybe_edges.items():
-            sorted_edge_key = tuple(sorted(edge_key))
-            all_edges[sorted_edge_key].extend(edges)
+    doc_node_keys: dict[str, set] = defaultdict(set)
+    doc_edge_keys: dict[str, set] = defaultdict(set)
+
+    for result_doc_id, doc_results in doc_chunk_results.items():
+        for maybe_nodes, maybe_edges in doc_results:
+            # Collect nodes
+            for entity_name, entities in maybe_nodes.items():
+                all_nodes[entity_name].extend(entities)
+                doc_node_keys[result_doc_id].add(entity_name)
+
+            # Collect edges with sorted keys for undirected graph
+            for edge_key, edges in maybe_edges.items():
+                sorted_edge_key = tuple(sorted(edge_key))
+                all_edges[sorted_edge_key].extend(edges)
+                doc_edge_keys[result_doc_id].add(sorted_edge_key)
 
     total_entities_count = len(all_nodes)
     total_relations_count = len(all_edges)
@@ -1637,9 +1981,27 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
     # Get max async tasks limit from global_config for semaphore control
-    graph_max_async = global_config.get("llm_model_max_async", 4) * 2
+    graph_max_async = _llm_max_async(global_config) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    # Buffered VDB records, flushed in one batch at the end of each phase
+    entity_vdb_buffer: dict[str, dict] = {}
+    relation_vdb_buffer: dict[str, dict] = {}
+
+    async def _flush_vdb_buffers():
+        entity_records = dict(entity_vdb_buffer)
+        relation_records = dict(relation_vdb_buffer)
+        entity_vdb_buffer.clear()
+        relation_vdb_buffer.clear()
+        await _flush_buffered_vdb_upserts(
+            entity_records,
+            relation_records,
+            knowledge_graph_inst,
+            entity_vdb,
+            relationships_vdb,
+            global_config,
+        )
+
     # ===== Phase 1: Process all entities concurrently =====
     log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -1666,31 +2028,18 @@ async def merge_nodes_and_edges(
                         llm_response_cache,
                     )
 
-                    # Vector database operation (equally critical, must succeed)
+                    # Vector database operation is buffered and flushed after phase 1
                     if entity_vdb is not None and entity_data:
-                        data_for_vdb = {
-                            compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            ): {
-                                "entity_name": entity_data["entity_name"],
-                                "entity_type": entity_data["entity_type"],
-                                "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
-                                "source_id": entity_data["source_id"],
-                                "file_path": entity_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                            }
+                        entity_vdb_buffer[
+                            compute_mdhash_id(entity_data["entity_name"], prefix="ent-")
+                        ] = {
+                            "entity_name": entity_data["entity_name"],
+                            "entity_type": entity_data["entity_type"],
+                            "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
+                            "source_id": entity_data["source_id"],
+                            "file_path": entity_data.get("file_path", "unknown_source"),
                         }
 
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: entity_vdb.upsert(data_for_vdb),
-                            operation_name="entity_upsert",
-                            entity_name=entity_name,
-                            max_retries=3,
-                            retry_delay=0.1,
-                        )
-
                     return entity_data
 
                 except Exception as e:
@@ -1757,11 +2106,20 @@ async def merge_nodes_and_edges(
             # Wait for cancellation to complete
             if pending:
                 await asyncio.wait(pending)
+            # Keep VDB in sync with the entities already written to the graph
+            try:
+                await _flush_vdb_buffers()
+            except Exception as flush_error:
+                logger.error(f"Failed to flush entity VDB records: {flush_error}")
             # Re-raise the first exception to notify the caller
             raise first_exception
 
         # If all tasks completed successfully, collect results
         processed_entities = [task.result() for task in entity_tasks]
+    entity_results = dict(zip(all_nodes.keys(), processed_entities))
+
+    # Batch upsert all entity vectors of phase 1
+    await _flush_vdb_buffers()
 
     # ===== Phase 2: Process all relationships concurrently =====
     log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
@@ -1800,62 +2158,39 @@ async def merge_nodes_and_edges(
                     if edge_data is None:
                         return None, []
 
-                    # Vector database operation (equally critical, must succeed)
+                    # Vector database operations are buffered and flushed after phase 2
                     if relationships_vdb is not None:
-                        data_for_vdb = {
+                        relation_vdb_buffer[
                             compute_mdhash_id(
                                 edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-"
-                            ): {
-                                "src_id": edge_data["src_id"],
-                                "tgt_id": edge_data["tgt_id"],
-                                "keywords": edge_data["keywords"],
-                                "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
-                                "source_id": edge_data["source_id"],
-                                "file_path": edge_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                                "weight": edge_data.get("weight", 1.0),
-                            }
+                            )
+                        ] = {
+                            "src_id": edge_data["src_id"],
+                            "tgt_id": edge_data["tgt_id"],
+                            "keywords": edge_data["keywords"],
+                            "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
+                            "source_id": edge_data["source_id"],
+                            "file_path": edge_data.get("file_path", "unknown_source"),
+                            "weight": edge_data.get("weight", 1.0),
                         }
 
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: relationships_vdb.upsert(data_for_vdb),
-                            operation_name="relationship_upsert",
-                            entity_name=f"{edge_data['src_id']}-{edge_data['tgt_id']}",
-                            max_retries=3,
-                            retry_delay=0.1,
-                        )
-
-                    # Update added_entities to entity vector database using safe operation wrapper
+                    # Buffer entities added during edge processing
                     if added_entities and entity_vdb is not None:
                         for entity_data in added_entities:
-                            entity_vdb_id = compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            )
-                            entity_content = f"{entity_data['entity_name']}\n{entity_data['description']}"
-
-                            vdb_data = {
-                                entity_vdb_id: {
-                                    "content": entity_content,
-                                    "entity_name": entity_data["entity_name"],
-                                    "source_id": entity_data["source_id"],
-                                    "entity_type": entity_data["entity_type"],
-                                    "file_path": entity_data.get(
-                                        "file_path", "unknown_source"
-                                    ),
-                                }
+                            entity_vdb_buffer[
+                                compute_mdhash_id(
+                                    entity_data["entity_name"], prefix="ent-"
+                                )
+                            ] = {
+                                "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
+                                "entity_name": entity_data["entity_name"],
+                                "source_id": entity_data["source_id"],
+                                "entity_type": entity_data["entity_type"],
+                                "file_path": entity_data.get(
+                                    "file_path", "unknown_source"
+                                ),
                             }
 
-                            # Use safe operation wrapper - VDB failure must throw exception
-                            await safe_vdb_operation_with_exception(
-                                operation=lambda data=vdb_data: entity_vdb.upsert(data),
-                                operation_name="added_entity_upsert",
-                                entity_name=entity_data["entity_name"],
-                                max_retries=3,
-                                retry_delay=0.1,
-                            )
-
                     return edge_data, added_entities
 
                 except Exception as e:
@@ -1892,6 +2227,7 @@ async def merge_nodes_and_edges(
     # Execute relationship tasks with error handling
     processed_edges = []
     all_added_entities = []
+    edge_results = {}
 
     if edge_tasks:
         done, pending = await asyncio.wait(
@@ -1922,81 +2258,40 @@ async def merge_nodes_and_edges(
             # Wait for cancellation to complete
             if pending:
                 await asyncio.wait(pending)
+            # Keep VDB in sync with the relations already written to the graph
+            try:
+                await _flush_vdb_buffers()
+            except Exception as flush_error:
+                logger.error(f"Failed to flush relation VDB records: {flush_error}")
             # Re-raise the first exception to notify the caller
             raise first_exception
 
         # If all tasks completed successfully, collect results
-        for task in edge_tasks:
+        for edge_key, task in zip(all_edges.keys(), edge_tasks):
             edge_data, added_entities = task.result()
+            edge_results[edge_key] = (edge_data, added_entities)
             if edge_data is not None:
                 processed_edges.append(edge_data)
             all_added_entities.extend(added_entities)
 
-    # ===== Phase 3: Update full_entities and full_relations storage =====
-    if full_entities_storage and full_relations_storage and doc_id:
-        try:
-            # Merge all entities: original entities + entities added during edge processing
-            final_entity_names = set()
-
-            # Add original processed entities
-            for entity_data in processed_entities:
-                if entity_data and entity_data.get("entity_name"):
-                    final_entity_names.add(entity_data["entity_name"])
+    # Batch upsert all relation vectors and added entity vectors of phase 2
+    await _flush_vdb_buffers()
 
-            # Add entities that were added during relationship processing
-            for added_entity in all_added_entities:
-                if added_entity and added_entity.get("entity_name"):
-                    final_entity_names.add(added_entity["entity_name"])
-
-            # Collect all relation pairs
-            final_relation_pairs = set()
-            for edge_data in processed_edges:
-                if edge_data:
-                    src_id = edge_data.get("src_id")
-                    tgt_id = edge_data.get("tgt_id")
-                    if src_id and tgt_id:
-                        relation_pair = tuple(sorted([src_id, tgt_id]))
-                        final_relation_pairs.add(relation_pair)
-
-            log_message = f"Phase 3: Updating final {len(final_entity_names)}({len(processed_entities)}+{len(all_added_entities)}) entities and  {len(final_relation_pairs)} relations from {doc_id}"
-            logger.info(log_message)
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
-
-            # Update storage
-            if final_entity_names:
-                await full_entities_storage.upsert(
-                    {
-                        doc_id: {
-                            "entity_names": list(final_entity_names),
-                            "count": len(final_entity_names),
-                        }
-                    }
-                )
-
-            if final_relation_pairs:
-                await full_relations_storage.upsert(
-                    {
-                        doc_id: {
-                            "relation_pairs": [
-                                list(pair) for pair in final_relation_pairs
-                            ],
-                            "count": len(final_relation_pairs),
-                        }
-                    }
+    # ===== Phase 3: Update full_entities and full_relations storage =====
+    if full_entities_storage and full_relations_storage:
+        for result_doc_id in doc_chunk_results:
+            if result_doc_id:
+                await _update_doc_entity_relation_index(
+                    result_doc_id,
+                    [entity_results[key] for key in doc_node_keys[result_doc_id]],
+                    [edge_results[key] for key in doc_edge_keys[result_doc_id]],
+                    full_entities_storage,
+                    full_relations_storage,
+                    pipeline_status,
+                    pipeline_status_lock,
+                    (doc_base_index or {}).get(result_doc_id),
                 )
 
-            logger.debug(
-                f"Updated entity-relation index for document {doc_id}: {len(final_entity_names)} entities (original: {len(processed_entities)}, added: {len(all_added_entities)}), {len(final_relation_pairs)} relations"
-            )
-
-        except Exception as e:
-            logger.error(
-                f"Failed to update entity-relation index for document {doc_id}: {e}"
-            )
-            # Don't raise exception to avoid affecting main flow
-
     log_message = f"Completed merging: {len(processed_entities)} entities, {len(all_added_entities)} extra entities, {len(processed_edges)} relations"
     logger.info(log_message)
     async with pipeline_status_lock:
@@ -2174,7 +2469,7 @@ async def extract_entities(
         return maybe_nodes, maybe_edges
 
     # Get max async tasks limit from global_config
-    chunk_max_async = global_config.get("llm_model_max_async", 4)
+    chunk_max_async = _llm_max_async(global_config)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
     async def _process_with_semaphore(chunk):
@@ -2246,6 +2541,8 @@ async def kg_query(
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
     return_raw_data: Literal[True] = False,
+    semantic_cache: SemanticQueryCache | None = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> dict[str, Any]: ...
 
 
@@ -2262,6 +2559,8 @@ async def kg_query(
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
     return_raw_data: Literal[False] = False,
+    semantic_cache: SemanticQueryCache | None = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> str | AsyncIterator[str]: ...
 
 
@@ -2277,6 +2576,8 @@ async def kg_query(
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
     return_raw_data: bool = False,
+    semantic_cache: SemanticQueryCache | None = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> str | AsyncIterator[str] | dict[str, Any]:
     if not query:
         return PROMPTS["fail_response"]
@@ -2289,9 +2590,7 @@ async def kg_query(
         use_model_func = partial(use_model_func, _priority=5)
 
     # Handle cache
-    args_hash = compute_args_hash(
-        query_param.mode,
-        query,
+    param_values = (
         query_param.response_type,
         query_param.top_k,
         query_param.chunk_top_k,
@@ -2303,6 +2602,7 @@ async def kg_query(
         query_param.user_prompt or "",
         query_param.enable_rerank,
     )
+    args_hash = compute_args_hash(query_param.mode, query, *param_values)
     cached_result = await handle_cache(
         hashing_kv, args_hash, query, query_param.mode, cache_type="query"
     )
@@ -2311,6 +2611,33 @@ async def kg_query(
         if not query_param.only_need_context and not query_param.only_need_prompt:
             return cached_response
 
+    # Semantic cache: answer paraphrases of an earlier query with the same parameters
+    semantic_param_hash = None
+    query_embedding = None
+    if (
+        semantic_cache is not None
+        and not return_raw_data
+        and not query_param.only_need_context
+        and not query_param.only_need_prompt
+        and hashing_kv is not None
+        and hashing_kv.global_config.get("enable_llm_cache")
+        and text_chunks_db.embedding_func is not None
+    ):
+        semantic_param_hash = compute_args_hash(query_param.mode, *param_values)
+        try:
+            # The embedding is reused by the retrieval below on a cache miss
+            query_embedding = (
+                await text_chunks_db.embedding_func([query], _priority=5)
+            )[0]
+            cached_response = await semantic_cache.lookup(
+                semantic_param_hash, query_embedding
+            )
+        except Exception as e:
+            logger.warning(f"Semantic query cache lookup failed: {e}")
+            cached_response = None
+        if cached_response is not None:
+            return cached_response
+
     hl_keywords, ll_keywords = await get_keywords_from_query(
         query, query_param, global_config, hashing_kv
     )
@@ -2346,6 +2673,7 @@ async def kg_query(
             query_param,
             chunks_vdb,
             return_raw_data=True,
+            retrieval_cache=retrieval_cache,
         )
 
         if isinstance(context_result, tuple):
@@ -2371,6 +2699,8 @@ async def kg_query(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        query_embedding=query_embedding,
+        retrieval_cache=retrieval_cache,
     )
 
     if query_param.only_need_context and not query_param.only_need_prompt:
@@ -2393,11 +2723,14 @@ async def kg_query(
     if query_param.only_need_prompt:
         return "\n\n".join([sys_prompt, "---User Query---", user_query])
 
-    tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
-    logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        tokenizer: Tokenizer = global_config["tokenizer"]
+        query_tokens, sys_prompt_tokens = tokenizer.count_tokens_batch(
+            [query, sys_prompt]
+        )
+        logger.debug(
+            f"[kg_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
+        )
 
     response = await use_model_func(
         user_query,
@@ -2432,17 +2765,28 @@ async def kg_query(
             "user_prompt": query_param.user_prompt or "",
             "enable_rerank": query_param.enable_rerank,
         }
-        await save_to_cache(
-            hashing_kv,
-            CacheData(
-                args_hash=args_hash,
-                content=response,
-                prompt=query,
-                mode=query_param.mode,
-                cache_type="query",
-                queryparam=queryparam_dict,
-            ),
+        cache_data = CacheData(
+            args_hash=args_hash,
+            content=response,
+            prompt=query,
+            mode=query_param.mode,
+            cache_type="query",
+            queryparam=queryparam_dict,
         )
+        if semantic_param_hash is not None and query_embedding is not None:
+            cache_data.query_embedding = query_embedding
+            cache_data.param_hash = semantic_param_hash
+        await save_to_cache(hashing_kv, cache_data)
+        if (
+            cache_data.query_embedding is not None
+            and isinstance(response, str)
+            and response
+        ):
+            await semantic_cache.store(
+                generate_cache_key(query_param.mode, "query", args_hash),
+                semantic_param_hash,
+                query_embedding,
+            )
 
     return response
 
@@ -2526,10 +2870,11 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
-    logger.debug(
-        f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        len_of_prompts = tokenizer.count_tokens(kw_prompt)
+        logger.debug(
+            f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
+        )
 
     # 4. Call the LLM for keyword extraction
     if param.model_func:
@@ -2659,10 +3004,14 @@ async def _perform_kg_search(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    query_embedding: list[float] | None = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> dict[str, Any]:
     """
     Pure search logic that retrieves raw entities, relations, and vector chunks.
     No token truncation or formatting - just raw search results.
+    Local and global legs are served from retrieval_cache when their keyword set
+    and top_k were retrieved recently.
     """
 
     # Initialize result containers
@@ -2682,72 +3031,114 @@ async def _perform_kg_search(
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
-        embedding_func_config = text_chunks_db.embedding_func
-        if embedding_func_config and embedding_func_config.func:
-            try:
-                query_embedding = await embedding_func_config.func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
 
-    # Handle local and global modes
-    if query_param.mode == "local" and len(ll_keywords) > 0:
-        local_entities, local_relations = await _get_node_data(
+    # Decide which retrieval legs run for the current mode. A local (global)
+    # query without low-level (high-level) keywords falls back to the other leg.
+    run_local = len(ll_keywords) > 0 and (
+        query_param.mode != "global" or len(hl_keywords) == 0
+    )
+    run_global = len(hl_keywords) > 0 and (
+        query_param.mode != "local" or len(ll_keywords) == 0
+    )
+    run_vector = query_param.mode == "mix" and chunks_vdb is not None
+
+    # Reuse entities and relations retrieved recently for the same keywords
+    leg_keywords = {"local": ll_keywords, "global": hl_keywords}
+    cached_legs = {}
+    if retrieval_cache is not None:
+        for leg, run in (("local", run_local), ("global", run_global)):
+            if run:
+                cached = retrieval_cache.get(
+                    (leg, leg_keywords[leg], query_param.top_k)
+                )
+                if cached is not None:
+                    cached_legs[leg] = cached
+        if cached_legs:
+            logger.debug(f"Retrieval cache hit for {', '.join(cached_legs)} keywords")
+
+    # Embed query and keywords in one batched call, shared by all retrieval legs
+    embedding_texts = {}
+    if (
+        query
+        and query_embedding is None
+        and (kg_chunk_pick_method == "VECTOR" or chunks_vdb)
+    ):
+        embedding_texts["query"] = query
+    if run_local and "local" not in cached_legs:
+        embedding_texts["ll_keywords"] = ll_keywords
+    if run_global and "global" not in cached_legs:
+        embedding_texts["hl_keywords"] = hl_keywords
+
+    embeddings = {}
+    embedding_func_config = text_chunks_db.embedding_func
+    if embedding_texts and embedding_func_config and embedding_func_config.func:
+        try:
+            # Go through the wrapped function so concurrent queries share the
+            # embedding queue, cache and micro-batcher
+            batch_embeddings = await embedding_func_config(
+                list(embedding_texts.values()), _priority=5
+            )
+            embeddings = dict(zip(embedding_texts.keys(), batch_embeddings))
+            logger.debug(
+                f"Pre-computed {len(embeddings)} embeddings for all vector operations"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embeddings: {e}")
+            embeddings = {}
+    if query_embedding is None:
+        query_embedding = embeddings.get("query")
+
+    # Run local, global and vector retrieval legs concurrently
+    retrieval_tasks = {}
+    if run_local and "local" not in cached_legs:
+        retrieval_tasks["local"] = _get_node_data(
             ll_keywords,
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            query_embedding=embeddings.get("ll_keywords"),
         )
-
-    elif query_param.mode == "global" and len(hl_keywords) > 0:
-        global_relations, global_entities = await _get_edge_data(
+    if run_global and "global" not in cached_legs:
+        retrieval_tasks["global"] = _get_edge_data(
             hl_keywords,
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            query_embedding=embeddings.get("hl_keywords"),
         )
-
-    else:  # hybrid or mix mode
-        if len(ll_keywords) > 0:
-            local_entities, local_relations = await _get_node_data(
-                ll_keywords,
-                knowledge_graph_inst,
-                entities_vdb,
-                query_param,
-            )
-        if len(hl_keywords) > 0:
-            global_relations, global_entities = await _get_edge_data(
-                hl_keywords,
-                knowledge_graph_inst,
-                relationships_vdb,
-                query_param,
-            )
-
-        # Get vector chunks for mix mode
-        if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-                query_embedding,
-            )
-            # Track vector chunks with source metadata
-            for i, chunk in enumerate(vector_chunks):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-                if chunk_id:
-                    chunk_tracking[chunk_id] = {
-                        "source": "C",
-                        "frequency": 1,  # Vector chunks always have frequency 1
-                        "order": i + 1,  # 1-based order in vector search results
-                    }
-                else:
-                    logger.warning(f"Vector chunk missing chunk_id: {chunk}")
+    if run_vector:
+        retrieval_tasks["vector"] = _get_vector_context(
+            query,
+            chunks_vdb,
+            query_param,
+            query_embedding,
+        )
+    retrieval_results = dict(
+        zip(retrieval_tasks.keys(), await asyncio.gather(*retrieval_tasks.values()))
+    )
+    if retrieval_cache is not None:
+        for leg in ("local", "global"):
+            if leg in retrieval_results:
+                retrieval_cache.put(
+                    (leg, leg_keywords[leg], query_param.top_k), retrieval_results[leg]
+                )
+    retrieval_results.update(cached_legs)
+
+    local_entities, local_relations = retrieval_results.get("local", ([], []))
+    global_relations, global_entities = retrieval_results.get("global", ([], []))
+    vector_chunks = retrieval_results.get("vector", [])
+
+    # Track vector chunks with source metadata
+    for i, chunk in enumerate(vector_chunks):
+        chunk_id = chunk.get("chunk_id") or chunk.get("id")
+        if chunk_id:
+            chunk_tracking[chunk_id] = {
+                "source": "C",
+                "frequency": 1,  # Vector chunks always have frequency 1
+                "order": i + 1,  # 1-based order in vector search results
+            }
+        else:
+            logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
     # Round-robin merge entities
     final_entities = []
@@ -3012,40 +3403,89 @@ async def _merge_all_chunks(
     chunks_vdb: BaseVectorStorage = None,
     chunk_tracking: dict = None,
     query_embedding: list[float] = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> list[dict]:
     """
     Merge chunks from different sources: vector_chunks + entity_chunks + relation_chunks.
+
+    The chunks selected for the entities and relations are served from
+    retrieval_cache when the same entities and relations were resolved recently.
     """
     if chunk_tracking is None:
         chunk_tracking = {}
 
-    # Get chunks from entities
-    entity_chunks = []
-    if filtered_entities and text_chunks_db:
-        entity_chunks = await _find_related_text_unit_from_entities(
-            filtered_entities,
-            query_param,
-            text_chunks_db,
-            knowledge_graph_inst,
-            query,
-            chunks_vdb,
-            chunk_tracking=chunk_tracking,
-            query_embedding=query_embedding,
+    # Reuse the chunks selected recently for the same entities and relations
+    cache_key = None
+    cached = None
+    if retrieval_cache is not None and text_chunks_db:
+        pick_method = text_chunks_db.global_config.get(
+            "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
+        )
+        cache_key = (
+            "chunks",
+            tuple(entity["entity_name"] for entity in filtered_entities),
+            tuple(
+                tuple(sorted(relation.get("src_tgt") or ()))
+                or (relation.get("src_id"), relation.get("tgt_id"))
+                for relation in filtered_relations
+            ),
+            # Vector picking depends on the query, weighted polling does not
+            query if pick_method == "VECTOR" else "",
         )
+        cached = retrieval_cache.get(cache_key)
 
-    # Get chunks from relations
-    relation_chunks = []
-    if filtered_relations and text_chunks_db:
-        relation_chunks = await _find_related_text_unit_from_relations(
-            filtered_relations,
-            query_param,
-            text_chunks_db,
-            entity_chunks,  # For deduplication
-            query,
-            chunks_vdb,
-            chunk_tracking=chunk_tracking,
-            query_embedding=query_embedding,
+    if cached is not None:
+        entity_chunks, relation_chunks, tracking = cached
+        for info in tracking:
+            chunk_tracking[info.pop("chunk_id")] = info
+        logger.debug(
+            f"Retrieval cache hit for {len(entity_chunks) + len(relation_chunks)} entity/relation chunks"
         )
+    else:
+        # Get chunks from entities
+        entity_chunks = []
+        if filtered_entities and text_chunks_db:
+            entity_chunks = await _find_related_text_unit_from_entities(
+                filtered_entities,
+                query_param,
+                text_chunks_db,
+                knowledge_graph_inst,
+                query,
+                chunks_vdb,
+                chunk_tracking=chunk_tracking,
+                query_embedding=query_embedding,
+            )
+
+        # Get chunks from relations
+        relation_chunks = []
+        if filtered_relations and text_chunks_db:
+            relation_chunks = await _find_related_text_unit_from_relations(
+                filtered_relations,
+                query_param,
+                text_chunks_db,
+                entity_chunks,  # For deduplication
+                query,
+                chunks_vdb,
+                chunk_tracking=chunk_tracking,
+                query_embedding=query_embedding,
+            )
+
+        if cache_key is not None:
+            retrieval_cache.put(
+                cache_key,
+                (
+                    entity_chunks,
+                    relation_chunks,
+                    [
+                        {
+                            "chunk_id": chunk["chunk_id"],
+                            **chunk_tracking[chunk["chunk_id"]],
+                        }
+                        for chunk in entity_chunks + relation_chunks
+                        if chunk["chunk_id"] in chunk_tracking
+                    ],
+                ),
+            )
 
     # Round-robin merge chunks from different sources with deduplication
     merged_chunks = []
@@ -3205,7 +3645,7 @@ async def _build_llm_context(
         kg_context = kg_context_template.format(
             entities_str=entities_str, relations_str=relations_str
         )
-        kg_context_tokens = len(tokenizer.encode(kg_context))
+        kg_context_tokens = tokenizer.count_tokens(kg_context)
 
         # Calculate system prompt template overhead
         user_prompt = query_param.user_prompt if query_param.user_prompt else ""
@@ -3226,10 +3666,10 @@ async def _build_llm_context(
             response_type=response_type,
             user_prompt=user_prompt,
         )
-        sys_prompt_template_tokens = len(tokenizer.encode(sample_sys_prompt))
+        sys_prompt_template_tokens = tokenizer.count_tokens(sample_sys_prompt)
 
         # Total system prompt overhead = template + query tokens
-        query_tokens = len(tokenizer.encode(query))
+        query_tokens = tokenizer.count_tokens(query)
         sys_prompt_overhead = sys_prompt_template_tokens + query_tokens
 
         buffer_tokens = 100  # Safety buffer as requested
@@ -3365,10 +3805,16 @@ async def _build_query_context(
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
     return_raw_data: bool = False,
+    query_embedding: list[float] | None = None,
+    retrieval_cache: RetrievalCache | None = None,
 ) -> str | tuple[str, dict[str, Any]]:
     """
     Main query context building function using the new 4-stage architecture:
     1. Search -> 2. Truncate -> 3. Merge chunks -> 4. Build LLM context
+
+    query_embedding, when already computed by the caller, is reused instead of
+    embedding the query again. retrieval_cache serves recently retrieved
+    entities, relations and their selected chunks for repeated keyword sets.
     """
 
     if not query:
@@ -3386,6 +3832,8 @@ async def _build_query_context(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        query_embedding=query_embedding,
+        retrieval_cache=retrieval_cache,
     )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
@@ -3414,6 +3862,7 @@ async def _build_query_context(
         chunks_vdb=chunks_vdb,
         chunk_tracking=search_result["chunk_tracking"],
         query_embedding=search_result["query_embedding"],
+        retrieval_cache=retrieval_cache,
     )
 
     if (
@@ -3492,13 +3941,16 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -3704,7 +4156,7 @@ async def _find_related_text_unit_from_entities(
                         chunks_vdb=chunks_vdb,
                         num_of_chunks=num_of_chunks,
                         entity_info=entities_with_chunks,
-                        embedding_func=actual_embedding_func,
+                        embedding_func=embedding_func_config,
                         query_embedding=query_embedding,
                     )
 
@@ -3769,12 +4221,15 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -3996,7 +4451,7 @@ async def _find_related_text_unit_from_relations(
                         chunks_vdb=chunks_vdb,
                         num_of_chunks=num_of_chunks,
                         entity_info=relations_with_chunks,
-                        embedding_func=actual_embedding_func,
+                        embedding_func=embedding_func_config,
                         query_embedding=query_embedding,
                     )
 
@@ -4171,10 +4626,10 @@ async def naive_query(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_template_tokens = len(tokenizer.encode(sample_sys_prompt))
+    sys_prompt_template_tokens = tokenizer.count_tokens(sample_sys_prompt)
 
     # Total system prompt overhead = template + query tokens
-    query_tokens = len(tokenizer.encode(query))
+    query_tokens = tokenizer.count_tokens(query)
     sys_prompt_overhead = sys_prompt_template_tokens + query_tokens
 
     buffer_tokens = 100  # Safety buffer
@@ -4260,10 +4715,13 @@ async def naive_query(
     if query_param.only_need_prompt:
         return "\n\n".join([sys_prompt, "---User Query---", user_query])
 
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
-    logger.debug(
-        f"[naive_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        query_tokens, sys_prompt_tokens = tokenizer.count_tokens_batch(
+            [query, sys_prompt]
+        )
+        logger.debug(
+            f"[naive_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
+        )
 
     response = await use_model_func(
         user_query,
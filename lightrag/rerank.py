@@ -10,6 +10,7 @@ from tenacity import (
     retry_if_exception_type,
 )
 from .utils import logger
+from .llm.client_registry import get_aiohttp_session
 
 from dotenv import load_dotenv
 
@@ -109,64 +110,64 @@ async def generic_rerank_api(
         f"Rerank request: {len(documents)} documents, model: {model}, format: {response_format}"
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(base_url, headers=headers, json=payload) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                content_type = response.headers.get("content-type", "").lower()
-                is_html_error = (
-                    error_text.strip().startswith("<!DOCTYPE html>")
-                    or "text/html" in content_type
-                )
-                if is_html_error:
-                    if response.status == 502:
-                        clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
-                    elif response.status == 503:
-                        clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
-                    elif response.status == 504:
-                        clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
-                    else:
-                        clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
+    session = get_aiohttp_session(base_url)
+    async with session.post(base_url, headers=headers, json=payload) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            content_type = response.headers.get("content-type", "").lower()
+            is_html_error = (
+                error_text.strip().startswith("<!DOCTYPE html>")
+                or "text/html" in content_type
+            )
+            if is_html_error:
+                if response.status == 502:
+                    clean_error = "Bad Gateway (502) - Rerank service temporarily unavailable. Please try again in a few minutes."
+                elif response.status == 503:
+                    clean_error = "Service Unavailable (503) - Rerank service is temporarily overloaded. Please try again later."
+                elif response.status == 504:
+                    clean_error = "Gateway Timeout (504) - Rerank service request timed out. Please try again."
                 else:
-                    clean_error = error_text
-                logger.error(f"Rerank API error {response.status}: {clean_error}")
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=f"Rerank API error: {clean_error}",
-                )
-
-            response_json = await response.json()
-
-            if response_format == "aliyun":
-                # Aliyun format: {"output": {"results": [...]}}
-                results = response_json.get("output", {}).get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'output.results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
-
-            elif response_format == "standard":
-                # Standard format: {"results": [...]}
-                results = response_json.get("results", [])
-                if not isinstance(results, list):
-                    logger.warning(
-                        f"Expected 'results' to be list, got {type(results)}: {results}"
-                    )
-                    results = []
+                    clean_error = f"HTTP {response.status} - Rerank service error. Please try again later."
             else:
-                raise ValueError(f"Unsupported response format: {response_format}")
-            if not results:
-                logger.warning("Rerank API returned empty results")
-                return []
-
-            # Standardize return format
-            return [
-                {"index": result["index"], "relevance_score": result["relevance_score"]}
-                for result in results
-            ]
+                clean_error = error_text
+            logger.error(f"Rerank API error {response.status}: {clean_error}")
+            raise aiohttp.ClientResponseError(
+                request_info=response.request_info,
+                history=response.history,
+                status=response.status,
+                message=f"Rerank API error: {clean_error}",
+            )
+
+        response_json = await response.json()
+
+        if response_format == "aliyun":
+            # Aliyun format: {"output": {"results": [...]}}
+            results = response_json.get("output", {}).get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'output.results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+
+        elif response_format == "standard":
+            # Standard format: {"results": [...]}
+            results = response_json.get("results", [])
+            if not isinstance(results, list):
+                logger.warning(
+                    f"Expected 'results' to be list, got {type(results)}: {results}"
+                )
+                results = []
+        else:
+            raise ValueError(f"Unsupported response format: {response_format}")
+        if not results:
+            logger.warning("Rerank API returned empty results")
+            return []
+
+        # Standardize return format
+        return [
+            {"index": result["index"], "relevance_score": result["relevance_score"]}
+            for result in results
+        ]
 
 
 async def cohere_rerank(
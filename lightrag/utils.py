@@ -2,6 +2,8 @@ from __future__ import annotations
 import weakref
 
 import asyncio
+import base64
+import contextvars
 import html
 import csv
 import json
@@ -9,8 +11,10 @@ import logging
 import logging.handlers
 import os
 import re
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
@@ -26,6 +30,8 @@ from lightrag.constants import (
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_MAX_FILE_PATH_LENGTH,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    DEFAULT_SEMANTIC_CACHE_LOAD_PAGE_SIZE,
 )
 
 # Initialize logger with basic configuration
@@ -335,6 +341,7 @@ class TaskState:
     worker_started: bool = False
     cancellation_requested: bool = False
     cleanup_done: bool = False
+    token_estimate: int = 0  # Tokens reserved from the rate limiter
 
 
 @dataclass
@@ -342,11 +349,298 @@ class EmbeddingFunc:
     embedding_dim: int
     func: callable
     max_token_size: int | None = None  # deprecated keep it for compatible only
+    model_name: str | None = None  # used to isolate embedding cache entries per model
 
     async def __call__(self, *args, **kwargs) -> np.ndarray:
         return await self.func(*args, **kwargs)
 
 
+def get_embedding_model_name(embedding_func: Any) -> str:
+    """Resolve a stable model identifier for an embedding function
+
+    Prefers an explicit `model_name` attribute, then a `model` keyword bound with
+    functools.partial, and finally falls back to the qualified function name.
+    """
+    model_name = getattr(embedding_func, "model_name", None)
+    if model_name:
+        return model_name
+
+    func = getattr(embedding_func, "func", embedding_func)
+    while func is not None:
+        keywords = getattr(func, "keywords", None)
+        if keywords and keywords.get("model"):
+            return str(keywords["model"])
+        if not hasattr(func, "func"):
+            break
+        func = func.func
+
+    return getattr(func, "__qualname__", None) or type(func).__name__
+
+
+def compute_embedding_cache_key(text: str, model_name: str, embedding_dim: int) -> str:
+    """Compute a content-addressed cache key for an embedding
+
+    The key covers the text, the embedding model and the embedding dimension, so
+    switching models or dimensions never returns stale vectors.
+    """
+    return compute_mdhash_id(f"{model_name}|{embedding_dim}|{text}", prefix="emb-")
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache
+
+    Vectors are kept in a bounded in-memory LRU tier and, optionally, persisted in
+    a KV storage so that re-indexing unchanged text costs zero embedding calls
+    across restarts. Vectors are stored as base64 encoded float32 bytes.
+    """
+
+    def __init__(self, kv_storage=None, max_memory_entries: int = 10000):
+        self.kv_storage = kv_storage
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Look up cached vectors, returning only the keys that were found"""
+        found: dict[str, np.ndarray] = {}
+        missing = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+            else:
+                missing.append(key)
+
+        if missing and self.kv_storage is not None:
+            try:
+                records = await self.kv_storage.get_by_ids(missing)
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                records = []
+            # Some backends return rows unordered and skip missing ids, so match by id
+            missing_keys = set(missing)
+            for record in records:
+                if not record or not record.get("embedding"):
+                    continue
+                key = record.get("_id") or record.get("id")
+                if key in missing_keys:
+                    vector = decode_vector(record["embedding"])
+                    found[key] = vector
+                    self._remember(key, vector)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def put_many(
+        self, vectors: dict[str, np.ndarray], model_name: str, embedding_dim: int
+    ) -> None:
+        """Store freshly computed vectors in both cache tiers"""
+        if not vectors:
+            return
+        records = {}
+        for key, vector in vectors.items():
+            vector = np.asarray(vector, dtype=np.float32)
+            self._remember(key, vector)
+            records[key] = {
+                "embedding": encode_vector(vector),
+                "model_name": model_name,
+                "embedding_dim": embedding_dim,
+            }
+        if self.kv_storage is not None:
+            try:
+                await self.kv_storage.upsert(records)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+
+def cached_embedding_func_call(
+    cache: EmbeddingCache, model_name: str, embedding_dim: int
+):
+    """Embedding function decorator that serves unchanged texts from an EmbeddingCache
+
+    Only cache misses are forwarded to the wrapped function (deduplicated within
+    the call), and the results are stitched back in the caller's order.
+
+    Args:
+        cache: The EmbeddingCache instance to use
+        model_name: Embedding model identifier, part of the cache key
+        embedding_dim: Embedding dimension, part of the cache key
+
+    Returns:
+        Decorator function
+    """
+
+    def final_decro(func):
+        @wraps(func)
+        async def wait_func(texts: list[str], *args, **kwargs) -> np.ndarray:
+            if isinstance(texts, str):
+                texts = [texts]
+            if not texts:
+                return await func(texts, *args, **kwargs)
+
+            keys = [
+                compute_embedding_cache_key(text, model_name, embedding_dim)
+                for text in texts
+            ]
+            cached = await cache.get_many(list(dict.fromkeys(keys)))
+
+            # Deduplicate misses so identical texts are embedded only once
+            missing: dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in cached and key not in missing:
+                    missing[key] = text
+
+            if missing:
+                embeddings = await func(list(missing.values()), *args, **kwargs)
+                computed = {
+                    key: np.asarray(vector, dtype=np.float32)
+                    for key, vector in zip(missing.keys(), embeddings)
+                }
+                await cache.put_many(computed, model_name, embedding_dim)
+                cached.update(computed)
+                logger.debug(
+                    f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+                )
+
+            return np.array([cached[key] for key in keys])
+
+        return wait_func
+
+    return final_decro
+
+
+@dataclass
+class _EmbeddingBatch:
+    """Embedding calls gathered for one combined request"""
+
+    kwargs: dict[str, Any]
+    texts: list[str]
+    waiters: list[tuple[asyncio.Future, int, int]]  # (future, start, count)
+    priority: int | None = None
+    timer: asyncio.TimerHandle | None = None
+
+
+def batched_embedding_func_call(max_batch_size: int, max_wait_time: float):
+    """Embedding function decorator that coalesces concurrent small calls into batches
+
+    Calls arriving within max_wait_time seconds of each other are sent to the
+    wrapped function as one request of up to max_batch_size texts, and each caller
+    receives its own slice of the result. Calls already holding max_batch_size
+    texts, or using positional arguments besides texts, are forwarded unchanged.
+    Only calls with identical keyword arguments are combined; the batch runs with
+    the highest `_priority` (lowest value) of its members.
+
+    Args:
+        max_batch_size: Maximum number of texts per combined request
+        max_wait_time: Seconds to wait for more calls before sending a batch,
+            0 disables batching
+
+    Returns:
+        Decorator function
+    """
+
+    def final_decro(func):
+        if max_wait_time <= 0 or max_batch_size <= 1:
+            return func
+
+        batches: dict[tuple, _EmbeddingBatch] = {}
+        running: set[asyncio.Task] = set()
+
+        async def run_batch(batch: _EmbeddingBatch) -> None:
+            kwargs = dict(batch.kwargs)
+            if batch.priority is not None:
+                kwargs["_priority"] = batch.priority
+            try:
+                embeddings = np.asarray(await func(batch.texts, **kwargs))
+            except BaseException as e:
+                for future, _, _ in batch.waiters:
+                    if not future.done():
+                        if isinstance(e, asyncio.CancelledError):
+                            future.cancel()
+                        else:
+                            future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+                return
+
+            for future, start, count in batch.waiters:
+                if not future.done():
+                    future.set_result(embeddings[start : start + count])
+            if len(batch.waiters) > 1:
+                logger.debug(
+                    f"Embedding batcher: {len(batch.waiters)} calls sent as one request of {len(batch.texts)} texts"
+                )
+
+        def flush(key: tuple) -> None:
+            batch = batches.pop(key, None)
+            if batch is None:
+                return
+            if batch.timer is not None:
+                batch.timer.cancel()
+            task = asyncio.create_task(run_batch(batch))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        @wraps(func)
+        async def wait_func(texts: list[str], *args, **kwargs) -> np.ndarray:
+            if isinstance(texts, str):
+                texts = [texts]
+            if args or not texts or len(texts) >= max_batch_size:
+                return await func(texts, *args, **kwargs)
+
+            priority = kwargs.pop("_priority", None)
+            try:
+                key = tuple(sorted(kwargs.items()))
+                hash(key)
+            except TypeError:
+                if priority is not None:
+                    kwargs["_priority"] = priority
+                return await func(texts, **kwargs)
+
+            batch = batches.get(key)
+            if batch is not None and len(batch.texts) + len(texts) > max_batch_size:
+                flush(key)
+                batch = None
+            if batch is None:
+                batch = _EmbeddingBatch(kwargs=kwargs, texts=[], waiters=[])
+                batch.timer = asyncio.get_running_loop().call_later(
+                    max_wait_time, flush, key
+                )
+                batches[key] = batch
+
+            future = asyncio.get_running_loop().create_future()
+            batch.waiters.append((future, len(batch.texts), len(texts)))
+            batch.texts.extend(texts)
+            if priority is not None:
+                batch.priority = (
+                    priority
+                    if batch.priority is None
+                    else min(batch.priority, priority)
+                )
+            if len(batch.texts) >= max_batch_size:
+                flush(key)
+
+            return await future
+
+        return wait_func
+
+    return final_decro
+
+
 def compute_args_hash(*args: Any) -> str:
     """Compute a hash for the given arguments with safe Unicode handling.
 
@@ -433,6 +727,253 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an exception signals provider overload (HTTP 429/503/529 or a timeout)
+
+    The exception chain is inspected as well, so errors re-raised by retry
+    wrappers are still recognized.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (TimeoutError, WorkerTimeoutError)):
+            return True
+        name = type(error).__name__
+        if "RateLimit" in name or "Timeout" in name:
+            return True
+        response = getattr(error, "response", None)
+        for status in (
+            getattr(error, "status_code", None),
+            getattr(error, "status", None),
+            getattr(response, "status_code", None),
+        ):
+            if status in (429, 503, 529):
+                return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit for calls to a rate limited provider
+
+    The limit grows by one after `limit` consecutive healthy calls (additive
+    increase) and is multiplied by backoff_factor when a call fails with a rate
+    limit or timeout error (multiplicative decrease). A call is healthy when it
+    succeeds within latency_tolerance times the moving average latency; slow
+    calls hold the limit, which also covers 429s absorbed by retries inside the
+    LLM binding. Decreases are spaced by at least one average call latency so a
+    burst of concurrent failures backs off only once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        name: str = "adaptive",
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.on_change: Callable[[int], None] | None = None
+        self.in_flight = 0
+        self.avg_latency: float | None = None
+        self._healthy_streak = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until a call slot is free under the current limit"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(
+        self, latency: float | None = None, error: BaseException | None = None
+    ) -> None:
+        """Free a call slot and adjust the limit from the call outcome
+
+        Args:
+            latency: Call duration in seconds, None if the slot was not used
+            error: Exception raised by the call, None on success
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self._record(latency, error)
+            self._condition.notify_all()
+
+    def _record(self, latency: float, error: BaseException | None) -> None:
+        now = time.monotonic()
+        if error is not None:
+            if not is_overload_error(error):
+                return
+            self._healthy_streak = 0
+            if now - self._last_decrease < (self.avg_latency or 0.0):
+                return
+            self._last_decrease = now
+            self._set_limit(int(self.limit * self.backoff_factor), f"{error!r}")
+            return
+
+        healthy = (
+            self.avg_latency is None
+            or latency <= self.avg_latency * self.latency_tolerance
+        )
+        self.avg_latency = (
+            latency
+            if self.avg_latency is None
+            else 0.9 * self.avg_latency + 0.1 * latency
+        )
+        if not healthy:
+            self._healthy_streak = 0
+            return
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.limit:
+            self._healthy_streak = 0
+            self._set_limit(self.limit + 1, "healthy latency")
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = min(max(limit, self.min_limit), self.max_limit)
+        if limit == self.limit:
+            return
+        # Back-offs are worth seeing, the steady additive growth is not
+        log = logger.info if limit < self.limit else logger.debug
+        log(f"{self.name}: concurrency {self.limit} -> {limit} ({reason})")
+        self.limit = limit
+        if self.on_change is not None:
+            try:
+                self.on_change(limit)
+            except Exception as e:
+                logger.debug(f"{self.name}: concurrency listener failed: {e}")
+
+
+# Usage reported by TokenTracker.add_usage during the LLM call running in this context
+_llm_usage_sink: contextvars.ContextVar[list[dict] | None] = contextvars.ContextVar(
+    "llm_usage_sink", default=None
+)
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at per_minute / 60 per second"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float) -> float:
+        """Seconds until amount can be taken while leaving reserve in the bucket"""
+        self._refill()
+        # A single request larger than the bucket waits for a full bucket
+        needed = min(amount + reserve, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+
+class LLMRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one LLM binding
+
+    The token cost of a call is estimated from its prompt, system prompt and
+    history with the configured tokenizer, plus `max_tokens` when given. Once
+    the call finishes, the estimate is replaced by the usage reported through a
+    TokenTracker, if the binding was given one. Calls with a priority above
+    query_priority (extraction, summaries) must leave query_reserve of each
+    bucket untouched, so queries keep headroom during heavy indexing.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        tokenizer: Tokenizer | None = None,
+        query_reserve: float = 0.1,
+        query_priority: int = 5,
+        name: str = "rate_limit",
+    ):
+        self.rpm = (
+            _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self.tpm = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.tokenizer = tokenizer
+        self.query_reserve = min(max(query_reserve, 0.0), 1.0)
+        self.query_priority = query_priority
+        self.name = name
+        self._lock = asyncio.Lock()
+
+    def estimate_tokens(self, args: tuple, kwargs: dict) -> int:
+        """Estimate the tokens a call to an LLM binding will be billed for"""
+        if self.tpm is None:
+            return 0
+        parts = [args[0] if args else kwargs.get("prompt"), kwargs.get("system_prompt")]
+        for message in kwargs.get("history_messages") or []:
+            if isinstance(message, dict):
+                parts.append(message.get("content"))
+        parts = [part for part in parts if isinstance(part, str)]
+        if self.tokenizer is not None:
+            # Count per part so shared system prompts and history hit the count LRU
+            tokens = sum(self.tokenizer.count_tokens_batch(parts))
+        else:
+            tokens = len("\n".join(parts)) // 4  # Rough chars-per-token fallback
+        max_tokens = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens")
+        if isinstance(max_tokens, int):
+            tokens += max_tokens
+        return tokens
+
+    async def acquire(self, tokens: int, priority: int) -> None:
+        """Wait until the buckets allow one request costing tokens"""
+        reserve = 0.0 if priority <= self.query_priority else self.query_reserve
+        waited = 0.0
+        while True:
+            async with self._lock:
+                wait = 0.0
+                if self.rpm is not None:
+                    wait = self.rpm.wait_time(1, reserve * self.rpm.capacity)
+                if self.tpm is not None:
+                    wait = max(
+                        wait,
+                        self.tpm.wait_time(tokens, reserve * self.tpm.capacity),
+                    )
+                if wait <= 0:
+                    if self.rpm is not None:
+                        self.rpm.consume(1)
+                    if self.tpm is not None:
+                        self.tpm.consume(tokens)
+                    if waited > 0:
+                        logger.debug(
+                            f"{self.name}: waited {waited:.1f}s for rate limit ({tokens} tokens, priority {priority})"
+                        )
+                    return
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def reconcile(self, estimated: int, usage: list[dict]) -> None:
+        """Correct the token bucket with the usage reported for a finished call"""
+        if self.tpm is None or not usage:
+            return
+        actual = sum(
+            counts.get(
+                "total_tokens",
+                counts.get("prompt_tokens", 0) + counts.get("completion_tokens", 0),
+            )
+            for counts in usage
+        )
+        self.tpm.consume(actual - estimated)
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -441,6 +982,8 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+    rate_limiter: LLMRateLimiter | None = None,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -459,6 +1002,9 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        concurrency_limiter: Optional adaptive limiter; when set, max(max_size, limiter.max_limit)
+            workers are started and the limiter decides how many of them may call func at a time
+        rate_limiter: Optional RPM/TPM limiter; callers wait for budget before entering the queue
 
     Returns:
         Decorator function
@@ -481,6 +1027,11 @@ def priority_limit_async_func_call(
                     llm_timeout * 2 + 15
                 )  # Reserved timeout buffer for health check phase
 
+        worker_count = (
+            max(max_size, concurrency_limiter.max_limit)
+            if concurrency_limiter is not None
+            else max_size
+        )
         queue = asyncio.PriorityQueue(maxsize=max_queue_size)
         tasks = set()
         initialization_lock = asyncio.Lock()
@@ -500,83 +1051,111 @@ def priority_limit_async_func_call(
             try:
                 while not shutdown_event.is_set():
                     try:
-                        # Get task from queue with timeout for shutdown checking
+                        # Take a call slot before dequeuing so priority order is kept
+                        if concurrency_limiter is not None:
+                            await concurrency_limiter.acquire()
+                        call_latency = None
+                        call_error = None
                         try:
-                            (
-                                priority,
-                                count,
-                                task_id,
-                                args,
-                                kwargs,
-                            ) = await asyncio.wait_for(queue.get(), timeout=1.0)
-                        except asyncio.TimeoutError:
-                            continue
-
-                        # Get task state and mark worker as started
-                        async with task_states_lock:
-                            if task_id not in task_states:
-                                queue.task_done()
+                            # Get task from queue with timeout for shutdown checking
+                            try:
+                                (
+                                    priority,
+                                    count,
+                                    task_id,
+                                    args,
+                                    kwargs,
+                                ) = await asyncio.wait_for(queue.get(), timeout=1.0)
+                            except asyncio.TimeoutError:
                                 continue
-                            task_state = task_states[task_id]
-                            task_state.worker_started = True
-                            # Record execution start time when worker actually begins processing
-                            task_state.execution_start_time = (
-                                asyncio.get_event_loop().time()
-                            )
 
-                        # Check if task was cancelled before worker started
-                        if (
-                            task_state.cancellation_requested
-                            or task_state.future.cancelled()
-                        ):
+                            # Get task state and mark worker as started
                             async with task_states_lock:
-                                task_states.pop(task_id, None)
-                            queue.task_done()
-                            continue
-
-                        try:
-                            # Execute function with timeout protection
-                            if max_execution_timeout is not None:
-                                result = await asyncio.wait_for(
-                                    func(*args, **kwargs), timeout=max_execution_timeout
+                                if task_id not in task_states:
+                                    queue.task_done()
+                                    continue
+                                task_state = task_states[task_id]
+                                task_state.worker_started = True
+                                # Record execution start time when worker actually begins processing
+                                task_state.execution_start_time = (
+                                    asyncio.get_event_loop().time()
                                 )
-                            else:
-                                result = await func(*args, **kwargs)
 
-                            # Set result if future is still valid
-                            if not task_state.future.done():
-                                task_state.future.set_result(result)
+                            # Check if task was cancelled before worker started
+                            if (
+                                task_state.cancellation_requested
+                                or task_state.future.cancelled()
+                            ):
+                                async with task_states_lock:
+                                    task_states.pop(task_id, None)
+                                queue.task_done()
+                                continue
 
-                        except asyncio.TimeoutError:
-                            # Worker-level timeout (max_execution_timeout exceeded)
-                            logger.warning(
-                                f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
+                            call_start = time.monotonic()
+                            usage_sink = (
+                                _llm_usage_sink.set([])
+                                if rate_limiter is not None
+                                else None
                             )
-                            if not task_state.future.done():
-                                task_state.future.set_exception(
-                                    WorkerTimeoutError(
-                                        max_execution_timeout, "execution"
+                            try:
+                                # Execute function with timeout protection
+                                if max_execution_timeout is not None:
+                                    result = await asyncio.wait_for(
+                                        func(*args, **kwargs),
+                                        timeout=max_execution_timeout,
                                     )
+                                else:
+                                    result = await func(*args, **kwargs)
+                                call_latency = time.monotonic() - call_start
+
+                                # Set result if future is still valid
+                                if not task_state.future.done():
+                                    task_state.future.set_result(result)
+
+                            except asyncio.TimeoutError:
+                                # Worker-level timeout (max_execution_timeout exceeded)
+                                logger.warning(
+                                    f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                                 )
-                        except asyncio.CancelledError:
-                            # Task was cancelled during execution
-                            if not task_state.future.done():
-                                task_state.future.cancel()
-                            logger.debug(
-                                f"{queue_name}: Task {task_id} cancelled during execution"
-                            )
-                        except Exception as e:
-                            # Function execution error
-                            logger.error(
-                                f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
-                            )
-                            if not task_state.future.done():
-                                task_state.future.set_exception(e)
+                                call_latency = time.monotonic() - call_start
+                                call_error = WorkerTimeoutError(
+                                    max_execution_timeout, "execution"
+                                )
+                                if not task_state.future.done():
+                                    task_state.future.set_exception(call_error)
+                            except asyncio.CancelledError:
+                                # Task was cancelled during execution
+                                if not task_state.future.done():
+                                    task_state.future.cancel()
+                                logger.debug(
+                                    f"{queue_name}: Task {task_id} cancelled during execution"
+                                )
+                            except Exception as e:
+                                # Function execution error
+                                logger.error(
+                                    f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
+                                )
+                                call_latency = time.monotonic() - call_start
+                                call_error = e
+                                if not task_state.future.done():
+                                    task_state.future.set_exception(e)
+                            finally:
+                                if usage_sink is not None:
+                                    rate_limiter.reconcile(
+                                        task_state.token_estimate,
+                                        _llm_usage_sink.get(),
+                                    )
+                                    _llm_usage_sink.reset(usage_sink)
+                                # Clean up task state
+                                async with task_states_lock:
+                                    task_states.pop(task_id, None)
+                                queue.task_done()
+
                         finally:
-                            # Clean up task state
-                            async with task_states_lock:
-                                task_states.pop(task_id, None)
-                            queue.task_done()
+                            if concurrency_limiter is not None:
+                                await concurrency_limiter.release(
+                                    call_latency, call_error
+                                )
 
                     except Exception as e:
                         # Critical error in worker loop
@@ -638,7 +1217,7 @@ def priority_limit_async_func_call(
                     tasks.difference_update(done_tasks)
 
                     active_tasks_count = len(tasks)
-                    workers_needed = max_size - active_tasks_count
+                    workers_needed = worker_count - active_tasks_count
 
                     if workers_needed > 0:
                         logger.info(
@@ -688,7 +1267,7 @@ def priority_limit_async_func_call(
                     )
 
                 # Create worker tasks
-                workers_needed = max_size - active_tasks_count
+                workers_needed = worker_count - active_tasks_count
                 for _ in range(workers_needed):
                     task = asyncio.create_task(worker())
                     tasks.add(task)
@@ -805,6 +1384,13 @@ def priority_limit_async_func_call(
                     current_count = counter
                     counter += 1
 
+                # Wait for RPM/TPM budget before taking a place in the queue
+                if rate_limiter is not None:
+                    task_state.token_estimate = rate_limiter.estimate_tokens(
+                        args, {**(getattr(func, "keywords", None) or {}), **kwargs}
+                    )
+                    await rate_limiter.acquire(task_state.token_estimate, _priority)
+
                 # Queue the task with timeout handling
                 try:
                     if _queue_timeout is not None:
@@ -919,16 +1505,41 @@ class Tokenizer:
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
     """
 
-    def __init__(self, model_name: str, tokenizer: TokenizerInterface):
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: TokenizerInterface,
+        count_cache_size: int = DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    ):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
 
         Args:
             model_name: The associated model name for the tokenizer.
             tokenizer: An instance of a class implementing the TokenizerInterface.
+            count_cache_size: Maximum number of token counts kept in the LRU used by
+                `count_tokens`, 0 disables the cache.
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        self.count_cache_size = count_cache_size
+        self._count_cache: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._count_cache_lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # dataclasses.asdict(LightRAG) deep-copies fields for every global_config;
+        # share the tokenizer so its token count cache stays warm across queries
+        return self
+
+    def __getstate__(self):
+        # Locks cannot be pickled
+        state = self.__dict__.copy()
+        state.pop("_count_cache_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._count_cache_lock = threading.Lock()
 
     def encode(self, content: str) -> List[int]:
         """
@@ -954,6 +1565,82 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def encode_batch(self, contents: list[str]) -> list[list[int]]:
+        """
+        Encodes a list of strings, one token list per string.
+
+        Args:
+            contents: The strings to encode.
+
+        Returns:
+            A list of integer token lists in the order of contents.
+        """
+        return [self.encode(content) for content in contents]
+
+    def count_tokens(self, content: str) -> int:
+        """
+        Returns the number of tokens in a string.
+
+        Counts are kept in a bounded LRU keyed by the string's length and hash,
+        so strings seen again (entity and relation lines, descriptions, prompt
+        templates) are not re-encoded.
+
+        Args:
+            content: The string to measure.
+
+        Returns:
+            The number of tokens.
+        """
+        return self.count_tokens_batch([content])[0]
+
+    def count_tokens_batch(self, contents: list[str]) -> list[int]:
+        """
+        Returns the number of tokens of each string, encoding cache misses with
+        `encode_batch`.
+
+        Args:
+            contents: The strings to measure.
+
+        Returns:
+            A list of token counts in the order of contents.
+        """
+        if self.count_cache_size <= 0:
+            return [len(tokens) for tokens in self.encode_batch(contents)]
+
+        keys = [(len(content), hash(content)) for content in contents]
+        counts: list[int | None] = [None] * len(contents)
+        with self._count_cache_lock:
+            for i, key in enumerate(keys):
+                count = self._count_cache.get(key)
+                if count is not None:
+                    self._count_cache.move_to_end(key)
+                    counts[i] = count
+
+        missing = {}
+        for i, key in enumerate(keys):
+            if counts[i] is None and key not in missing:
+                missing[key] = contents[i]
+        if not missing:
+            return counts
+
+        computed = dict(
+            zip(
+                missing.keys(),
+                (len(tokens) for tokens in self.encode_batch(list(missing.values()))),
+            )
+        )
+        with self._count_cache_lock:
+            for key, count in computed.items():
+                self._count_cache[key] = count
+                self._count_cache.move_to_end(key)
+            while len(self._count_cache) > self.count_cache_size:
+                self._count_cache.popitem(last=False)
+
+        return [
+            count if count is not None else computed[key]
+            for count, key in zip(counts, keys)
+        ]
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -984,6 +1671,20 @@ class TiktokenTokenizer(Tokenizer):
         except KeyError:
             raise ValueError(f"Invalid model_name: {model_name}.")
 
+    def encode_batch(self, contents: list[str]) -> list[list[int]]:
+        """
+        Encodes a list of strings with tiktoken's native multi-threaded batch encoder.
+
+        Args:
+            contents: The strings to encode.
+
+        Returns:
+            A list of integer token lists in the order of contents.
+        """
+        if len(contents) < 2:
+            return [self.encode(content) for content in contents]
+        return self.tokenizer.encode_batch(contents)
+
 
 def pack_user_ass_to_openai_messages(*args: str):
     roles = ["user", "assistant"]
@@ -1015,10 +1716,16 @@ def truncate_list_by_token_size(
     if max_token_size <= 0:
         return []
     tokens = 0
-    for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
-        if tokens > max_token_size:
-            return list_data[:i]
+    # Count in windows so the batch encoder is used without encoding far past the cut
+    window = 64
+    for start in range(0, len(list_data), window):
+        counts = tokenizer.count_tokens_batch(
+            [key(data) for data in list_data[start : start + window]]
+        )
+        for offset, count in enumerate(counts):
+            tokens += count
+            if tokens > max_token_size:
+                return list_data[: start + offset]
     return list_data
 
 
@@ -1074,6 +1781,8 @@ class CacheData:
     cache_type: str = "query"
     chunk_id: str | None = None
     queryparam: dict | None = None
+    query_embedding: np.ndarray | None = None  # Stored for the semantic query cache
+    param_hash: str | None = None  # Query parameters the semantic cache matches on
 
 
 async def save_to_cache(hashing_kv, cache_data: CacheData):
@@ -1115,6 +1824,9 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
         if cache_data.queryparam is not None
         else None,
     }
+    if cache_data.query_embedding is not None:
+        cache_entry["query_embedding"] = encode_vector(cache_data.query_embedding)
+        cache_entry["param_hash"] = cache_data.param_hash
 
     logger.info(f" == LLM cache == saving: {flattened_key}")
 
@@ -1122,6 +1834,244 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     await hashing_kv.upsert({flattened_key: cache_entry})
 
 
+def encode_vector(vector) -> str:
+    """Encode a vector as base64 float32 bytes for KV storage"""
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode(
+        "ascii"
+    )
+
+
+def decode_vector(data: str) -> np.ndarray:
+    """Decode a vector stored with encode_vector"""
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class SemanticQueryCache:
+    """Query response cache matched on query embedding similarity
+
+    Responses live in the LLM response cache together with their query embedding
+    (see `save_to_cache`). This class keeps the embeddings in memory, grouped by
+    a hash of the query parameters, and finds the most similar earlier query so
+    paraphrased questions with the same mode and parameters reuse its answer.
+    Entries expire after ttl seconds and the least recently used ones are
+    evicted beyond max_entries. Storages that can page through their query
+    cache entries (`get_cache_page`) are scanned once in the background to
+    restore the index after a restart; other storages start empty.
+    """
+
+    def __init__(
+        self,
+        kv_storage,
+        similarity_threshold: float = 0.95,
+        ttl: float = 0,
+        max_entries: int = 10000,
+    ):
+        self.kv_storage = kv_storage
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # cache key -> (param hash, unit vector, create time)
+        self._entries: OrderedDict[str, tuple[str, np.ndarray, float]] = OrderedDict()
+        # param hash -> (cache keys, stacked vectors), rebuilt when entries change
+        self._matrices: dict[str, tuple[list[str], np.ndarray]] = {}
+        self._load_task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray | None:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    def _expired(self, create_time: float, now: float) -> bool:
+        return self.ttl > 0 and now - create_time > self.ttl
+
+    def _remember(self, key: str, param_hash: str, vector, create_time: float) -> None:
+        vector = self._normalize(vector)
+        if vector is None or self.max_entries <= 0:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._matrices.pop(previous[0], None)
+        self._entries[key] = (param_hash, vector, create_time)
+        self._matrices.pop(param_hash, None)
+        while len(self._entries) > self.max_entries:
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._matrices.pop(entry[0], None)
+
+    def warm_up(self) -> None:
+        """Start restoring the index from the storage once, without waiting for it"""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._restore())
+
+    async def _restore(self) -> None:
+        if not hasattr(self.kv_storage, "get_cache_page"):
+            return
+        restored = 0
+        cursor = None
+        try:
+            while True:
+                records, cursor = await self.kv_storage.get_cache_page(
+                    "query", cursor, DEFAULT_SEMANTIC_CACHE_LOAD_PAGE_SIZE
+                )
+                now = time.time()
+                for key, record in records.items():
+                    # Entries stored since start-up are newer than the stored ones
+                    if (
+                        key in self._entries
+                        or not record.get("query_embedding")
+                        or not record.get("param_hash")
+                    ):
+                        continue
+                    create_time = record.get("create_time", 0)
+                    if not self._expired(create_time, now):
+                        self._remember(
+                            key,
+                            record["param_hash"],
+                            decode_vector(record["query_embedding"]),
+                            create_time,
+                        )
+                        restored += 1
+                if cursor is None:
+                    break
+        except Exception as e:
+            logger.warning(f"Semantic query cache warm-up failed: {e}")
+        if restored:
+            logger.info(f"Semantic query cache restored {restored} entries")
+
+    def _nearest(self, param_hash: str, vector: np.ndarray) -> tuple[str, float]:
+        matrix = self._matrices.get(param_hash)
+        if matrix is None:
+            keys = [
+                key for key, entry in self._entries.items() if entry[0] == param_hash
+            ]
+            if not keys:
+                return None, 0.0
+            matrix = (keys, np.stack([self._entries[key][1] for key in keys]))
+            self._matrices[param_hash] = matrix
+        keys, vectors = matrix
+        scores = vectors @ vector
+        best = int(np.argmax(scores))
+        return keys[best], float(scores[best])
+
+    async def lookup(self, param_hash: str, query_embedding) -> str | None:
+        """Return the cached response of the most similar earlier query, if any
+
+        Args:
+            param_hash: Hash of the query parameters that must match exactly
+            query_embedding: Embedding of the current query
+
+        Returns:
+            The cached response, or None when no earlier query is similar enough
+        """
+        self.warm_up()
+        vector = self._normalize(query_embedding)
+        if vector is None:
+            return None
+
+        now = time.time()
+        while True:
+            key, score = self._nearest(param_hash, vector)
+            if key is None or score < self.similarity_threshold:
+                self.misses += 1
+                return None
+            if self._expired(self._entries[key][2], now):
+                self._forget(key)
+                continue
+            record = await self.kv_storage.get_by_id(key)
+            if not record or not record.get("return"):
+                # The response was cleared from the LLM cache
+                self._forget(key)
+                continue
+            self._entries.move_to_end(key)
+            self.hits += 1
+            logger.info(f"Semantic query cache hit (similarity {score:.3f}, key:{key})")
+            return record["return"]
+
+    async def store(self, key: str, param_hash: str, query_embedding) -> None:
+        """Index a response saved in the LLM cache under key"""
+        self.warm_up()
+        self._remember(key, param_hash, query_embedding, time.time())
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._matrices.clear()
+
+
+class RetrievalCache:
+    """Short-lived in-memory cache of knowledge graph retrieval results
+
+    Keeps the entities and relations found for a keyword set, and the chunks
+    selected for them, so repeated keyword sets skip the keyword embedding,
+    vector search, graph traversal and chunk lookups.
+    Values are tuples of lists of dicts and are copied on the way in and out,
+    so callers may mutate what they get. Entries expire after ttl seconds, the
+    least recently used ones are evicted beyond max_entries, and the whole
+    cache is dropped as soon as one of the watched storage update flags is set.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (value, create time)
+        self._entries: OrderedDict[tuple, tuple[tuple, float]] = OrderedDict()
+        self._update_flags: list = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _copy(value: tuple) -> tuple:
+        return tuple([dict(item) for item in part] for part in value)
+
+    def watch(self, update_flags: list) -> None:
+        """Invalidate the cache whenever one of these update flags gets set
+
+        Flags come from `get_update_flag`; each one is private to this cache and
+        is reset once the change has been seen.
+        """
+        self._update_flags.extend(update_flags)
+
+    def _check_updates(self) -> None:
+        stale = False
+        for flag in self._update_flags:
+            if flag.value:
+                flag.value = False
+                stale = True
+        if stale:
+            self.clear()
+
+    def get(self, key: tuple) -> tuple | None:
+        self._check_updates()
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[1] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._copy(entry[0])
+
+    def put(self, key: tuple, value: tuple) -> None:
+        if self.max_entries <= 0:
+            return
+        self._check_updates()
+        self._entries[key] = (self._copy(value), time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        if self._entries:
+            logger.debug(f"Retrieval cache cleared ({len(self._entries)} entries)")
+        self._entries.clear()
+
+
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
     unicode_escape_pattern = re.compile(r"\\u([0-9a-fA-F]{4})")
@@ -1183,7 +2133,8 @@ async def aexport_data(
     output_path: str,
     file_format: str = "csv",
     include_vector_data: bool = False,
-) -> None:
+    batch_size: int = 1000,
+) -> dict[str, int] | None:
     """
     Asynchronously exports all entities, relations, and relationships to various formats.
 
@@ -1192,13 +2143,30 @@ async def aexport_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
+        file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
             - csv: Comma-separated values file
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
+            - jsonl: Streamed JSON lines, see `astream_export_data`
+            - parquet: Streamed Parquet files, see `astream_export_data`
         include_vector_data: Whether to include data from the vector database.
+        batch_size: Records per batch for the streamed formats.
+
+    Returns:
+        Number of exported entities and relations for the streamed formats, else None.
     """
+    if file_format in STREAM_EXPORT_FORMATS:
+        return await astream_export_data(
+            chunk_entity_relation_graph,
+            entities_vdb,
+            relationships_vdb,
+            output_path,
+            file_format,
+            include_vector_data,
+            batch_size,
+        )
+
     # Collect data
     entities_data = []
     relations_data = []
@@ -1480,6 +2448,546 @@ async def aexport_data(
         print("Data displayed as table format")
 
 
+STREAM_EXPORT_FORMATS = ("jsonl", "parquet")
+# Graph properties exported as their own columns, the rest goes to "properties"
+_EXPORT_ENTITY_FIELDS = (
+    "entity_type",
+    "description",
+    "source_id",
+    "file_path",
+    "created_at",
+)
+_EXPORT_RELATION_FIELDS = (
+    "keywords",
+    "description",
+    "weight",
+    "source_id",
+    "file_path",
+    "created_at",
+)
+
+
+def _export_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _export_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _export_row(
+    record: dict, key_fields: dict[str, Any], fields: tuple, skip: set
+) -> dict:
+    row = dict(key_fields)
+    for name in fields:
+        row[name] = record.get(name)
+    row["created_at"] = _export_int(row.get("created_at"))
+    if "weight" in row:
+        row["weight"] = _export_float(row["weight"])
+    row["properties"] = {
+        key: value
+        for key, value in record.items()
+        if key not in fields and key not in skip
+    }
+    return row
+
+
+class _JsonlExportWriter:
+    """Appends entity and relation rows to one JSON lines file, tagged by type"""
+
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", encoding="utf-8")
+
+    def write(self, kind: str, rows: list[dict]) -> None:
+        self._file.writelines(
+            json.dumps({"type": kind, **row}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetExportWriter:
+    """Writes entity and relation rows to <output>_entities/_relations.parquet
+
+    Each batch becomes a row group, so memory stays bounded by the batch size.
+    Vectors are stored as fixed size float32 lists of the embedding dimension.
+    """
+
+    def __init__(self, output_path: str, vector_dim: int | None):
+        import pipmaster as pm
+
+        if not pm.is_installed("pyarrow"):
+            pm.install("pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        root, _ = os.path.splitext(output_path)
+        self.paths = {
+            "entity": f"{root}_entities.parquet",
+            "relation": f"{root}_relations.parquet",
+        }
+        common = [
+            pa.field("description", pa.string()),
+            pa.field("source_id", pa.string()),
+            pa.field("file_path", pa.string()),
+            pa.field("created_at", pa.int64()),
+            pa.field("properties", pa.string()),
+        ]
+        vector = (
+            [pa.field("vector", pa.list_(pa.float32(), vector_dim))]
+            if vector_dim
+            else []
+        )
+        self._schemas = {
+            "entity": pa.schema(
+                [
+                    pa.field("entity_name", pa.string()),
+                    pa.field("entity_type", pa.string()),
+                    *common,
+                    *vector,
+                ]
+            ),
+            "relation": pa.schema(
+                [
+                    pa.field("src_id", pa.string()),
+                    pa.field("tgt_id", pa.string()),
+                    pa.field("keywords", pa.string()),
+                    pa.field("weight", pa.float64()),
+                    *common,
+                    *vector,
+                ]
+            ),
+        }
+        self._writers = {}
+
+    def write(self, kind: str, rows: list[dict]) -> None:
+        schema = self._schemas[kind]
+        columns = {name: [row.get(name) for row in rows] for name in schema.names}
+        columns["properties"] = [
+            json.dumps(row["properties"], ensure_ascii=False, default=str)
+            for row in rows
+        ]
+        for name in ("entity_name", "entity_type", "src_id", "tgt_id", "keywords"):
+            if name in columns:
+                columns[name] = [
+                    None if value is None else str(value) for value in columns[name]
+                ]
+        for name in ("description", "source_id", "file_path"):
+            columns[name] = [
+                None if value is None else str(value) for value in columns[name]
+            ]
+        table = self._pa.Table.from_pydict(columns, schema=schema)
+        if kind not in self._writers:
+            self._writers[kind] = self._pq.ParquetWriter(self.paths[kind], schema)
+        self._writers[kind].write_table(table)
+
+    def close(self) -> None:
+        for kind, schema in self._schemas.items():
+            if kind not in self._writers:
+                # Write an empty file so both outputs always exist
+                self._writers[kind] = self._pq.ParquetWriter(self.paths[kind], schema)
+            self._writers[kind].close()
+
+
+def _drain_batches(items: list, batch_size: int):
+    """Yield batches of items, removing them from the list as they are handed out"""
+    items.reverse()
+    while items:
+        yield [items.pop() for _ in range(min(batch_size, len(items)))]
+
+
+async def _export_vectors(
+    vdb, ids: list[str], reverse_ids: list[str] | None = None
+) -> list[list[float] | None]:
+    """Look up the vectors of one batch, falling back to reverse relation IDs"""
+    lookup = list(ids) + (reverse_ids or [])
+    try:
+        vectors = await vdb.get_vectors_by_ids(lookup)
+    except Exception as e:
+        logger.warning(f"Failed to export vectors from {vdb.namespace}: {e}")
+        return [None] * len(ids)
+    result = []
+    for i, vdb_id in enumerate(ids):
+        vector = vectors.get(vdb_id)
+        if vector is None and reverse_ids:
+            vector = vectors.get(reverse_ids[i])
+        result.append(
+            np.asarray(vector, dtype=np.float32).tolist()
+            if vector is not None
+            else None
+        )
+    return result
+
+
+async def astream_export_data(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    output_path: str,
+    file_format: str = "jsonl",
+    include_vector_data: bool = False,
+    batch_size: int = 1000,
+) -> dict[str, int]:
+    """Stream all entities and relations of the knowledge graph to JSONL or Parquet
+
+    Nodes and edges are read with one `get_all_nodes` / `get_all_edges` call each
+    and written in batches of batch_size records; with include_vector_data each
+    batch fetches its vectors with one `get_vectors_by_ids` call. Output rows are
+    built per batch and written immediately, so memory apart from the storage's
+    own node and edge lists is bounded by the batch size.
+
+    - jsonl: one file at output_path, one JSON object per line with "type" set to
+      "entity" or "relation"
+    - parquet: <output>_entities.parquet and <output>_relations.parquet, vectors as
+      fixed size float32 lists of the embedding dimension
+
+    Returns:
+        Number of exported entities and relations
+    """
+    if file_format == "jsonl":
+        writer = _JsonlExportWriter(output_path)
+    elif file_format == "parquet":
+        vector_dim = None
+        if include_vector_data and entities_vdb is not None:
+            vector_dim = entities_vdb.embedding_func.embedding_dim
+        writer = _ParquetExportWriter(output_path, vector_dim)
+    else:
+        raise ValueError(
+            f"Unsupported stream export format: {file_format}. "
+            f"Supported formats: {', '.join(STREAM_EXPORT_FORMATS)}"
+        )
+    batch_size = max(1, batch_size)
+    counts = {"entities": 0, "relations": 0}
+
+    try:
+        # --- Entities ---
+        nodes = await chunk_entity_relation_graph.get_all_nodes()
+        for batch in _drain_batches(nodes, batch_size):
+            rows = []
+            for node in batch:
+                entity_name = node.get("entity_id") or node.get("id")
+                if entity_name:
+                    rows.append(
+                        _export_row(
+                            node,
+                            {"entity_name": entity_name},
+                            _EXPORT_ENTITY_FIELDS,
+                            {"id", "entity_id"},
+                        )
+                    )
+            if include_vector_data:
+                vectors = await _export_vectors(
+                    entities_vdb,
+                    [
+                        compute_mdhash_id(row["entity_name"], prefix="ent-")
+                        for row in rows
+                    ],
+                )
+                for row, vector in zip(rows, vectors):
+                    row["vector"] = vector
+            writer.write("entity", rows)
+            counts["entities"] += len(rows)
+
+        # --- Relations ---
+        edges = await chunk_entity_relation_graph.get_all_edges()
+        # Some storages return both directions of an undirected edge
+        seen_pairs = set()
+        for batch in _drain_batches(edges, batch_size):
+            rows = []
+            for edge in batch:
+                src, tgt = edge.get("source"), edge.get("target")
+                if not src or not tgt:
+                    continue
+                pair = (src, tgt) if src <= tgt else (tgt, src)
+                if pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+                rows.append(
+                    _export_row(
+                        edge,
+                        {"src_id": src, "tgt_id": tgt},
+                        _EXPORT_RELATION_FIELDS,
+                        {"source", "target", "src_id", "tgt_id"},
+                    )
+                )
+            if include_vector_data:
+                vectors = await _export_vectors(
+                    relationships_vdb,
+                    [
+                        compute_mdhash_id(row["src_id"] + row["tgt_id"], prefix="rel-")
+                        for row in rows
+                    ],
+                    [
+                        compute_mdhash_id(row["tgt_id"] + row["src_id"], prefix="rel-")
+                        for row in rows
+                    ],
+                )
+                for row, vector in zip(rows, vectors):
+                    row["vector"] = vector
+            writer.write("relation", rows)
+            counts["relations"] += len(rows)
+    finally:
+        writer.close()
+
+    logger.info(
+        f"Exported {counts['entities']} entities and {counts['relations']} relations as {file_format}"
+    )
+    return counts
+
+
+def _import_properties(row: dict) -> dict:
+    properties = row.get("properties") or {}
+    if isinstance(properties, str):
+        properties = json.loads(properties) if properties else {}
+    return properties
+
+
+def _iter_jsonl_import(input_path: str):
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                yield row.pop("type", None), row
+
+
+def _iter_parquet_import(input_path: str, batch_size: int):
+    import pipmaster as pm
+
+    if not pm.is_installed("pyarrow"):
+        pm.install("pyarrow")
+    import pyarrow.parquet as pq
+
+    root, _ = os.path.splitext(input_path)
+    for kind, suffix in (
+        ("entity", "entities"),
+        ("relation", "relations"),
+        ("chunk", "chunks"),
+    ):
+        path = f"{root}_{suffix}.parquet"
+        if not os.path.exists(path):
+            continue
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            for row in record_batch.to_pylist():
+                yield kind, row
+
+
+async def astream_import_data(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    chunks_vdb,
+    text_chunks,
+    input_path: str,
+    file_format: str = "jsonl",
+    batch_size: int = 1000,
+    tokenizer=None,
+) -> dict[str, int]:
+    """Bulk load entities, relations and chunks from a JSONL or Parquet stream
+
+    Reads the layout written by `astream_export_data`, plus optional chunk rows
+    ("type": "chunk" lines, or <input>_chunks.parquet with content, chunk_id,
+    full_doc_id, file_path, chunk_order_index and tokens). Records are buffered
+    per kind and flushed every batch_size rows: graph writes go through
+    `upsert_nodes_batch` / `upsert_edges_batch` and each vector storage gets one
+    upsert per batch, so embeddings are computed in large batches.
+
+    Imported records overwrite existing ones with the same name; descriptions
+    and source IDs are taken verbatim rather than merged. Relation endpoints
+    that are neither imported nor already in the graph are created as UNKNOWN
+    placeholder nodes, as `ainsert_custom_kg` does. Exported vectors are not
+    reused; vector storages embed content on upsert.
+
+    Returns:
+        Number of imported entities, relations and chunks
+    """
+    if file_format == "jsonl":
+        rows = _iter_jsonl_import(input_path)
+    elif file_format == "parquet":
+        rows = _iter_parquet_import(input_path, max(1, batch_size))
+    else:
+        raise ValueError(
+            f"Unsupported stream import format: {file_format}. "
+            f"Supported formats: {', '.join(STREAM_EXPORT_FORMATS)}"
+        )
+    batch_size = max(1, batch_size)
+    counts = {"entities": 0, "relations": 0, "chunks": 0}
+    buffers: dict[str, list[dict]] = {"entity": [], "relation": [], "chunk": []}
+    # Names known to exist in the graph, so endpoints are checked only once
+    known_nodes: set[str] = set()
+
+    async def flush_entities() -> None:
+        batch = buffers["entity"]
+        buffers["entity"] = []
+        if not batch:
+            return
+        now = int(time.time())
+        nodes = []
+        vdb_data = {}
+        for row in batch:
+            name = row.get("entity_name") or row.get("entity_id")
+            if not name:
+                continue
+            node_data = _import_properties(row)
+            node_data.update(
+                {
+                    "entity_id": name,
+                    "entity_type": row.get("entity_type") or "UNKNOWN",
+                    "description": row.get("description") or "",
+                    "source_id": row.get("source_id") or "",
+                    "file_path": row.get("file_path") or "custom_kg",
+                    "created_at": _export_int(row.get("created_at")) or now,
+                }
+            )
+            nodes.append((name, node_data))
+            vdb_data[compute_mdhash_id(name, prefix="ent-")] = {
+                "content": name + "\n" + node_data["description"],
+                "entity_name": name,
+                "source_id": node_data["source_id"],
+                "description": node_data["description"],
+                "entity_type": node_data["entity_type"],
+                "file_path": node_data["file_path"],
+            }
+        await asyncio.gather(
+            chunk_entity_relation_graph.upsert_nodes_batch(nodes),
+            entities_vdb.upsert(vdb_data),
+        )
+        known_nodes.update(name for name, _ in nodes)
+        counts["entities"] += len(nodes)
+
+    async def flush_relations() -> None:
+        # Endpoints may be in the pending entity buffer
+        await flush_entities()
+        batch = buffers["relation"]
+        buffers["relation"] = []
+        if not batch:
+            return
+        now = int(time.time())
+        edges = []
+        vdb_data = {}
+        for row in batch:
+            src, tgt = row.get("src_id"), row.get("tgt_id")
+            if not src or not tgt:
+                continue
+            weight = _export_float(row.get("weight"))
+            edge_data = _import_properties(row)
+            edge_data.update(
+                {
+                    "weight": 1.0 if weight is None else weight,
+                    "description": row.get("description") or "",
+                    "keywords": row.get("keywords") or "",
+                    "source_id": row.get("source_id") or "",
+                    "file_path": row.get("file_path") or "custom_kg",
+                    "created_at": _export_int(row.get("created_at")) or now,
+                }
+            )
+            edges.append((src, tgt, edge_data))
+            vdb_data[compute_mdhash_id(src + tgt, prefix="rel-")] = {
+                "src_id": src,
+                "tgt_id": tgt,
+                "source_id": edge_data["source_id"],
+                "content": f"{edge_data['keywords']}\t{src}\n{tgt}\n{edge_data['description']}",
+                "keywords": edge_data["keywords"],
+                "description": edge_data["description"],
+                "weight": edge_data["weight"],
+                "file_path": edge_data["file_path"],
+            }
+
+        unknown = list(
+            {name for src, tgt, _ in edges for name in (src, tgt)} - known_nodes
+        )
+        if unknown:
+            existing = await chunk_entity_relation_graph.get_nodes_batch(unknown)
+            placeholders = [
+                (
+                    name,
+                    {
+                        "entity_id": name,
+                        "source_id": "",
+                        "description": "UNKNOWN",
+                        "entity_type": "UNKNOWN",
+                        "file_path": "custom_kg",
+                        "created_at": now,
+                    },
+                )
+                for name in unknown
+                if name not in existing
+            ]
+            if placeholders:
+                await chunk_entity_relation_graph.upsert_nodes_batch(placeholders)
+            known_nodes.update(unknown)
+
+        await asyncio.gather(
+            chunk_entity_relation_graph.upsert_edges_batch(edges),
+            relationships_vdb.upsert(vdb_data),
+        )
+        counts["relations"] += len(edges)
+
+    async def flush_chunks() -> None:
+        batch = buffers["chunk"]
+        buffers["chunk"] = []
+        if not batch:
+            return
+        if chunks_vdb is None or text_chunks is None:
+            raise ValueError("Chunk rows require chunks_vdb and text_chunks storages")
+        chunks_data = {}
+        for row in batch:
+            content = sanitize_text_for_encoding(row.get("content") or "")
+            if not content:
+                continue
+            chunk_id = row.get("chunk_id") or compute_mdhash_id(
+                content, prefix="chunk-"
+            )
+            tokens = _export_int(row.get("tokens"))
+            if tokens is None:
+                tokens = len(tokenizer.encode(content)) if tokenizer else 0
+            chunks_data[chunk_id] = {
+                "content": content,
+                "tokens": tokens,
+                "chunk_order_index": _export_int(row.get("chunk_order_index")) or 0,
+                "full_doc_id": row.get("full_doc_id") or chunk_id,
+                "file_path": row.get("file_path") or "custom_kg",
+                "llm_cache_list": [],
+            }
+        await asyncio.gather(
+            chunks_vdb.upsert(chunks_data),
+            text_chunks.upsert(chunks_data),
+        )
+        counts["chunks"] += len(chunks_data)
+
+    flushers = {
+        "entity": flush_entities,
+        "relation": flush_relations,
+        "chunk": flush_chunks,
+    }
+    for kind, row in rows:
+        if kind not in buffers:
+            logger.warning(f"Skipping import row of unknown type: {kind}")
+            continue
+        buffers[kind].append(row)
+        if len(buffers[kind]) >= batch_size:
+            await flushers[kind]()
+    await flush_entities()
+    await flush_relations()
+    await flush_chunks()
+
+    logger.info(
+        f"Imported {counts['entities']} entities, {counts['relations']} relations "
+        f"and {counts['chunks']} chunks from {file_format}"
+    )
+    return counts
+
+
 def export_data(
     chunk_entity_relation_graph,
     entities_vdb,
@@ -2253,6 +3761,11 @@ class TokenTracker:
 
         self.call_count += 1
 
+        # Let the LLM rate limiter reconcile its estimate for the running call
+        usage_sink = _llm_usage_sink.get()
+        if usage_sink is not None:
+            usage_sink.append(dict(token_counts))
+
     def get_usage(self):
         """Get current usage statistics."""
         return {
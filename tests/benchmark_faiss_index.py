@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Benchmark recall and latency of the FaissVectorDBStorage index types.
+
+Builds each index type (flat, hnsw, ivf_flat, ivf_pq) from the same synthetic
+clustered embeddings through FaissVectorDBStorage, then sweeps the query-time
+tunables (efSearch for HNSW, nprobe for IVF) and prints recall@k against the
+exact flat search together with per-query latency.
+
+Requires faiss-cpu (or faiss-gpu). No LLM or embedding service is needed.
+
+Usage:
+    python tests/benchmark_faiss_index.py --vectors 100000 --dim 768
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from ascii_colors import ASCIIColors
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark FaissVectorDBStorage index types"
+    )
+    parser.add_argument(
+        "--vectors", type=int, default=100000, help="Stored vectors (default: 100000)"
+    )
+    parser.add_argument(
+        "--dim", type=int, default=768, help="Embedding dimension (default: 768)"
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Queries per setting (default: 200)"
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=10, help="Neighbours per query (default: 10)"
+    )
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=200,
+        help="Gaussian clusters in the synthetic data (default: 200)",
+    )
+    return parser.parse_args()
+
+
+def make_embeddings(
+    centers: np.ndarray, count: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Clustered unit vectors, real embeddings are far from uniformly spread"""
+    labels = rng.integers(0, len(centers), count)
+    noise = rng.standard_normal((count, centers.shape[1])).astype(np.float32)
+    vectors = centers[labels] + 0.5 * noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+async def build_storage(index_type: str, vectors: np.ndarray, working_dir: str):
+    from lightrag.kg.faiss_impl import FaissVectorDBStorage
+    from lightrag.utils import EmbeddingFunc
+
+    async def lookup_embedding_func(texts: list[str]) -> np.ndarray:
+        # Contents are row numbers, so upserts store the precomputed vectors
+        return vectors[[int(text) for text in texts]]
+
+    storage = FaissVectorDBStorage(
+        namespace=f"benchmark_{index_type}",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 4096,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                "faiss_index_type": index_type,
+                # Train IVF on the full data set instead of the first 10k vectors
+                "faiss_ivf_train_threshold": len(vectors),
+            },
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=vectors.shape[1],
+            max_token_size=8192,
+            func=lookup_embedding_func,
+        ),
+        meta_fields=set(),
+    )
+    await storage.initialize()
+
+    start = time.perf_counter()
+    await storage.upsert({f"vec-{i}": {"content": str(i)} for i in range(len(vectors))})
+    return storage, time.perf_counter() - start
+
+
+async def measure(storage, queries: np.ndarray, truth: list[set], top_k: int):
+    hits = 0
+    latencies = []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = await storage.query("", top_k=top_k, query_embedding=query.tolist())
+        latencies.append(time.perf_counter() - start)
+        hits += len(expected & {result["id"] for result in results})
+    recall = hits / (len(queries) * top_k)
+    return recall, np.median(latencies) * 1000, np.percentile(latencies, 95) * 1000
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    from lightrag.kg.shared_storage import initialize_share_data
+
+    initialize_share_data()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((args.clusters, args.dim)).astype(np.float32)
+    data = make_embeddings(centers, args.vectors, rng)
+    queries = make_embeddings(centers, args.queries, rng)
+
+    ASCIIColors.cyan(
+        f"\n{args.vectors} vectors, dim {args.dim}, {args.queries} queries, top_k {args.top_k}"
+    )
+
+    sweeps = {
+        "flat": ("-", [None]),
+        "hnsw": ("efSearch", [16, 32, 64, 128, 256]),
+        "ivf_flat": ("nprobe", [1, 4, 16, 64]),
+        "ivf_pq": ("nprobe", [1, 4, 16, 64]),
+    }
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        truth = None
+        for index_type, (tunable, values) in sweeps.items():
+            storage, build_time = await build_storage(index_type, data, working_dir)
+            if truth is None:
+                # The flat index is exact, use it as ground truth
+                truth = [
+                    {
+                        result["id"]
+                        for result in await storage.query(
+                            "", top_k=args.top_k, query_embedding=query.tolist()
+                        )
+                    }
+                    for query in queries
+                ]
+
+            ASCIIColors.white(f"\n  {index_type:<9} build {build_time:8.2f}s")
+            for value in values:
+                if tunable == "efSearch":
+                    storage.hnsw_ef_search = value
+                elif tunable == "nprobe":
+                    storage.ivf_nprobe = value
+                recall, p50, p95 = await measure(storage, queries, truth, args.top_k)
+                label = f"{tunable}={value}" if value is not None else "exact"
+                ASCIIColors.white(
+                    f"    {label:<14} recall@{args.top_k} {recall:6.3f}   p50 {p50:7.2f}ms   p95 {p95:7.2f}ms"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark(parse_args()))
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""
+Benchmark PostgreSQL upsert throughput for PGKVStorage and PGVectorStorage.
+
+Compares the legacy row-by-row write path (one execute per record, vectors sent
+as text) with the batched executemany path used by the storages (vectors sent
+in pgvector binary format), and prints rows per second for each.
+
+Start a local Postgres with pgvector first, for example:
+
+    docker run -d --name lightrag-pg -p 5432:5432 \\
+        -e POSTGRES_USER=rag -e POSTGRES_PASSWORD=rag -e POSTGRES_DB=rag \\
+        pgvector/pgvector:pg16
+
+and point POSTGRES_HOST/POSTGRES_PORT/POSTGRES_USER/POSTGRES_PASSWORD/
+POSTGRES_DATABASE at it (environment, .env or config.ini). Vector tables are
+created with EMBEDDING_DIM dimensions, so use a fresh database or the dim the
+existing tables were created with.
+
+Usage:
+    python tests/benchmark_pg_upsert.py --rows 2000 --dim 1024
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+from datetime import timezone
+
+import numpy as np
+from ascii_colors import ASCIIColors
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCHMARK_WORKSPACE = "benchmark_pg_upsert"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark PGKVStorage/PGVectorStorage upsert throughput"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=2000, help="Records per run (default: 2000)"
+    )
+    parser.add_argument(
+        "--dim",
+        type=int,
+        default=int(os.environ.get("EMBEDDING_DIM", 1024)),
+        help="Embedding dimension (default: EMBEDDING_DIM or 1024)",
+    )
+    return parser.parse_args()
+
+
+def make_chunks(rows: int) -> dict[str, dict]:
+    return {
+        f"chunk-bench-{i}": {
+            "tokens": 1200,
+            "chunk_order_index": i,
+            "full_doc_id": "doc-bench",
+            "content": f"benchmark chunk {i} " * 50,
+            "file_path": "benchmark.txt",
+            "llm_cache_list": [],
+        }
+        for i in range(rows)
+    }
+
+
+async def legacy_upsert(connection, sql: str, rows: list[dict]) -> None:
+    """Previous write path: one round trip per record"""
+    for row in rows:
+        await connection.execute(sql, *row.values())
+
+
+async def run_benchmark(rows: int, dim: int) -> None:
+    # Vector table DDL reads EMBEDDING_DIM at import time
+    os.environ["EMBEDDING_DIM"] = str(dim)
+    import asyncpg
+    from lightrag.kg.postgres_impl import (
+        SQL_TEMPLATES,
+        ClientManager,
+        PGKVStorage,
+        PGVectorStorage,
+    )
+    from lightrag.kg.shared_storage import initialize_share_data
+    from lightrag.utils import EmbeddingFunc
+
+    initialize_share_data()
+
+    async def mock_embedding_func(texts):
+        return np.random.rand(len(texts), dim).astype(np.float32)
+
+    embedding_func = EmbeddingFunc(
+        embedding_dim=dim, max_token_size=8192, func=mock_embedding_func
+    )
+    global_config = {
+        "embedding_batch_num": 64,
+        "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+    }
+
+    kv_storage = PGKVStorage(
+        namespace="text_chunks",
+        workspace=BENCHMARK_WORKSPACE,
+        global_config=global_config,
+        embedding_func=embedding_func,
+    )
+    vector_storage = PGVectorStorage(
+        namespace="chunks",
+        workspace=BENCHMARK_WORKSPACE,
+        global_config=global_config,
+        embedding_func=embedding_func,
+        meta_fields={"full_doc_id", "content", "file_path"},
+    )
+    await kv_storage.initialize()
+    await vector_storage.initialize()
+
+    # Benchmark drops its tables' rows, never run it against a configured workspace
+    if kv_storage.workspace != BENCHMARK_WORKSPACE:
+        await kv_storage.finalize()
+        await vector_storage.finalize()
+        raise SystemExit(
+            f"POSTGRES_WORKSPACE is set to '{kv_storage.workspace}', unset it to run the benchmark"
+        )
+
+    # Legacy path runs on a plain connection, without the binary vector codec
+    config = ClientManager.get_config()
+    connection = await asyncpg.connect(
+        user=config["user"],
+        password=config["password"],
+        database=config["database"],
+        host=config["host"],
+        port=config["port"],
+    )
+
+    chunks = make_chunks(rows)
+    current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+    results = []
+
+    try:
+        # KV text chunks
+        kv_rows = [
+            {
+                "workspace": kv_storage.workspace,
+                "id": k,
+                "tokens": v["tokens"],
+                "chunk_order_index": v["chunk_order_index"],
+                "full_doc_id": v["full_doc_id"],
+                "content": v["content"],
+                "file_path": v["file_path"],
+                "llm_cache_list": json.dumps(v["llm_cache_list"]),
+                "create_time": current_time,
+                "update_time": current_time,
+            }
+            for k, v in chunks.items()
+        ]
+        await kv_storage.drop()
+        start = time.perf_counter()
+        await legacy_upsert(connection, SQL_TEMPLATES["upsert_text_chunk"], kv_rows)
+        results.append(
+            ("PGKVStorage text_chunks", "row-by-row", time.perf_counter() - start)
+        )
+
+        await kv_storage.drop()
+        start = time.perf_counter()
+        await kv_storage.upsert(chunks)
+        results.append(
+            ("PGKVStorage text_chunks", "executemany", time.perf_counter() - start)
+        )
+
+        # Vector chunks, embeddings precomputed so only the write path is timed
+        vectors = await mock_embedding_func(list(chunks))
+        vdb_rows = [
+            {
+                "workspace": vector_storage.workspace,
+                "id": k,
+                "tokens": v["tokens"],
+                "chunk_order_index": v["chunk_order_index"],
+                "full_doc_id": v["full_doc_id"],
+                "content": v["content"],
+                "content_vector": json.dumps(vectors[i].tolist()),
+                "file_path": v["file_path"],
+                "create_time": current_time,
+                "update_time": current_time,
+            }
+            for i, (k, v) in enumerate(chunks.items())
+        ]
+        await vector_storage.drop()
+        start = time.perf_counter()
+        await legacy_upsert(connection, SQL_TEMPLATES["upsert_chunk"], vdb_rows)
+        results.append(
+            ("PGVectorStorage chunks", "row-by-row/text", time.perf_counter() - start)
+        )
+
+        for i, row in enumerate(vdb_rows):
+            row["content_vector"] = vectors[i]
+        await vector_storage.drop()
+        start = time.perf_counter()
+        await vector_storage.db.executemany(SQL_TEMPLATES["upsert_chunk"], vdb_rows)
+        results.append(
+            (
+                "PGVectorStorage chunks",
+                "executemany/binary",
+                time.perf_counter() - start,
+            )
+        )
+    finally:
+        await kv_storage.drop()
+        await vector_storage.drop()
+        await connection.close()
+        await kv_storage.finalize()
+        await vector_storage.finalize()
+
+    ASCIIColors.cyan(f"\nUpsert throughput: {rows} rows, dim {dim}")
+    for storage, path, elapsed in results:
+        ASCIIColors.white(
+            f"  {storage:<26} {path:<20} {elapsed:8.2f}s {rows / elapsed:10.0f} rows/s"
+        )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(run_benchmark(args.rows, args.dim))
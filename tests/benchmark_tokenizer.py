@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Benchmark per-query tokenization time.
+
+Replays the tokenizer work of one kg_query context build (entity and relation
+truncation, context, system prompt template and query counts) over synthetic
+entities and relations, first by re-encoding every string as before and then
+through Tokenizer.count_tokens / count_tokens_batch with its token count LRU.
+
+Requires tiktoken and its encoding files. No LLM or embedding service is needed.
+
+Usage:
+    python tests/benchmark_tokenizer.py --entities 40 --relations 80 --queries 200
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from ascii_colors import ASCIIColors
+
+# Add project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.prompt import PROMPTS
+from lightrag.utils import TiktokenTokenizer, truncate_list_by_token_size
+
+WORDS = (
+    "graph retrieval entity relation vector index storage query context model "
+    "document chunk summary keyword embedding latency cache token batch merge"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-query tokenization")
+    parser.add_argument(
+        "--entities", type=int, default=40, help="Entities per query (default: 40)"
+    )
+    parser.add_argument(
+        "--relations", type=int, default=80, help="Relations per query (default: 80)"
+    )
+    parser.add_argument(
+        "--pool",
+        type=int,
+        default=400,
+        help="Distinct entities/relations queries draw from (default: 400)",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Queries to replay (default: 200)"
+    )
+    return parser.parse_args()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_records(rng: random.Random, count: int, kind: str) -> list[dict]:
+    return [
+        {
+            "id": i,
+            kind: f"{kind.title()} {i}",
+            "type": rng.choice(["Concept", "Method", "Artifact"]),
+            "description": " ".join(sentence(rng, 25) for _ in range(3)),
+            "created_at": "2025-01-01 00:00:00",
+            "file_path": f"docs/file_{i % 17}.md",
+        }
+        for i in range(count)
+    ]
+
+
+def tokenize_query(tokenizer, entities, relations, query, cached: bool) -> None:
+    """The tokenizer calls of one context build, old or new style"""
+    sys_prompt = PROMPTS["rag_response"].format(
+        context_data="", response_type="Multiple Paragraphs", user_prompt=""
+    )
+    if cached:
+        truncate = truncate_list_by_token_size
+
+        def count(text):
+            return tokenizer.count_tokens(text)
+    else:
+
+        def truncate(list_data, key, max_token_size, tokenizer):
+            tokens = 0
+            for i, data in enumerate(list_data):
+                tokens += len(tokenizer.encode(key(data)))
+                if tokens > max_token_size:
+                    return list_data[:i]
+            return list_data
+
+        def count(text):
+            return len(tokenizer.encode(text))
+
+    entities = truncate(
+        entities,
+        key=lambda x: json.dumps(x, ensure_ascii=False),
+        max_token_size=6000,
+        tokenizer=tokenizer,
+    )
+    relations = truncate(
+        relations,
+        key=lambda x: json.dumps(x, ensure_ascii=False),
+        max_token_size=8000,
+        tokenizer=tokenizer,
+    )
+    kg_context = "\n".join(json.dumps(x, ensure_ascii=False) for x in entities)
+    kg_context += "\n".join(json.dumps(x, ensure_ascii=False) for x in relations)
+    count(kg_context)
+    count(sys_prompt)
+    count(query)
+    if not cached:
+        # kg_query debug log encoded query + sys_prompt, then both again
+        count(query + sys_prompt)
+        count(query)
+        count(sys_prompt)
+
+
+def run(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    entity_pool = make_records(rng, args.pool, "entity")
+    relation_pool = make_records(rng, args.pool, "relation")
+    workload = [
+        (
+            rng.sample(entity_pool, args.entities),
+            rng.sample(relation_pool, args.relations),
+            sentence(rng, 12),
+        )
+        for _ in range(args.queries)
+    ]
+
+    ASCIIColors.cyan(
+        f"\n{args.queries} queries, {args.entities} entities and {args.relations} relations each, pool {args.pool}"
+    )
+    for label, cached in (("encode every call", False), ("count_tokens + LRU", True)):
+        tokenizer = TiktokenTokenizer()
+        start = time.perf_counter()
+        for entities, relations, query in workload:
+            tokenize_query(tokenizer, entities, relations, query, cached)
+        per_query = (time.perf_counter() - start) / args.queries * 1000
+        ASCIIColors.white(f"  {label:<20} {per_query:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,120 @@
+"""
+Tests for the JsonKVStorage append-log mode: replay of logged upserts and
+deletes, compaction into a new snapshot, and recovery from a torn log tail.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg import json_kv_impl
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+@pytest.fixture(autouse=True)
+def append_log(monkeypatch):
+    monkeypatch.setenv("JSON_KV_APPEND_LOG", "true")
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def open_storage(working_dir) -> JsonKVStorage:
+    """Open the storage as a fresh process would, loading it from disk"""
+    finalize_share_data()
+    initialize_share_data()
+    storage = JsonKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config={"working_dir": str(working_dir)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def records(start: int, end: int) -> dict[str, dict]:
+    return {f"doc-{i}": {"content": f"content {i}"} for i in range(start, end)}
+
+
+def test_upsert_delete_reload(tmp_path):
+    async def run():
+        storage = await open_storage(tmp_path)
+        await storage.upsert(records(0, 5))
+        await storage.index_done_callback()
+        await storage.delete(["doc-1"])
+        await storage.upsert({"doc-2": {"content": "rewritten 2"}})
+        await storage.index_done_callback()
+
+        # Changes are appended to the log instead of rewriting the snapshot
+        assert not os.path.exists(storage._file_name)
+        with open(storage._log_file_name, encoding="utf-8") as f:
+            ops = [json.loads(line)["op"] for line in f]
+        assert ops == ["upsert"] * 5 + ["delete", "upsert"]
+
+        reloaded = await open_storage(tmp_path)
+        assert set((await reloaded.get_all()).keys()) == {
+            "doc-0",
+            "doc-2",
+            "doc-3",
+            "doc-4",
+        }
+        assert (await reloaded.get_by_id("doc-2"))["content"] == "rewritten 2"
+        assert await reloaded.get_by_id("doc-1") is None
+
+    asyncio.run(run())
+
+
+def test_compaction_folds_log_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_kv_impl, "DEFAULT_JSON_KV_COMPACT_MIN_BYTES", 1)
+
+    async def run():
+        storage = await open_storage(tmp_path)
+        await storage.upsert(records(0, 10))
+        await storage.index_done_callback()
+        await storage._wait_for_compaction()
+
+        # The whole log was folded into the snapshot
+        assert os.path.getsize(storage._log_file_name) == 0
+        with open(storage._file_name, encoding="utf-8") as f:
+            assert set(json.load(f).keys()) == set(records(0, 10))
+
+        await storage.delete(["doc-0"])
+        await storage.index_done_callback()
+        await storage.finalize()
+
+        reloaded = await open_storage(tmp_path)
+        assert set((await reloaded.get_all()).keys()) == set(records(1, 10))
+
+    asyncio.run(run())
+
+
+def test_truncated_log_tail_is_discarded(tmp_path):
+    async def run():
+        storage = await open_storage(tmp_path)
+        await storage.upsert(records(0, 3))
+        await storage.index_done_callback()
+        valid_size = os.path.getsize(storage._log_file_name)
+
+        # Simulate an append interrupted in the middle of a record
+        with open(storage._log_file_name, "ab") as f:
+            f.write(b'{"op": "upsert", "id": "doc-3", "data": {"cont')
+
+        reloaded = await open_storage(tmp_path)
+        assert set((await reloaded.get_all()).keys()) == set(records(0, 3))
+        assert os.path.getsize(reloaded._log_file_name) == valid_size
+
+        # Later appends start on a clean line and replay normally
+        await reloaded.upsert(records(3, 5))
+        await reloaded.index_done_callback()
+
+        final = await open_storage(tmp_path)
+        assert set((await final.get_all()).keys()) == set(records(0, 5))
+
+    asyncio.run(run())
@@ -0,0 +1,170 @@
+"""
+Tests for MmapVectorDBStorage persistence: reload after upsert and delete,
+compaction into a new file generation, and recovery from interrupted writes.
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg import mmap_vector_db_impl
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+EMBEDDING_DIM = 8
+
+
+async def mock_embedding_func(texts, **kwargs):
+    """Deterministic embeddings derived from a hash of each text"""
+    vectors = []
+    for text in texts:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        vectors.append(np.frombuffer(digest[: EMBEDDING_DIM * 4], dtype=np.uint32))
+    return np.array(vectors, dtype=np.float32) + 1.0
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def make_storage(working_dir) -> MmapVectorDBStorage:
+    storage = MmapVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(working_dir),
+            "embedding_batch_num": 4,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.0},
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=EMBEDDING_DIM, func=mock_embedding_func
+        ),
+        meta_fields={"content"},
+    )
+    asyncio.run(storage.initialize())
+    return storage
+
+
+def records(start: int, end: int) -> dict[str, dict]:
+    return {f"chunk-{i}": {"content": f"content {i}"} for i in range(start, end)}
+
+
+def stored_ids(storage: MmapVectorDBStorage) -> set[str]:
+    data = asyncio.run(storage.client_storage)["data"]
+    return {d["__id__"] for d in data}
+
+
+def test_upsert_delete_reload(tmp_path):
+    storage = make_storage(tmp_path)
+    asyncio.run(storage.upsert(records(0, 10)))
+    assert asyncio.run(storage.index_done_callback())
+
+    asyncio.run(storage.delete(["chunk-1", "chunk-2"]))
+    asyncio.run(storage.upsert({"chunk-3": {"content": "rewritten 3"}}))
+    assert asyncio.run(storage.index_done_callback())
+    expected_vectors = asyncio.run(storage.get_vectors_by_ids(["chunk-3", "chunk-9"]))
+
+    reloaded = make_storage(tmp_path)
+    assert stored_ids(reloaded) == {f"chunk-{i}" for i in range(10)} - {
+        "chunk-1",
+        "chunk-2",
+    }
+    assert asyncio.run(reloaded.get_by_id("chunk-3"))["content"] == "rewritten 3"
+    assert asyncio.run(reloaded.get_vectors_by_ids(["chunk-3", "chunk-9"])) == (
+        expected_vectors
+    )
+
+    results = asyncio.run(reloaded.query("rewritten 3", top_k=1))
+    assert results[0]["id"] == "chunk-3"
+    assert results[0]["distance"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_unsaved_changes_are_not_persisted(tmp_path):
+    storage = make_storage(tmp_path)
+    asyncio.run(storage.upsert(records(0, 4)))
+    assert asyncio.run(storage.index_done_callback())
+    asyncio.run(storage.upsert(records(4, 8)))
+
+    assert stored_ids(make_storage(tmp_path)) == {f"chunk-{i}" for i in range(4)}
+
+
+def test_compaction_switches_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(mmap_vector_db_impl, "MMAP_VDB_COMPACT_MIN_ROWS", 4)
+    storage = make_storage(tmp_path)
+    asyncio.run(storage.upsert(records(0, 12)))
+    assert asyncio.run(storage.index_done_callback())
+    first_vector_file = storage._vector_file
+
+    asyncio.run(storage.delete([f"chunk-{i}" for i in range(8)]))
+    assert asyncio.run(storage.index_done_callback())
+
+    assert storage._generation == 1
+    assert storage._committed_rows == 4
+    assert not os.path.exists(first_vector_file)
+    assert os.path.getsize(storage._vector_file) == 4 * EMBEDDING_DIM * 4
+
+    reloaded = make_storage(tmp_path)
+    assert reloaded._generation == 1
+    assert stored_ids(reloaded) == {f"chunk-{i}" for i in range(8, 12)}
+    assert asyncio.run(reloaded.get_vectors_by_ids(["chunk-10"])) == asyncio.run(
+        storage.get_vectors_by_ids(["chunk-10"])
+    )
+
+    # Appends after a compaction go to the new generation
+    asyncio.run(reloaded.upsert(records(12, 14)))
+    assert asyncio.run(reloaded.index_done_callback())
+    assert stored_ids(make_storage(tmp_path)) == {f"chunk-{i}" for i in range(8, 14)}
+
+
+def test_interrupted_compaction_keeps_previous_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(mmap_vector_db_impl, "MMAP_VDB_COMPACT_MIN_ROWS", 4)
+    storage = make_storage(tmp_path)
+    asyncio.run(storage.upsert(records(0, 12)))
+    assert asyncio.run(storage.index_done_callback())
+    asyncio.run(storage.delete([f"chunk-{i}" for i in range(8)]))
+
+    def crash():
+        raise OSError("simulated crash before commit")
+
+    monkeypatch.setattr(storage, "_write_sidecar", crash)
+    assert not asyncio.run(storage.index_done_callback())
+
+    # The sidecar still names the previous generation and its untouched files
+    reloaded = make_storage(tmp_path)
+    assert reloaded._generation == 0
+    assert stored_ids(reloaded) == {f"chunk-{i}" for i in range(12)}
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    storage = make_storage(tmp_path)
+    asyncio.run(storage.upsert(records(0, 6)))
+    assert asyncio.run(storage.index_done_callback())
+
+    # Simulate a save interrupted before the sidecar was rewritten
+    with open(storage._vector_file, "ab") as f:
+        f.write(b"\x00" * (EMBEDDING_DIM * 4 + 3))
+    with open(storage._log_file, "ab") as f:
+        f.write(b'{"op": "add", "row": 6, "data": {"__id__": "chunk-')
+
+    reloaded = make_storage(tmp_path)
+    assert stored_ids(reloaded) == {f"chunk-{i}" for i in range(6)}
+
+    # The next save drops the partial tail before appending
+    asyncio.run(reloaded.upsert(records(6, 8)))
+    asyncio.run(reloaded.delete(["chunk-0"]))
+    assert asyncio.run(reloaded.index_done_callback())
+    assert os.path.getsize(reloaded._vector_file) == 8 * EMBEDDING_DIM * 4
+
+    final = make_storage(tmp_path)
+    assert stored_ids(final) == {f"chunk-{i}" for i in range(1, 8)}
+    assert asyncio.run(final.get_by_id("chunk-7"))["content"] == "content 7"